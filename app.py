@@ -1,76 +1,354 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, stream_with_context
 import json
-from fuzzy_search import load_qualification_data, fuzzy_search
-from qualification_matcher import merge_qualifications, get_qualification_by_name, calculate_total_staff
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from qualification_catalog import get_catalog
+from batch_verify import verify_profiles
+from coverage_planner import plan_coverage
+from eligibility import DEFAULT_NEAR_MISSES, eligible_qualifications
+from marginal_cost import rank_additions
+from exact_solver import DEFAULT_TIME_LIMIT
+from merge_cache import DEFAULT_MAX_ENTRIES, MergeCache, merge_selection
+from plan_table import PlanTable
+from search_export import export_search_index
+from search_cache import DEFAULT_MAX_ENTRIES as DEFAULT_SEARCH_CACHE_SIZE, SearchCache, search_names
+from term_resolver import DEFAULT_ALTERNATIVES, resolve_terms
+from qualification_matcher import MERGE_ENGINES, calculate_total_staff, hiring_delta, verify_title_counts
 
 app = Flask(__name__)
 
-# 动态加载资质数据，每次请求时重新加载
+# 各连通分量并发计算使用的工作进程数（环境变量 MERGE_WORKERS），小于2时不启用工作池
+try:
+    MERGE_WORKERS = int(os.environ.get('MERGE_WORKERS', '0'))
+except ValueError:
+    MERGE_WORKERS = 0
+merge_executor = ProcessPoolExecutor(MERGE_WORKERS) if MERGE_WORKERS > 1 else None
+
+# 合并计算结果缓存的容量（环境变量 MERGE_CACHE_SIZE），为0时不缓存
+try:
+    MERGE_CACHE_SIZE = int(os.environ.get('MERGE_CACHE_SIZE', str(DEFAULT_MAX_ENTRIES)))
+except ValueError:
+    MERGE_CACHE_SIZE = DEFAULT_MAX_ENTRIES
+merge_cache = MergeCache(MERGE_CACHE_SIZE)
+
+# 搜索结果缓存的容量（环境变量 SEARCH_CACHE_SIZE），为0时不缓存
+try:
+    SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', str(DEFAULT_SEARCH_CACHE_SIZE)))
+except ValueError:
+    SEARCH_CACHE_SIZE = DEFAULT_SEARCH_CACHE_SIZE
+search_cache = SearchCache(SEARCH_CACHE_SIZE)
+
+# 精确求解与规划允许的最长时间预算（秒，环境变量 MAX_TIME_LIMIT），请求中更长的时间预算按该值计算
+try:
+    MAX_TIME_LIMIT = float(os.environ.get('MAX_TIME_LIMIT', '10'))
+except ValueError:
+    MAX_TIME_LIMIT = 10.0
+
+# 离线预计算的资质组合方案表（由 plan_table.py 构建），不存在时实时计算
+plan_table = PlanTable()
+
+# 从进程内共享的资质目录获取数据，数据文件变化时自动重新加载
 def get_qualification_data():
-    return load_qualification_data()
+    return get_catalog().snapshot().qualifications
 
 @app.route('/')
 def index():
-    # 加载资质数据，直接传递给模板
-    qualification_data = get_qualification_data()
-    return render_template('index.html', qualification_data=qualification_data)
+    # 加载资质数据，直接传递给模板（附带搜索索引版本，页面据此加载浏览器端搜索索引）
+    snapshot = get_catalog().snapshot()
+    return render_template('index.html', qualification_data=snapshot.public_qualifications,
+                           search_index_version=snapshot.version)
 
 @app.route('/api/search', methods=['GET'])
 def search_qualifications():
-    """模糊搜索资质名称"""
+    """模糊搜索资质名称
+    
+    可选参数：limit 最多返回的结果数，min_score 最低得分，scores=1 时返回 [{'name', 'score'}]。
+    """
     # 确保正确处理中文编码
     query = request.args.get('q', '').strip()
     
     # 添加调试信息
     print(f"Received search query: '{query}'")
     
-    qualification_data = get_qualification_data()
+    try:
+        limit = _optional_int(request.args.get('limit', ''))
+        min_score = _optional_float(request.args.get('min_score', ''))
+    except ValueError:
+        return jsonify({
+            'error': 'limit 必须是非负整数，min_score 必须是数字'
+        })
+    with_scores = request.args.get('scores', '') in ('1', 'true')
     
-    if not query:
+    snapshot = get_catalog().snapshot()
+    
+    if not query and min_score is None and not with_scores:
         # 没有查询参数时返回所有资质名称
-        matches = [q['name'] for q in qualification_data]
+        matches = [q['name'] for q in snapshot]
+        if limit is not None:
+            matches = matches[:limit]
     else:
-        # 有查询参数时进行模糊搜索
-        matches = fuzzy_search(query, qualification_data)
+        # 有查询参数时进行模糊搜索（使用资质目录的倒排索引，指定 limit 时只选取前 limit 个），
+        # 相同的关键词直接使用缓存结果
+        matches = search_names(snapshot, query, limit=limit, min_score=min_score,
+                               with_scores=with_scores, cache=search_cache)
+        if with_scores:
+            matches = [{'name': name, 'score': score} for name, score in matches]
     
     print(f"Search results: {matches}")
     
     return jsonify(matches)
 
+def _optional_int(value):
+    """解析非负整数参数，空字符串视为未提供"""
+    if value == '':
+        return None
+    value = int(value)
+    if value < 0:
+        raise ValueError(value)
+    return value
+
+def _optional_float(value):
+    """解析数字参数，空字符串视为未提供"""
+    return float(value) if value != '' else None
+
+def _time_limit(value):
+    """解析时间预算（秒）：必须是大于0的有限数字，超过 MAX_TIME_LIMIT 时按 MAX_TIME_LIMIT 计算"""
+    time_limit = float(value)
+    if not math.isfinite(time_limit) or time_limit <= 0:
+        raise ValueError(value)
+    return min(time_limit, MAX_TIME_LIMIT)
+
+@app.route('/api/search/index', methods=['GET'])
+def get_search_index():
+    """浏览器端搜索索引：资质名称、单字/双字倒排索引与打分规则
+    
+    请求带有当前版本号（?v=版本）时允许浏览器长期缓存，否则每次需要向服务器确认。
+    """
+    snapshot = get_catalog().snapshot()
+    response = app.response_class(export_search_index(snapshot), mimetype='application/json')
+    response.set_etag(snapshot.version)
+    if request.args.get('v') == snapshot.version:
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/api/search/version', methods=['GET'])
+def get_search_index_version():
+    """当前搜索索引版本，页面据此判断本地索引是否过期"""
+    response = jsonify({'version': get_catalog().snapshot().version})
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/resolve', methods=['POST'])
+def resolve_qualifications():
+    """批量解析资质名称（文本按中英文逗号、顿号、分号和空白拆分，或直接提供名称列表）"""
+    data = request.json or {}
+    terms = data.get('terms')
+    if terms is None:
+        terms = data.get('text', '')
+    if not isinstance(terms, (str, list)):
+        return jsonify({
+            'error': 'terms 必须是文本或名称列表'
+        })
+    
+    try:
+        alternatives = int(data.get('alternatives', DEFAULT_ALTERNATIVES))
+    except (TypeError, ValueError):
+        alternatives = -1
+    if alternatives < 0:
+        return jsonify({
+            'error': 'alternatives 必须是非负整数'
+        })
+    
+    snapshot = get_catalog().snapshot()
+    results = resolve_terms(snapshot, terms, alternatives, search_cache)
+    
+    if not results:
+        return jsonify({
+            'error': '请至少输入一个资质名称'
+        })
+    
+    # 去重后的最佳匹配，可直接用于 /api/match
+    matched = list(dict.fromkeys(result['match'] for result in results if result['match'] is not None))
+    return jsonify({
+        'results': results,
+        'matched_qualifications': matched
+    })
+
 @app.route('/api/match', methods=['POST'])
 def match_qualifications():
-    """匹配资质，计算所需职称数量"""
+    """匹配资质，计算所需职称数量
+    
+    提供 title_counts（已有人员）时只计算需要新增的人员：final_counts 为包含已有人员的总人数，
+    hires 为各职称需要新增的人数。
+    """
     data = request.json
     qualifications = data.get('qualifications', [])
+    # 计算引擎：greedy（贪心，默认）或 exact（精确求解）
+    engine = data.get('engine', 'greedy')
+    existing = data.get('title_counts') or {}
     
     if not qualifications:
         return jsonify({
             'error': '请至少选择一个资质'
         })
     
+    if engine not in MERGE_ENGINES:
+        return jsonify({
+            'error': f'未知的计算引擎：{engine}'
+        })
+    
+    try:
+        time_limit = _time_limit(data.get('time_limit', DEFAULT_TIME_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({
+            'error': 'time_limit 必须是大于0的有限数字'
+        })
+    
+    if not isinstance(existing, dict) or \
+            not all(isinstance(count, int) and count >= 0 for count in existing.values()):
+        return jsonify({
+            'error': 'title_counts 必须是 职称 -> 非负整数人数'
+        })
+    
     # 获取匹配的资质信息
-    qualification_data = get_qualification_data()
-    matched_qualifications = []
-    for qual_name in qualifications:
-        qual = get_qualification_by_name(qual_name, qualification_data)
-        if qual:
-            matched_qualifications.append(qual)
+    snapshot = get_catalog().snapshot()
+    matched_qualifications = snapshot.lookup(qualifications)
     
     if not matched_qualifications:
         return jsonify({
             'error': '未匹配到任何有效资质'
         })
     
-    # 合并计算
-    final_counts, type_attributes = merge_qualifications(matched_qualifications)
+    # 合并计算（相同的资质组合直接使用缓存结果）
+    final_counts, type_attributes, proven_optimal = merge_selection(
+        snapshot, qualifications, engine, time_limit, merge_cache, merge_executor, plan_table, existing)
     total_staff = calculate_total_staff(final_counts)
     
-    return jsonify({
+    result = {
         'matched_qualifications': [q['name'] for q in matched_qualifications],
-        'matched_qualifications_details': matched_qualifications,
+        'matched_qualifications_details': snapshot.public_lookup(qualifications),
         'final_counts': final_counts,
         'type_attributes': type_attributes,
         'total_staff': total_staff
+    }
+    if existing:
+        hires = hiring_delta(final_counts, existing)
+        result['hires'] = hires
+        result['total_hires'] = calculate_total_staff(hires)
+    if engine == 'exact':
+        result['engine'] = engine
+        result['proven_optimal'] = proven_optimal
+    return jsonify(result)
+
+@app.route('/api/match/additions', methods=['POST'])
+def rank_qualification_additions():
+    """在已选资质的基础上，计算追加其他每个资质所需的新增人数（从少到多排序）
+    
+    final_counts 为当前职称人数（如 /api/match 的结果），不提供时按已选资质计算。
+    可选参数：include_unrelated 是否包含与已选资质没有共同职称的资质，limit 最多返回的数量。
+    """
+    data = request.json or {}
+    qualifications = data.get('qualifications', [])
+    final_counts = data.get('final_counts')
+    include_unrelated = bool(data.get('include_unrelated', False))
+    limit = data.get('limit')
+    
+    if not qualifications:
+        return jsonify({
+            'error': '请至少选择一个资质'
+        })
+    if final_counts is not None and (not isinstance(final_counts, dict) or
+                                     not all(isinstance(count, int) and count >= 0 for count in final_counts.values())):
+        return jsonify({
+            'error': 'final_counts 必须是 职称 -> 非负整数人数'
+        })
+    if limit is not None and (not isinstance(limit, int) or limit < 0):
+        return jsonify({
+            'error': 'limit 必须是非负整数'
+        })
+    
+    snapshot = get_catalog().snapshot()
+    if not snapshot.lookup(qualifications):
+        return jsonify({
+            'error': '未匹配到任何有效资质'
+        })
+    if final_counts is None:
+        final_counts = merge_selection(snapshot, qualifications, cache=merge_cache, plan_table=plan_table)[0]
+    
+    return jsonify({
+        'final_counts': final_counts,
+        'total_staff': calculate_total_staff(final_counts),
+        'additions': rank_additions(snapshot, qualifications, final_counts, include_unrelated, limit)
+    })
+
+@app.route('/api/coverage', methods=['POST'])
+def plan_qualification_coverage():
+    """给定人员预算（budget）或各职称可用人数（availability），选出能同时满足的最多资质
+    
+    可选参数：weights 资质名称 -> 权重，qualifications 候选资质（默认资质目录中的全部资质），time_limit 时间预算（秒）。
+    """
+    data = request.json or {}
+    budget = data.get('budget')
+    availability = data.get('availability')
+    weights = data.get('weights') or {}
+    
+    if budget is None and availability is None:
+        return jsonify({
+            'error': '请提供人员预算或各职称可用人数'
+        })
+    if budget is not None and (not isinstance(budget, int) or budget < 0):
+        return jsonify({
+            'error': 'budget 必须是非负整数'
+        })
+    if availability is not None and (not isinstance(availability, dict) or
+                                     not all(isinstance(count, int) and count >= 0 for count in availability.values())):
+        return jsonify({
+            'error': 'availability 必须是 职称 -> 非负整数人数'
+        })
+    if not isinstance(weights, dict) or not all(isinstance(weight, (int, float)) for weight in weights.values()):
+        return jsonify({
+            'error': 'weights 必须是 资质名称 -> 权重'
+        })
+    
+    try:
+        time_limit = _time_limit(data.get('time_limit', DEFAULT_TIME_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({
+            'error': 'time_limit 必须是大于0的有限数字'
+        })
+    
+    qualifications = data.get('qualifications')
+    if qualifications is not None and (not isinstance(qualifications, list) or
+                                       not all(isinstance(name, str) for name in qualifications)):
+        return jsonify({
+            'error': 'qualifications 必须是资质名称列表'
+        })
+    
+    snapshot = get_catalog().snapshot()
+    if qualifications is None:
+        candidates = list(snapshot)
+    else:
+        candidates = snapshot.lookup(dict.fromkeys(qualifications))
+        if not candidates:
+            return jsonify({
+                'error': '未匹配到任何有效资质'
+            })
+    
+    return jsonify(plan_coverage(candidates, budget, availability, weights, time_limit))
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """获取缓存命中统计"""
+    return jsonify({
+        'match': merge_cache.stats(),
+        'search': search_cache.stats(),
+        'prefix_results': get_catalog().snapshot().prefix_results.stats(),
+        'plan_table': plan_table.stats()
     })
 
 @app.route('/api/qualifications', methods=['GET'])
@@ -81,15 +359,15 @@ def get_all_qualifications():
 
 @app.route('/api/qualifications/all', methods=['GET'])
 def get_all_qualifications_details():
-    """获取所有资质的详细信息"""
-    qualification_data = get_qualification_data()
-    return jsonify(qualification_data)
+    """获取所有资质的详细信息（不含仅供搜索使用的拼音字段）"""
+    return jsonify(get_catalog().snapshot().public_qualifications)
 
 @app.route('/verify')
 def verify_page():
     """渲染资质验证页面"""
-    qualification_data = get_qualification_data()
-    return render_template('verify.html', qualification_data=qualification_data)
+    snapshot = get_catalog().snapshot()
+    return render_template('verify.html', qualification_data=snapshot.public_qualifications,
+                           search_index_version=snapshot.version)
 
 @app.route('/api/verify', methods=['POST'])
 def verify_qualifications():
@@ -104,75 +382,88 @@ def verify_qualifications():
         })
     
     # 获取匹配的资质信息
-    qualification_data = get_qualification_data()
-    matched_qualifications = []
-    for qual_name in qualifications:
-        qual = get_qualification_by_name(qual_name, qualification_data)
-        if qual:
-            matched_qualifications.append(qual)
+    snapshot = get_catalog().snapshot()
+    matched_qualifications = snapshot.lookup(qualifications)
     
     if not matched_qualifications:
         return jsonify({
             'error': '未匹配到任何有效资质'
         })
     
-    # 验证每个资质
-    verification_results = []
-    
-    for qual in matched_qualifications:
-        # 检查当前资质的职称类型和数量
-        current_total = 0
-        title_details = []
-        missing_types = []
-        reasons = []
-        
-        # 计算当前资质的总人数
-        for type_name in qual['types']:
-            count = title_counts.get(type_name, 0)
-            current_total += count
-            title_details.append({
-                'title': type_name,
-                'count': count,
-                'satisfied': count >= 1
-            })
-            
-            if count < 1:
-                missing_types.append(type_name)
-        
-        # 检查是否满足要求
-        all_types_ok = len(missing_types) == 0
-        total_ok = current_total >= qual['total_count']
-        
-        if qual['require_all_types']:
-            # 需要所有类型齐全
-            if not all_types_ok:
-                reasons.append(f'缺少以下职称类型：{"、".join(missing_types)}')
-            if not total_ok:
-                reasons.append(f'总人数不足：当前 {current_total} 人，需要 {qual["total_count"]} 人')
-            satisfied = all_types_ok and total_ok
-        else:
-            # 不需要所有类型齐全，只检查总人数
-            if not total_ok:
-                reasons.append(f'总人数不足：当前 {current_total} 人，需要 {qual["total_count"]} 人')
-            satisfied = total_ok
-        
-        verification_results.append({
-            'qualification_name': qual['name'],
-            'satisfied': satisfied,
-            'current_total': current_total,
-            'required_total': qual['total_count'],
-            'require_all_types': qual['require_all_types'],
-            'title_details': title_details,
-            'reasons': reasons
-        })
+    # 在编译形式上验证每个资质
+    verification_results = verify_title_counts(matched_qualifications, title_counts, snapshot.compiled)
     
     return jsonify({
         'verification_results': verification_results
     })
 
+@app.route('/api/eligible', methods=['POST'])
+def get_eligible_qualifications():
+    """查询人员配置已满足的资质，以及按还差人数排序的接近满足的资质（near_misses 为返回数量）"""
+    data = request.json or {}
+    title_counts = data.get('title_counts')
+    if not isinstance(title_counts, dict) or \
+            not all(isinstance(count, int) and count >= 0 for count in title_counts.values()):
+        return jsonify({
+            'error': 'title_counts 必须是 职称 -> 非负整数人数'
+        })
+    
+    near_misses = data.get('near_misses', DEFAULT_NEAR_MISSES)
+    if near_misses is not None and (not isinstance(near_misses, int) or near_misses < 0):
+        return jsonify({
+            'error': 'near_misses 必须是非负整数'
+        })
+    
+    snapshot = get_catalog().snapshot()
+    return jsonify(eligible_qualifications(snapshot, title_counts, near_misses))
+
+@app.route('/api/verify/batch', methods=['POST'])
+def verify_qualifications_batch():
+    """批量验证多个人员配置（如各子公司的人员名册）
+    
+    profiles 为 [{'id', 'title_counts'}] 或 {配置标识: title_counts}，
+    qualifications 为资质名称列表，不提供时验证资质目录中的全部资质。
+    结果按配置逐行返回（NDJSON），每行为一个配置的验证结果。
+    """
+    data = request.json or {}
+    profiles = data.get('profiles')
+    if isinstance(profiles, dict):
+        profiles = [{'id': profile, 'title_counts': title_counts} for profile, title_counts in profiles.items()]
+    if not isinstance(profiles, list) or not profiles:
+        return jsonify({
+            'error': '请至少提供一个人员配置'
+        })
+    
+    items = []
+    for position, profile in enumerate(profiles):
+        title_counts = profile.get('title_counts') if isinstance(profile, dict) else None
+        if not isinstance(title_counts, dict) or \
+                not all(isinstance(count, int) and count >= 0 for count in title_counts.values()):
+            return jsonify({
+                'error': f'第 {position + 1} 个人员配置的 title_counts 必须是 职称 -> 非负整数人数'
+            })
+        items.append((profile.get('id', position), title_counts))
+    
+    qualifications = data.get('qualifications')
+    if qualifications is not None and not isinstance(qualifications, list):
+        return jsonify({
+            'error': 'qualifications 必须是资质名称列表'
+        })
+    
+    snapshot = get_catalog().snapshot()
+    if qualifications is not None and not snapshot.lookup(qualifications):
+        return jsonify({
+            'error': '未匹配到任何有效资质'
+        })
+    
+    def generate():
+        for result in verify_profiles(snapshot, items, qualifications):
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     import sys
-    import os
     
     # 从命令行参数或环境变量获取端口，默认5006
     port = 5006
@@ -0,0 +1,170 @@
+# 批量验证多个人员配置
+# 资质×职称的关联矩阵（稀疏，按行压缩存放：每个资质所含职称编号，重复出现的职称重复记录）
+# 每个资质目录版本只构建一次。多个人员配置的人数排成 配置×职称 矩阵，
+# 各资质的当前总人数、缺少的职称数与是否满足要求一次性由矩阵运算得出，结果按配置逐个返回。
+# 未安装 NumPy 时逐个配置在编译形式上计算，结果相同。
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # 未安装 NumPy 时使用纯 Python 实现
+    np = None
+
+# 每次矩阵运算包含的人员配置数量
+DEFAULT_CHUNK_SIZE = 256
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class IncidenceMatrix:
+    """资质×职称关联矩阵（按行压缩存放）"""
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.type_count = compiled.type_count
+        # 第 i 个资质的职称编号为 indices[indptr[i]:indptr[i + 1]]
+        indptr = [0]
+        indices = []
+        for type_list in compiled.type_lists:
+            indices.extend(type_list)
+            indptr.append(len(indices))
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.total_counts = np.array(compiled.total_counts, dtype=np.int64)
+        self.require_all = np.array(compiled.require_all, dtype=bool)
+
+    def encode_profiles(self, profiles):
+        """多个 职称名称 -> 人数 的字典转为 配置×职称 人数矩阵，忽略未知职称"""
+        counts = np.zeros((len(profiles), self.type_count), dtype=np.int64)
+        type_ids = self.compiled.type_ids
+        for row, title_counts in enumerate(profiles):
+            for type_name, count in title_counts.items():
+                type_id = type_ids.get(type_name)
+                if type_id is not None:
+                    counts[row, type_id] = count
+        return counts
+
+    def _row_sums(self, values, rows):
+        """按资质所含职称对每个配置的 values（配置×职称）求和，即 values 与关联矩阵转置的乘积"""
+        gathered = values[:, self.indices]
+        starts = self.indptr[rows]
+        ends = self.indptr[rows + 1]
+        # 前缀和之差即各资质的分段和，没有职称的资质为0
+        cumulative = np.zeros((values.shape[0], len(self.indices) + 1), dtype=np.int64)
+        np.cumsum(gathered, axis=1, out=cumulative[:, 1:])
+        return cumulative[:, ends] - cumulative[:, starts]
+
+    def evaluate(self, counts, rows):
+        """计算给定资质（编号数组）在每个人员配置下的结果
+
+        返回 (当前总人数, 缺少的职称数, 是否满足要求)，均为 配置×资质 矩阵。
+        """
+        totals = self._row_sums(counts, rows)
+        missing = self._row_sums((counts < 1).astype(np.int64), rows)
+        total_ok = totals >= self.total_counts[rows]
+        satisfied = total_ok & ((missing == 0) | ~self.require_all[rows])
+        return totals, missing, satisfied
+
+
+def incidence_matrix(snapshot):
+    """资质目录快照的关联矩阵，每个版本只构建一次；未安装 NumPy 时返回None"""
+    if np is None:
+        return None
+    with _cache_lock:
+        matrix = _cache.get(snapshot.version)
+    if matrix is None:
+        matrix = IncidenceMatrix(snapshot.compiled)
+        with _cache_lock:
+            # 只保留当前版本
+            _cache.clear()
+            _cache[snapshot.version] = matrix
+    return matrix
+
+
+def verify_profiles(snapshot, profiles, qualifications=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """批量验证多个人员配置是否满足各资质要求
+
+    profiles 为 (配置标识, 职称名称 -> 人数) 的序列，qualifications 为资质名称列表
+    （忽略不存在的名称，None 表示资质目录中的全部资质）。
+    按输入顺序逐个生成每个配置的结果：
+      profile          配置标识
+      satisfied_count  满足要求的资质数量
+      results          [{'qualification_name', 'satisfied', 'current_total',
+                         'required_total', 'missing_type_count'}]，与资质列表顺序一致
+    """
+    compiled = snapshot.compiled
+    if qualifications is None:
+        rows = list(range(len(compiled.names)))
+    else:
+        rows = [compiled.qual_ids[name] for name in qualifications if name in compiled.qual_ids]
+    names = [compiled.names[index] for index in rows]
+    required = [compiled.total_counts[index] for index in rows]
+
+    matrix = incidence_matrix(snapshot)
+    if matrix is None:
+        for profile, title_counts in profiles:
+            yield _verify_profile(compiled, rows, profile, title_counts)
+        return
+
+    row_array = np.array(rows, dtype=np.int64)
+    chunk = []
+    for item in profiles:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield from _verify_chunk(matrix, row_array, names, required, chunk)
+            chunk = []
+    if chunk:
+        yield from _verify_chunk(matrix, row_array, names, required, chunk)
+
+
+def _verify_chunk(matrix, rows, names, required, chunk):
+    """用矩阵运算验证一组人员配置"""
+    counts = matrix.encode_profiles([title_counts for _, title_counts in chunk])
+    totals, missing, satisfied = matrix.evaluate(counts, rows)
+    totals = totals.tolist()
+    missing = missing.tolist()
+    satisfied = satisfied.tolist()
+    for row, (profile, _) in enumerate(chunk):
+        yield _profile_result(profile, names, required, totals[row], missing[row], satisfied[row])
+
+
+def _verify_profile(compiled, rows, profile, title_counts):
+    """在编译形式上逐个资质验证一个人员配置"""
+    counts = compiled.encode_counts(title_counts)
+    totals = []
+    missing = []
+    satisfied = []
+    for index in rows:
+        total = 0
+        missing_count = 0
+        for type_id in compiled.type_lists[index]:
+            count = counts[type_id]
+            total += count
+            if count < 1:
+                missing_count += 1
+        totals.append(total)
+        missing.append(missing_count)
+        satisfied.append(total >= compiled.total_counts[index] and
+                         (missing_count == 0 or not compiled.require_all[index]))
+    names = [compiled.names[index] for index in rows]
+    required = [compiled.total_counts[index] for index in rows]
+    return _profile_result(profile, names, required, totals, missing, satisfied)
+
+
+def _profile_result(profile, names, required, totals, missing, satisfied):
+    """一个人员配置的验证结果"""
+    results = []
+    for name, required_total, total, missing_count, ok in zip(names, required, totals, missing, satisfied):
+        results.append({
+            'qualification_name': name,
+            'satisfied': ok,
+            'current_total': total,
+            'required_total': required_total,
+            'missing_type_count': missing_count
+        })
+    return {
+        'profile': profile,
+        'satisfied_count': sum(1 for ok in satisfied if ok),
+        'results': results
+    }
@@ -1,8 +1,8 @@
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 from qualification_matcher import get_qualification_by_name
 
 # 加载数据
-data = load_qualification_data()
+data = get_catalog().snapshot()
 
 # 要检查的资质
 quals_to_check = ['建筑总包二级', '市政总包二级', '机电总包二级']
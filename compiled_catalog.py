@@ -0,0 +1,94 @@
+# 资质数据的编译形式
+# 每个职称类型分配一个连续的整数编号，资质的职称列表转为整数数组和位掩码，
+# 职称人数用定长整数数组表示。匹配与验证算法在此形式上运行，
+# 只在接口边界处与职称名称互相转换。
+
+
+class CompiledCatalog:
+    """编译后的资质集合（按资质编号存放的并列数组）"""
+
+    def __init__(self, qualifications):
+        # 职称编号 <-> 职称名称
+        self.type_names = []
+        self.type_ids = {}
+        # 职称编号 -> 包含该职称的资质编号列表
+        self.type_quals = []
+        # 职称编号 -> 包含该职称的资质编号列表（职称在资质中重复出现时重复记录）
+        self.type_occurrences = []
+
+        # 资质编号 -> 资质属性
+        self.qualifications = list(qualifications)
+        self.names = []
+        self.type_lists = []    # 职称编号元组（保持原始顺序）
+        self.masks = []         # 职称位掩码
+        self.total_counts = []
+        self.require_all = []
+        # 资质名称 -> 资质编号（重名时保留第一个）
+        self.qual_ids = {}
+
+        for index, qual in enumerate(self.qualifications):
+            type_list = tuple(self.intern(type_name) for type_name in qual['types'])
+            mask = 0
+            for type_id in type_list:
+                mask |= 1 << type_id
+                self.type_occurrences[type_id].append(index)
+                quals = self.type_quals[type_id]
+                if not quals or quals[-1] != index:
+                    quals.append(index)
+            self.names.append(qual['name'])
+            self.type_lists.append(type_list)
+            self.masks.append(mask)
+            self.total_counts.append(qual['total_count'])
+            self.require_all.append(bool(qual['require_all_types']))
+            self.qual_ids.setdefault(qual['name'], index)
+
+    def intern(self, type_name):
+        """获取职称编号，新职称分配下一个编号"""
+        type_id = self.type_ids.get(type_name)
+        if type_id is None:
+            type_id = len(self.type_names)
+            self.type_ids[type_name] = type_id
+            self.type_names.append(type_name)
+            self.type_quals.append([])
+            self.type_occurrences.append([])
+        return type_id
+
+    @property
+    def type_count(self):
+        return len(self.type_names)
+
+    def new_counts(self):
+        """创建全零的职称人数数组"""
+        return [0] * len(self.type_names)
+
+    def encode_counts(self, title_counts):
+        """职称名称 -> 人数 的字典转为人数数组，忽略未知职称"""
+        counts = [0] * len(self.type_names)
+        type_ids = self.type_ids
+        for type_name, count in title_counts.items():
+            type_id = type_ids.get(type_name)
+            if type_id is not None:
+                counts[type_id] = count
+        return counts
+
+    def decode_counts(self, counts, order):
+        """按给定的职称编号顺序将人数数组转回 职称名称 -> 人数 的字典"""
+        type_names = self.type_names
+        return {type_names[type_id]: counts[type_id] for type_id in order}
+
+    def qualification_total(self, index, counts):
+        """资质所含职称的当前总人数"""
+        total = 0
+        for type_id in self.type_lists[index]:
+            total += counts[type_id]
+        return total
+
+    def is_satisfied(self, index, counts):
+        """检查资质在给定人数下是否满足要求"""
+        total = 0
+        for type_id in self.type_lists[index]:
+            count = counts[type_id]
+            if count < 1 and self.require_all[index]:
+                return False
+            total += count
+        return total >= self.total_counts[index]
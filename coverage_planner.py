@@ -0,0 +1,339 @@
+# 最大覆盖规划：给定人员预算，选出能同时满足的资质（数量最多或权重最大）
+# 与 merge_qualifications 方向相反：merge_qualifications 给定资质求最少人数，这里给定人数求最多资质。
+#
+# 资质集合可行 ⇔ 存在职称人数满足 validate_and_adjust 的规则（要求齐全的资质所含职称至少1人、
+# 各资质的总人数不少于 total_count），且总人数不超过预算、各职称人数不超过可用人数。
+# 可行性是单调的：可行集合的子集都可行，不可行集合的超集都不可行。
+#
+# 按资质做深度优先的分支定界（选 / 不选），以依次加入可行资质的贪心结果作为初始解。
+# 上界 = 当前权重 + 剩余资质中与当前选择相容（加入后人数下界不超过预算）的资质权重之和，
+# 人数下界与 exact_solver 相同（必需职称各1人 + 覆盖问题 LP 对偶的贪心可行解）。
+# 可行性依次用人数下界、贪心分配（merge_qualifications 的编译形式）和精确求解（exact_solver）判定，
+# 判定结果按资质集合记忆化，同一子集合只判定一次。
+import math
+import time
+
+from compiled_catalog import CompiledCatalog
+from exact_solver import DEFAULT_TIME_LIMIT, solve_exact
+from qualification_matcher import _merge_compiled
+
+# 每搜索多少个节点检查一次时间
+_TIME_CHECK_INTERVAL = 64
+# 时间预算中留给最后求选出资质最少人数的比例，其余用于分支定界搜索
+_FINAL_SOLVE_SHARE = 0.2
+
+
+class _SearchTimeout(Exception):
+    """搜索超出时间预算"""
+
+
+def plan_coverage(qualifications, budget=None, availability=None, weights=None, time_limit=DEFAULT_TIME_LIMIT):
+    """选出在人员限制下能够同时满足、权重之和最大的资质集合
+
+    budget 为总人数上限，availability 为各职称的可用人数（职称名称 -> 人数，未列出的职称不可用），
+    至少提供其中一个。weights 为资质名称 -> 权重（默认每个资质权重为1，即资质数量最多）。
+    权重之和相同的方案保留最先找到的方案。
+    返回：
+      qualifications  选出的资质名称（按输入顺序）
+      weight          权重之和
+      final_counts    满足这些资质所需的职称人数（在时间预算内求得的最少人数）
+      total_staff     总人数
+      proven_optimal  是否已证明最优（超出时间预算时为 False，结果为搜索到的最好解）
+      nodes           搜索的节点数
+    """
+    if budget is None and availability is None:
+        raise ValueError("需要提供人员预算或各职称可用人数")
+    planner = _CoveragePlanner(qualifications, budget, availability, weights, time_limit)
+    return planner.solve()
+
+
+class _CoveragePlanner:
+    """分支定界求解状态（职称人数为按资质列表编译后的职称编号排列的数组）"""
+
+    def __init__(self, qualifications, budget, availability, weights, time_limit):
+        self.qualifications = list(qualifications)
+        self.budget = budget
+        self.compiled = compiled = CompiledCatalog(self.qualifications)
+        # 各职称的可用人数，未列出的职称为0
+        self.maximum = compiled.encode_counts(availability) if availability is not None else None
+        weights = weights or {}
+        self.weights = [weights.get(name, 1) for name in compiled.names]
+        # 整个规划的截止时间，以及分支定界搜索（含可行性判定）的截止时间
+        self.deadline = None
+        self.search_deadline = None
+        if time_limit is not None:
+            start = time.perf_counter()
+            self.deadline = start + time_limit
+            self.search_deadline = start + time_limit * (1 - _FINAL_SOLVE_SHARE)
+        self.proven_optimal = True
+        self.nodes = 0
+        # 资质集合（编号升序的元组）-> 可行时为满足要求的职称人数元组，不可行时为None
+        self.memo = {}
+
+        # 资质所含职称（去重）、要求齐全时必须有人的职称
+        self.type_sets = [frozenset(type_list) for type_list in compiled.type_lists]
+        self.required_sets = [self.type_sets[index] if compiled.require_all[index] else frozenset()
+                              for index in range(len(compiled.type_lists))]
+        # 补足人数时的职称顺序：在资质中重复次数多的优先，其次是共享次数多的（与合并计算相同）
+        self.fill_orders = [sorted(set(type_list), key=lambda t, types=type_list: (
+            -types.count(t), -len(compiled.type_quals[t]), types.index(t))) for type_list in compiled.type_lists]
+        # 资质所含职称的最少人数：每人最多为总人数贡献职称在资质中的重复次数
+        self.base = []
+        for type_list, total in zip(compiled.type_lists, compiled.total_counts):
+            multiplicity = max((type_list.count(type_id) for type_id in set(type_list)), default=0)
+            if total <= 0:
+                self.base.append(0)
+            elif multiplicity == 0:
+                self.base.append(math.inf)  # 不含任何职称的资质无法满足
+            else:
+                self.base.append(-(-total // multiplicity))
+
+    def solve(self):
+        weights = self.weights
+        # 只保留单独可行且权重为正的资质，按权重从大到小、单独所需人数从少到多排序
+        candidates = []
+        for index in range(len(self.compiled.names)):
+            if weights[index] > 0 and self._feasible((index,)) is not None:
+                candidates.append(index)
+        candidates.sort(key=lambda index: (-weights[index], sum(self.memo[(index,)]), index))
+
+        if self.budget is None:
+            # 只有各职称的可用人数限制时，所有人都上岗即可同时满足所有单独可行的资质
+            selection = tuple(sorted(candidates))
+            if selection not in self.memo:
+                types = set().union(*(self.type_sets[index] for index in selection))
+                self.memo[selection] = tuple(limit if type_id in types else 0
+                                             for type_id, limit in enumerate(self.maximum))
+        else:
+            selection = self._branch_and_bound(candidates)
+        return self._result(selection)
+
+    def _initial_selection(self, candidates):
+        """初始解：每次加入单位新增人数权重最大的资质，直到不能再加入"""
+        selection = ()
+        counts = tuple([0] * self.compiled.type_count)
+        self.memo[selection] = counts
+        remaining = list(candidates)
+        while remaining:
+            best = None
+            for index in remaining:
+                extended = self._extend(counts, index)
+                if extended is None:
+                    continue
+                cost = sum(extended) - sum(counts)
+                key = (self.weights[index] / cost if cost else math.inf, -cost)
+                if best is None or key > best[0]:
+                    best = (key, index, extended)
+            if best is None:
+                break
+            _, index, counts = best
+            selection = tuple(sorted(selection + (index,)))
+            if self.memo.get(selection) is None:
+                self.memo[selection] = counts
+            remaining.remove(index)
+        return selection
+
+    def _branch_and_bound(self, candidates):
+        """分支定界搜索权重之和最大的可行资质集合"""
+        weights = self.weights
+        best = self._initial_selection(candidates)
+        best_weight = self._weight(best)
+
+        def search(selection, weight, compatible):
+            nonlocal best, best_weight
+            self.nodes += 1
+            if self.search_deadline is not None and self.nodes % _TIME_CHECK_INTERVAL == 0:
+                if time.perf_counter() > self.search_deadline:
+                    raise _SearchTimeout()
+            if not compatible or weight + sum(weights[index] for index in compatible) <= best_weight:
+                return
+
+            index = compatible[0]
+            rest = compatible[1:]
+            extended = tuple(sorted(selection + (index,)))
+            if self._feasible(extended, selection, index) is not None:
+                if weight + weights[index] > best_weight:
+                    best = extended
+                    best_weight = weight + weights[index]
+                search(extended, weight + weights[index],
+                       [other for other in rest if self._compatible(extended, other)])
+            search(selection, weight, rest)
+
+        try:
+            search((), 0, list(candidates))
+        except _SearchTimeout:
+            self.proven_optimal = False
+        return best
+
+    def _weight(self, selection):
+        return sum(self.weights[index] for index in selection)
+
+    def _lower_bound(self, selection):
+        """资质集合所需总人数的下界
+
+        要求齐全的资质所含职称各至少1人，其余缺口使用覆盖问题 LP 对偶的贪心可行解
+        （与 exact_solver 的下界相同，每个职称的对偶容量为1，按职称在资质中的出现次数计算）。
+        """
+        compiled = self.compiled
+        required = set()
+        for index in selection:
+            required |= self.required_sets[index]
+        deficits = []
+        for index in selection:
+            deficit = compiled.total_counts[index] - sum(1 for type_id in compiled.type_lists[index] if type_id in required)
+            if deficit > 0:
+                deficits.append((deficit, index))
+        deficits.sort(reverse=True)
+        capacity = {}
+        bound = 0.0
+        for deficit, index in deficits:
+            type_list = compiled.type_lists[index]
+            if not type_list:
+                return math.inf  # 不含任何职称的资质无法满足
+            coefficients = {type_id: type_list.count(type_id) for type_id in self.type_sets[index]}
+            y = min(capacity.get(type_id, 1.0) / coefficient for type_id, coefficient in coefficients.items())
+            if y > 0:
+                bound += y * deficit
+                for type_id, coefficient in coefficients.items():
+                    capacity[type_id] = capacity.get(type_id, 1.0) - coefficient * y
+        return len(required) + math.ceil(bound - 1e-9)
+
+    def _compatible(self, selection, index):
+        """资质加入当前选择后是否可能可行
+
+        在当前选择的人数上补足该资质即可行时记录结果；否则只用下界判断，不做完整判定。
+        """
+        extended = tuple(sorted(selection + (index,)))
+        if extended in self.memo:
+            return self.memo[extended] is not None
+        counts = self._extend(self.memo[selection], index)
+        if counts is not None:
+            self.memo[extended] = counts
+            return True
+        return self._lower_bound(extended) <= self.budget
+
+    def _feasible(self, selection, parent=None, index=None):
+        """判定资质集合是否可行，可行时返回一组满足要求的职称人数（记忆化）
+
+        提供 parent（去掉资质 index 后的集合）时先尝试在其人数上补足该资质。
+        """
+        if selection in self.memo:
+            return self.memo[selection]
+        counts = None
+        if parent is not None and self.memo.get(parent) is not None:
+            counts = self._extend(self.memo[parent], index)
+        if counts is None:
+            counts = self._find_counts(selection)
+        self.memo[selection] = counts
+        return counts
+
+    def _extend(self, counts, index):
+        """在已有人数上补足一个资质的要求，超出人员限制时返回None"""
+        compiled = self.compiled
+        maximum = self.maximum
+        type_list = compiled.type_lists[index]
+        extended = list(counts)
+        if compiled.require_all[index]:
+            for type_id in self.type_sets[index]:
+                if extended[type_id] < 1:
+                    extended[type_id] = 1
+        deficit = compiled.total_counts[index] - sum(extended[type_id] for type_id in type_list)
+        for type_id in self.fill_orders[index]:
+            if deficit <= 0:
+                break
+            multiplicity = type_list.count(type_id)
+            amount = -(-deficit // multiplicity)
+            if maximum is not None:
+                amount = min(amount, maximum[type_id] - extended[type_id])
+            if amount > 0:
+                extended[type_id] += amount
+                deficit -= amount * multiplicity
+        if deficit > 0 or not self._within_limits(extended):
+            return None
+        return tuple(extended)
+
+    def _find_counts(self, selection):
+        """依次用下界、贪心分配和精确求解判定资质集合是否可行"""
+        if any(self.base[index] == math.inf for index in selection):
+            return None
+        if self.budget is not None and self._lower_bound(selection) > self.budget:
+            return None
+
+        sub, maximum = self._sub_catalog(selection)
+
+        # 贪心分配满足人数限制时直接可行
+        allocation = _merge_compiled(sub)
+        counts = self._encode(sub, allocation.counts)
+        if self._within_limits(counts):
+            return counts
+
+        # 精确求解：只搜索总人数不超过预算、各职称不超过可用人数的解
+        time_limit = self._remaining_time(self.search_deadline)
+        if time_limit == 0:
+            # 搜索时间已用完，不再精确求解，按不可行处理
+            self.proven_optimal = False
+            return None
+        upper_bound = self.budget + 1 if self.budget is not None else None
+        sub_counts, proven = solve_exact(sub, None, time_limit, maximum=maximum, upper_bound=upper_bound)
+        if sub_counts is None:
+            if not proven:
+                # 超出时间预算仍未找到可行解，按不可行处理
+                self.proven_optimal = False
+            return None
+        return self._encode(sub, sub_counts)
+
+    def _sub_catalog(self, selection):
+        """资质集合的编译形式及其职称的可用人数"""
+        sub = CompiledCatalog([self.qualifications[index] for index in selection])
+        maximum = None
+        if self.maximum is not None:
+            maximum = [self.maximum[self.compiled.type_ids[type_name]] for type_name in sub.type_names]
+        return sub, maximum
+
+    def _encode(self, sub, sub_counts):
+        """资质集合编译形式中的人数数组转为整个资质列表的职称编号"""
+        counts = [0] * self.compiled.type_count
+        type_ids = self.compiled.type_ids
+        for type_name, count in zip(sub.type_names, sub_counts):
+            counts[type_ids[type_name]] = count
+        return tuple(counts)
+
+    def _within_limits(self, counts):
+        if self.budget is not None and sum(counts) > self.budget:
+            return False
+        maximum = self.maximum
+        return maximum is None or all(count <= limit for count, limit in zip(counts, maximum))
+
+    @staticmethod
+    def _remaining_time(deadline):
+        if deadline is None:
+            return None
+        return max(deadline - time.perf_counter(), 0.0)
+
+    def _result(self, selection):
+        """生成结果，并在剩余时间内求选出资质的最少人数（没有剩余时间时使用搜索中得到的人数）"""
+        final_counts = {}
+        if selection and self._feasible(selection) is None:
+            # 未能在时间预算内确认可行（按不可行处理），改用逐个补足得到的可行方案
+            self.proven_optimal = False
+            selection = self._initial_selection(list(selection))
+        if selection:
+            sub, maximum = self._sub_catalog(selection)
+            counts = self._feasible(selection)
+            incumbent = [counts[self.compiled.type_ids[type_name]] for type_name in sub.type_names]
+            time_limit = self._remaining_time(self.deadline)
+            sub_counts = None
+            if time_limit != 0:
+                sub_counts, _ = solve_exact(sub, incumbent, time_limit, maximum=maximum)
+            if sub_counts is None:
+                sub_counts = incumbent
+            final_counts = sub.decode_counts(sub_counts, [type_id for type_id in range(sub.type_count)
+                                                          if sub_counts[type_id] > 0])
+        return {
+            'qualifications': [self.compiled.names[index] for index in selection],
+            'weight': self._weight(selection),
+            'final_counts': final_counts,
+            'total_staff': sum(final_counts.values()),
+            'proven_optimal': self.proven_optimal,
+            'nodes': self.nodes
+        }
@@ -0,0 +1,74 @@
+# 反向查询：给定人员配置已满足哪些资质
+# 沿 职称 -> 资质 的倒排索引累计各资质的当前总人数与已有职称数，
+# 只有包含配置中至少一个职称的资质会被访问，不需要对资质目录逐个验证。
+# 未满足的资质按还差的人数排序，作为"接近满足"的结果返回。
+
+import heapq
+
+# 默认返回的接近满足的资质数量
+DEFAULT_NEAR_MISSES = 10
+
+
+def eligible_qualifications(snapshot, title_counts, near_misses=DEFAULT_NEAR_MISSES):
+    """查询人员配置已满足的资质和接近满足的资质
+
+    返回 {'satisfied': [...], 'near_misses': [...]}：
+      satisfied    已满足的资质 [{'qualification_name', 'current_total', 'required_total'}]，按目录顺序
+      near_misses  包含配置中的职称但尚未满足的资质，按还差的人数（相同时按目录顺序）排序，
+                   最多 near_misses 个（None 表示全部），missing_types 为要求齐全的资质缺少的职称：
+                   [{'qualification_name', 'people_missing', 'missing_types', 'current_total', 'required_total'}]
+    """
+    compiled = snapshot.compiled
+    type_ids = compiled.type_ids
+    type_occurrences = compiled.type_occurrences
+
+    # 资质编号 -> 当前总人数、已有人员的职称出现次数
+    totals = {}
+    present = {}
+    for type_name, count in title_counts.items():
+        type_id = type_ids.get(type_name)
+        if type_id is None or count < 1:
+            continue
+        for index in type_occurrences[type_id]:
+            totals[index] = totals.get(index, 0) + count
+            present[index] = present.get(index, 0) + 1
+
+    satisfied = []
+    misses = []
+    for index in sorted(totals):
+        total = totals[index]
+        required = compiled.total_counts[index]
+        type_list = compiled.type_lists[index]
+        all_types_ok = present[index] == len(type_list)
+        if total >= required and (all_types_ok or not compiled.require_all[index]):
+            satisfied.append({
+                'qualification_name': compiled.names[index],
+                'current_total': total,
+                'required_total': required
+            })
+            continue
+
+        # 要求职称齐全时每个缺少的职称至少补1人，补的人同时计入总人数
+        missing_types = []
+        if compiled.require_all[index] and not all_types_ok:
+            for type_id in type_list:
+                type_name = compiled.type_names[type_id]
+                if title_counts.get(type_name, 0) < 1 and type_name not in missing_types:
+                    missing_types.append(type_name)
+        people_missing = max(required - total, len(missing_types))
+        misses.append((people_missing, index, {
+            'qualification_name': compiled.names[index],
+            'people_missing': people_missing,
+            'missing_types': missing_types,
+            'current_total': total,
+            'required_total': required
+        }))
+
+    if near_misses is None:
+        misses.sort(key=lambda item: (item[0], item[1]))
+    else:
+        misses = heapq.nsmallest(near_misses, misses, key=lambda item: (item[0], item[1]))
+    return {
+        'satisfied': satisfied,
+        'near_misses': [item for _, _, item in misses]
+    }
@@ -0,0 +1,174 @@
+# 精确求解：最少总人数的整数覆盖模型（分支定界）
+#
+# 模型（x_t 为职称 t 的人数，非负整数）：
+#   最小化  Σ x_t
+#   约束    x_t ≥ 1                       t 属于要求齐全的资质
+#           Σ_{t∈q} x_t ≥ total_count(q)  每个资质 q
+#           x_t ≥ m_t                     已有人员 m_t（可选，此时相当于最小化新增人数）
+#           x_t ≤ a_t                     可用人数 a_t（可选）
+#
+# 以贪心算法的结果作为初始最优解，按时间预算进行深度优先的分支定界搜索。
+# 下界使用覆盖问题 LP 对偶的贪心可行解（每个职称的对偶容量为1）。
+import math
+import time
+
+# 默认时间预算（秒）
+DEFAULT_TIME_LIMIT = 2.0
+
+# 每搜索多少个节点检查一次时间
+_TIME_CHECK_INTERVAL = 256
+
+
+# 搜索栈中的操作：访问节点、调整职称人数、冻结职称、解除冻结
+_VISIT, _ADD, _FREEZE, _UNFREEZE = range(4)
+
+
+class _SearchTimeout(Exception):
+    """搜索超出时间预算"""
+
+
+def solve_exact(compiled, incumbent=None, time_limit=DEFAULT_TIME_LIMIT, minimum=None,
+                maximum=None, upper_bound=None):
+    """求解最少总人数的职称分配
+
+    compiled 为所选资质的编译形式，incumbent 为已知可行解的人数数组（如贪心结果），
+    minimum 为各职称人数的下界（已有人员的人数数组），maximum 为各职称人数的上界（可用人数数组），
+    upper_bound 为总人数的上界（只搜索总人数小于该值的解，未提供 incumbent 时使用）。
+    返回 (人数数组, 是否已证明最优)。超出时间预算时返回搜索到的最好解；
+    没有可行解时人数数组为None（已证明时表示不存在满足上下界的解）。
+    """
+    type_lists = compiled.type_lists
+    total_counts = compiled.total_counts
+    qual_count = len(type_lists)
+    type_count = compiled.type_count
+
+    # 职称 -> 包含该职称的资质（职称在资质中重复出现时重复记录，相当于系数累加）
+    type_occurrences = compiled.type_occurrences
+    unique_types = [list(dict.fromkeys(qual_types)) for qual_types in type_lists]
+    # 资质 -> {职称: 在资质中的出现次数}，即约束中该职称的系数（每1人为资质总数贡献的人数）
+    coefficients = [{t: qual_types.count(t) for t in unique} for qual_types, unique in zip(type_lists, unique_types)]
+
+    # 要求齐全的资质：所含职称至少1人，与已有人数一起作为变量下界直接固定
+    counts = list(minimum) if minimum is not None else [0] * type_count
+    for index in range(qual_count):
+        if compiled.require_all[index]:
+            for type_id in type_lists[index]:
+                counts[type_id] = max(counts[type_id], 1)
+    if maximum is not None and any(count > limit for count, limit in zip(counts, maximum)):
+        return None, True
+    deficits = [total_counts[index] - sum(counts[t] for t in type_lists[index])
+                for index in range(qual_count)]
+    frozen = bytearray(type_count)
+
+    best_counts = list(incumbent) if incumbent is not None else None
+    if incumbent is not None:
+        best_total = sum(incumbent)
+    else:
+        best_total = upper_bound if upper_bound is not None else math.inf
+    state = {'total': sum(counts), 'nodes': 0}
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    def add(type_id, amount):
+        """调整职称人数并同步各资质的缺口"""
+        counts[type_id] += amount
+        state['total'] += amount
+        for index in type_occurrences[type_id]:
+            deficits[index] -= amount
+
+    def free_types(index):
+        """资质中还可以增加人数的职称（未冻结且未达到可用人数）"""
+        if maximum is None:
+            return [t for t in unique_types[index] if not frozen[t]]
+        return [t for t in unique_types[index] if not frozen[t] and counts[t] < maximum[t]]
+
+    def lower_bound():
+        """剩余缺口所需人数的下界（LP 对偶的贪心可行解）
+
+        对偶约束：每个职称 t 满足 Σ_q a_qt·y_q ≤ 1（a_qt 为职称在资质中的出现次数）。
+        """
+        open_quals = [index for index in range(qual_count) if deficits[index] > 0]
+        open_quals.sort(key=lambda x: -deficits[x])
+        capacity = [1.0] * type_count
+        bound = 0.0
+        for index in open_quals:
+            free = free_types(index)
+            if not free:
+                return math.inf  # 所有职称均已冻结，缺口无法补足
+            coefficient = coefficients[index]
+            y = min(capacity[t] / coefficient[t] for t in free)
+            if y > 0:
+                bound += y * deficits[index]
+                for t in free:
+                    capacity[t] -= coefficient[t] * y
+        return math.ceil(bound - 1e-9)
+
+    def visit():
+        """访问一个搜索节点，返回需要依次执行的后续操作（按执行顺序）"""
+        nonlocal best_counts, best_total
+        state['nodes'] += 1
+        if deadline is not None and state['nodes'] % _TIME_CHECK_INTERVAL == 0:
+            if time.perf_counter() > deadline:
+                raise _SearchTimeout()
+
+        if state['total'] + lower_bound() >= best_total:
+            return []
+
+        # 选择可选职称最少的未满足资质进行分支，可选职称数相同时取缺口大的
+        selected = None
+        selected_free = None
+        for index in range(qual_count):
+            if deficits[index] > 0:
+                free = free_types(index)
+                if (selected is None or len(free) < len(selected_free) or
+                        (len(free) == len(selected_free) and deficits[index] > deficits[selected])):
+                    selected = index
+                    selected_free = free
+
+        if selected is None:
+            # 所有资质都已满足，得到更优解
+            best_total = state['total']
+            best_counts = counts[:]
+            return []
+
+        if len(selected_free) == 1:
+            # 只剩一个可选职称，缺口必须全部由它补足（职称重复出现时每人补足多个名额）
+            type_id = selected_free[0]
+            multiplicity = coefficients[selected][type_id]
+            amount = -(-deficits[selected] // multiplicity)
+            if maximum is not None and counts[type_id] + amount > maximum[type_id]:
+                return []
+            return [(_ADD, type_id, amount), (_VISIT,), (_ADD, type_id, -amount)]
+
+        # 覆盖更多未满足资质的职称优先尝试
+        selected_free.sort(key=lambda t: -sum(1 for index in type_occurrences[t] if deficits[index] > 0))
+
+        # 分支 i：第 i 个职称增加1人，前 i-1 个职称在该分支内不再增加，避免重复搜索同一分配
+        operations = []
+        for type_id in selected_free:
+            operations += [(_ADD, type_id, 1), (_VISIT,), (_ADD, type_id, -1), (_FREEZE, type_id)]
+        operations.append((_UNFREEZE, selected_free))
+        return operations
+
+    def search():
+        """深度优先搜索：使用显式栈代替递归，搜索深度（随总人数增长）不受递归深度限制"""
+        stack = [(_VISIT,)]
+        while stack:
+            operation = stack.pop()
+            kind = operation[0]
+            if kind == _VISIT:
+                stack.extend(reversed(visit()))
+            elif kind == _ADD:
+                add(operation[1], operation[2])
+            elif kind == _FREEZE:
+                frozen[operation[1]] = 1
+            else:
+                for type_id in operation[1]:
+                    frozen[type_id] = 0
+
+    try:
+        search()
+        proven_optimal = True
+    except _SearchTimeout:
+        proven_optimal = False
+
+    return best_counts, proven_optimal
@@ -1,8 +1,8 @@
 from qualification_matcher import get_qualification_by_name
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 # 加载资质数据
-data = load_qualification_data()
+data = get_catalog().snapshot()
 
 # 5个资质名称
 qual_names = ["建筑总包二级", "市政总包二级", "机电总包二级", "矿山总包二级", "石油总包二级"]
@@ -1,6 +1,10 @@
 # 导入需要使用的模块
 import json
+import heapq
 import re        # 正则表达模块，用于 对文字信息完整匹配。
+from functools import lru_cache
+
+from pinyin_index import is_pinyin_query
 
 def load_qualification_data():
     """加载资质数据"""
@@ -15,103 +19,281 @@ def calculate_jaccard_similarity(str1, str2):
     union = len(set1.union(set2))
     return intersection / union if union != 0 else 0
 
-def calculate_levenshtein_distance(str1, str2):
-    """计算Levenshtein距离"""
+@lru_cache(maxsize=256)
+def _pattern_masks(pattern):
+    """字符 -> 该字符在 pattern 中出现位置的位掩码（同一关键词的多次计算复用）"""
+    masks = {}
+    bit = 1
+    for char in pattern:
+        masks[char] = masks.get(char, 0) | bit
+        bit <<= 1
+    return masks
+
+@lru_cache(maxsize=256)
+def _char_counts(pattern):
+    """pattern 中每个字符的出现次数"""
+    counts = {}
+    for char in pattern:
+        counts[char] = counts.get(char, 0) + 1
+    return tuple(counts.items())
+
+@lru_cache(maxsize=1024)
+def _max_distance(length, threshold):
+    """相似度 1 - d/length 不低于 threshold 时允许的最大编辑距离 d（与浮点比较结果一致）"""
+    distance = min(int((1 - threshold) * length), length)
+    while distance < length and 1 - ((distance + 1) / length) >= threshold:
+        distance += 1
+    while distance >= 0 and 1 - (distance / length) < threshold:
+        distance -= 1
+    return distance
+
+def _bit_parallel_distance(pattern, text, limit=None):
+    """Myers 位并行算法计算编辑距离，超过 limit 已成定局时提前返回None"""
+    masks = _pattern_masks(pattern)
+    full = (1 << len(pattern)) - 1
+    last = 1 << (len(pattern) - 1)
+    vp = full   # 纵向差值为+1的位置
+    vn = 0      # 纵向差值为-1的位置
+    score = len(pattern)
+    remaining = len(text)
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | (~(xh | vp) & full)
+        hn = vp & xh
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        vp = hn | (~(xv | hp) & full)
+        vn = hp & xv
+        # 之后每个字符最多使距离减少1
+        remaining -= 1
+        if limit is not None and score - remaining > limit:
+            return None
+    return score
+
+def calculate_levenshtein_distance(str1, str2, threshold=None):
+    """计算Levenshtein距离，转换为相似度（0-1之间）
+    
+    提供 threshold 时，确定相似度低于 threshold 的情况会提前结束并返回0。
+    """
     m, n = len(str1), len(str2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
-    
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            cost = 0 if str1[i-1] == str2[j-1] else 1
-            dp[i][j] = min(
-                dp[i-1][j] + 1,      # 删除
-                dp[i][j-1] + 1,      # 插入
-                dp[i-1][j-1] + cost  # 替换
-            )
-    
-    # 转换为相似度（0-1之间）
     max_len = max(m, n)
-    return 1 - (dp[m][n] / max_len) if max_len != 0 else 1
+    if max_len == 0:
+        return 1
+    if m == 0 or n == 0:
+        return 1 - (max_len / max_len)
+    
+    limit = None
+    if threshold is not None:
+        limit = _max_distance(max_len, threshold)
+        # 下界1：长度差
+        if abs(m - n) > limit:
+            return 0
+        # 下界2：两个字符串字符多重集的交集之外的字符都需要编辑
+        common = 0
+        for char, count in _char_counts(str1):
+            common += min(count, str2.count(char))
+        if max_len - common > limit:
+            return 0
+    
+    distance = _bit_parallel_distance(str1, str2, limit)
+    if distance is None:
+        return 0
+    return 1 - (distance / max_len)
 
-def fuzzy_search(query, data, threshold=0.3):
-    """模糊搜索资质名称"""
-    results = []
-    query = query.strip()
+def score_name(query, name, threshold=0.3):
+    """计算关键词与资质名称的匹配得分，不匹配时返回None"""
+    # 精确匹配优先
+    if query == name:
+        return 1.0
     
-    for item in data:
-        name = item['name']
-        
-        # 精确匹配优先
-        if query == name:
-            results.append((name, 1.0))
-            continue
-        
-        # 1. 检查是否是前缀匹配（如"建筑"匹配"建筑总包二级"）
-        if name.startswith(query):
-            results.append((name, 0.9))
-            continue
+    # 1. 检查是否是前缀匹配（如"建筑"匹配"建筑总包二级"）
+    if name.startswith(query):
+        return 0.9
+    
+    # 2. 检查是否是包含关系且关键词与资质类型相关（如"建筑二"匹配"建筑总包二级"）
+    # 这里我们只匹配包含关键词且关键词与资质类型相关的情况
+    # 例如："建筑二"匹配"建筑总包二级"，但"建筑总包"不匹配"市政总包二级"
+    
+    # 特殊处理：如果关键词包含"总包"，则只匹配完全包含该关键词的资质
+    if "总包" in query:
+        if query in name:
+            return 0.8
+        return None
+    
+    # 3. 处理"建筑二"这种情况，匹配"建筑总包二级"
+    # 检查关键词的字符是否按顺序出现在名称中，且考虑资质类型
+    contains_match = True
+    last_index = -1
+    for char in query:
+        index = name.find(char, last_index + 1)
+        if index == -1:
+            contains_match = False
+            break
+        last_index = index
+    
+    if contains_match:
+        # 计算匹配得分
+        # 得分1：关键词长度占名称长度的比例
+        length_score = len(query) / len(name)
+        # 得分2：关键词字符在名称中连续出现的程度
+        intervals = []
+        prev_index = -1
+        for char in query:
+            curr_index = name.find(char, prev_index + 1)
+            if prev_index != -1:
+                intervals.append(curr_index - prev_index - 1)
+            prev_index = curr_index
         
-        # 2. 检查是否是包含关系且关键词与资质类型相关（如"建筑二"匹配"建筑总包二级"）
-        # 这里我们只匹配包含关键词且关键词与资质类型相关的情况
-        # 例如："建筑二"匹配"建筑总包二级"，但"建筑总包"不匹配"市政总包二级"
+        avg_interval = sum(intervals) / len(intervals) if intervals else 0
+        continuity_score = 1 / (1 + avg_interval)  # 间隔越小，得分越高
         
-        # 特殊处理：如果关键词包含"总包"，则只匹配完全包含该关键词的资质
-        if "总包" in query:
-            if query in name:
-                results.append((name, 0.8))
+        # 总得分
+        return length_score * 0.6 + continuity_score * 0.4
+    
+    # 4. 计算Levenshtein相似度（用于更模糊的匹配）
+    levenshtein_sim = calculate_levenshtein_distance(query, name, threshold)
+    if levenshtein_sim >= threshold:
+        return levenshtein_sim
+    return None
+
+def _inexact_score_bound(query):
+    """除精确匹配外，任何名称可能得到的最高分
+    
+    前缀匹配为0.9，"总包"包含匹配为0.8；按序包含时名称至少比关键词长1个字，
+    得分不超过 n/(n+1)*0.6 + 0.4；Levenshtein 匹配时编辑距离至少为1，
+    且关键词不是名称的子序列，相似度不超过 1 - 1/n（n 为关键词长度）。
+    """
+    n = len(query)
+    if n == 0 or "总包" in query:
+        return 0.9
+    return max(0.9, (n / (n + 1)) * 0.6 + 1 * 0.4, 1 - (1 / n))
+
+def _pinyin_scores(query, pinyin_index, threshold):
+    """拼音关键词的得分：按每个等价汉字关键词打分，同一名称取最高分（按目录顺序返回）"""
+    for _, name, han_queries in pinyin_index.equivalent_queries(query):
+        best = None
+        for han_query in han_queries:
+            score = score_name(han_query, name, threshold)
+            if score is not None and (best is None or score > best):
+                best = score
+        yield name, best
+
+def _overlap_filtered_scores(query, search_index, positions, overlap, threshold):
+    """按共有字符数过滤后打分（按给定的位置顺序返回）
+    
+    名称包含关键词的全部字符（按出现次数计）时才可能是精确、前缀或按序包含匹配，照常打分；
+    否则只可能是 Levenshtein 匹配，编辑距离至少为 max(长度) - 共有字符数，超过阈值对应的距离时直接跳过。
+    """
+    names = search_index.names
+    lengths = search_index.lengths
+    query_length = len(query)
+    for position in positions:
+        name = names[position]
+        common = overlap.get(position, 0)
+        if common == query_length:
+            yield name, score_name(query, name, threshold)
             continue
-        
-        # 3. 处理"建筑二"这种情况，匹配"建筑总包二级"
-        # 检查关键词的字符是否按顺序出现在名称中，且考虑资质类型
-        contains_match = True
-        last_index = -1
-        for char in query:
-            index = name.find(char, last_index + 1)
-            if index == -1:
-                contains_match = False
-                break
-            last_index = index
-        
-        if contains_match:
-            # 计算匹配得分
-            # 得分1：关键词长度占名称长度的比例
-            length_score = len(query) / len(name)
-            # 得分2：关键词字符在名称中连续出现的程度
-            intervals = []
-            prev_index = -1
-            for char in query:
-                curr_index = name.find(char, prev_index + 1)
-                if prev_index != -1:
-                    intervals.append(curr_index - prev_index - 1)
-                prev_index = curr_index
-            
-            avg_interval = sum(intervals) / len(intervals) if intervals else 0
-            continuity_score = 1 / (1 + avg_interval)  # 间隔越小，得分越高
-            
-            # 总得分
-            total_score = length_score * 0.6 + continuity_score * 0.4
-            results.append((name, total_score))
+        max_len = max(query_length, lengths[position])
+        if max_len - common > _max_distance(max_len, threshold):
             continue
-        
-        # 4. 计算Levenshtein相似度（用于更模糊的匹配）
-        levenshtein_sim = calculate_levenshtein_distance(query, name)
-        if levenshtein_sim >= threshold:
-            results.append((name, levenshtein_sim))
+        levenshtein_sim = calculate_levenshtein_distance(query, name, threshold)
+        yield name, (levenshtein_sim if levenshtein_sim >= threshold else None)
+
+def fuzzy_search(query, data, threshold=0.3, limit=None, min_score=None, with_scores=False, candidates=None):
+    """模糊搜索资质名称
     
-    # 按相似度降序排序
-    results.sort(key=lambda x: x[1], reverse=True)
+    limit 为返回的最大结果数（按得分取前 limit 个，有界堆选择），min_score 为结果的最低得分，
+    with_scores 为真时返回 (名称, 得分) 列表。得分相同时按资质目录顺序排列。
+    candidates 为已算好的候选名称位置（如由前缀的候选推出），提供时不再查询倒排索引。
+    拼音关键词（如 jzzb、jianzhu）在资质目录带有拼音索引时按等价的汉字关键词打分。
+    """
+    results = []
+    query = query.strip()
+    
+    # 提前结束扫描的条件：尚未扫描到的精确匹配数量，以及其余名称可能的最高分
+    exact_remaining = 0
+    bound = None
+    
+    pinyin_index = getattr(data, 'pinyin_index', None)
+    if pinyin_index and is_pinyin_query(query):
+        # 拼音关键词对应的汉字关键词长度不定，不提前结束扫描
+        scored = _pinyin_scores(query, pinyin_index, threshold)
+    else:
+        # 资质目录快照带有倒排索引，只对与关键词有共同字符的名称打分
+        search_index = getattr(data, 'search_index', None)
+        vector_scorer = getattr(data, 'vector_scorer', None)
+        if vector_scorer is not None and query:
+            # 资质目录较大时对候选名称整体做数组运算打分
+            if candidates is None:
+                candidates = search_index.candidates(query)
+            positions, scores = vector_scorer.score(query, candidates, threshold)
+            names = search_index.names
+            scored = ((names[position], score) for position, score in zip(positions, scores))
+        elif search_index is not None and len(query) > 1 and "总包" not in query:
+            # 同时统计共有字符数，排除不可能达到 Levenshtein 阈值的名称
+            overlap = search_index.char_overlap(query)
+            positions = candidates if candidates is not None else sorted(overlap)
+            scored = _overlap_filtered_scores(query, search_index, positions, overlap, threshold)
+        else:
+            if search_index is not None and candidates is not None:
+                names = [search_index.names[position] for position in candidates]
+            elif search_index is not None:
+                names = search_index.candidate_names(query)
+            else:
+                names = [item['name'] for item in data]
+            scored = ((name, score_name(query, name, threshold)) for name in names)
+        if limit:
+            # 精确匹配（1.0）总能进入前 limit 个
+            if search_index is not None:
+                exact_remaining = search_index.name_counts.get(query, 0)
+            else:
+                exact_remaining = names.count(query)
+            bound = _inexact_score_bound(query)
+    
+    if limit is None:
+        for name, score in scored:
+            if score is not None and (min_score is None or score >= min_score):
+                results.append((name, score))
+        
+        # 按相似度降序排序
+        results.sort(key=lambda x: x[1], reverse=True)
+    else:
+        # 有界小顶堆保存当前得分最高的 limit 个结果，堆顶为其中最差的结果
+        # 元素为 (得分, -序号, 名称)，得分相同时序号小（目录中靠前）的更优
+        heap = []
+        if limit > 0:
+            for position, (name, score) in enumerate(scored):
+                if name == query:
+                    exact_remaining -= 1
+                if score is None or (min_score is not None and score < min_score):
+                    continue
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, -position, name))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, -position, name))
+                # 已有 limit 个结果且都不低于其余名称可能的最高分（同分时靠前者优先），
+                # 后面的名称不可能再进入结果，提前结束扫描
+                if (bound is not None and len(heap) == limit and exact_remaining <= 0
+                        and heap[0][0] >= bound):
+                    break
+        heap.sort(reverse=True)
+        results = [(name, score) for score, _, name in heap]
     
+    if with_scores:
+        return results
     # 返回匹配的资质名称列表
     return [result[0] for result in results]
 
 def test_fuzzy_search():
     """测试模糊搜索功能"""
-    data = load_qualification_data()
+    from qualification_catalog import get_catalog
+    data = get_catalog().snapshot()
     
     test_queries = [
         "建筑二",
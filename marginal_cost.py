@@ -0,0 +1,95 @@
+# 追加资质的边际人数
+# 已选资质的职称人数（final_counts）满足所有已选资质，追加一个资质时人数只增不减，
+# 已选资质仍然满足，因此只需在当前人数上补足新资质：缺少的必需职称各补1人，
+# 总人数缺口补到新资质的职称上（职称在资质中重复出现时优先补重复次数多的职称）。
+# 这是保持当前人数不变时追加该资质的最少新增人数，不需要对每个候选资质重新做完整的合并计算。
+#
+# 与已选资质没有共同职称的资质不能利用当前人数，通过 职称 -> 资质 的倒排索引只访问有共同职称的资质；
+# 需要时其余资质按单独所需人数（每个资质目录版本计算一次）一并排序。
+import heapq
+import threading
+
+_standalone_cache = {}
+_standalone_lock = threading.Lock()
+
+
+def rank_additions(snapshot, selection, final_counts, include_unrelated=False, limit=None):
+    """计算追加每个资质所需的新增人数，按新增人数从少到多排序（相同时按目录顺序）
+
+    selection 为已选资质名称，final_counts 为当前职称人数（职称名称 -> 人数）。
+    include_unrelated 为 True 时包含与已选资质没有共同职称的资质，limit 为最多返回的数量。
+    返回 [{'qualification_name', 'extra_staff', 'additions', 'shared_types'}]，
+    additions 为各职称需要新增的人数，shared_types 为与已选资质共同的职称。
+    """
+    compiled = snapshot.compiled
+    selected = {compiled.qual_ids[name] for name in selection if name in compiled.qual_ids}
+    counts = compiled.encode_counts(final_counts)
+
+    # 已选资质的职称，通过倒排索引找到有共同职称的资质
+    selected_types = set()
+    for index in selected:
+        selected_types.update(compiled.type_lists[index])
+    related = set()
+    for type_id in selected_types:
+        related.update(compiled.type_quals[type_id])
+    related -= selected
+
+    ranked = []
+    for index in related:
+        extra, additions = _additions(compiled, index, counts)
+        shared = [compiled.type_names[type_id] for type_id in dict.fromkeys(compiled.type_lists[index])
+                  if type_id in selected_types]
+        ranked.append((extra, index, additions, shared))
+
+    if include_unrelated:
+        standalone = _standalone_costs(snapshot)
+        for index in range(len(compiled.names)):
+            if index in related or index in selected or standalone[index] is None:
+                continue
+            extra, additions = standalone[index]
+            ranked.append((extra, index, dict(additions), []))
+
+    if limit is None:
+        ranked.sort(key=lambda item: (item[0], item[1]))
+    else:
+        ranked = heapq.nsmallest(limit, ranked, key=lambda item: (item[0], item[1]))
+    return [{
+        'qualification_name': compiled.names[index],
+        'extra_staff': extra,
+        'additions': additions,
+        'shared_types': shared
+    } for extra, index, additions, shared in ranked]
+
+
+def _additions(compiled, index, counts):
+    """在当前人数上补足资质的要求，返回 (新增总人数, 职称名称 -> 新增人数)"""
+    type_list = compiled.type_lists[index]
+    added = {}
+    if compiled.require_all[index]:
+        for type_id in dict.fromkeys(type_list):
+            if counts[type_id] < 1:
+                added[type_id] = 1
+    deficit = compiled.total_counts[index] - sum(counts[type_id] + added.get(type_id, 0) for type_id in type_list)
+    if deficit > 0:
+        # 补到重复次数最多的职称上（相同时取资质中靠前的职称），每人为总人数贡献的最多
+        type_id = max(dict.fromkeys(type_list), key=type_list.count)
+        multiplicity = type_list.count(type_id)
+        added[type_id] = added.get(type_id, 0) + -(-deficit // multiplicity)
+    additions = {compiled.type_names[type_id]: amount for type_id, amount in added.items()}
+    return sum(added.values()), additions
+
+
+def _standalone_costs(snapshot):
+    """每个资质单独所需的人数与职称分配（不含任何职称的资质为None），每个资质目录版本只计算一次"""
+    with _standalone_lock:
+        costs = _standalone_cache.get(snapshot.version)
+    if costs is None:
+        compiled = snapshot.compiled
+        zero = compiled.new_counts()
+        costs = [_additions(compiled, index, zero) if compiled.type_lists[index] else None
+                 for index in range(len(compiled.names))]
+        with _standalone_lock:
+            # 只保留当前版本
+            _standalone_cache.clear()
+            _standalone_cache[snapshot.version] = costs
+    return costs
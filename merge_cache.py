@@ -0,0 +1,118 @@
+# 合并计算结果缓存
+# 以规范化的资质集合（去重、排序后的名称）、计算引擎和资质目录版本作为键的 LRU 缓存，
+# 资质的选择顺序不影响结果，资质数据修改后旧的缓存条目自然失效。
+import copy
+import threading
+from collections import OrderedDict
+
+from exact_solver import DEFAULT_TIME_LIMIT
+from qualification_matcher import merge_qualifications, merge_qualifications_exact
+
+# 默认最多缓存的结果数
+DEFAULT_MAX_ENTRIES = 1024
+# 默认参与缓存的最大资质数量，更大的组合直接计算
+DEFAULT_MAX_SELECTION = 32
+
+
+class MergeCache:
+    """合并计算结果的 LRU 缓存（线程安全）"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_selection=DEFAULT_MAX_SELECTION):
+        self.max_entries = max_entries
+        self.max_selection = max_selection
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """获取缓存结果，不存在时返回None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # 返回副本，调用方修改结果不会影响缓存
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.max_entries <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def canonical_selection(snapshot, names):
+    """规范化资质选择：去掉不存在和重复的名称并排序"""
+    return tuple(sorted({name for name in names if snapshot.get(name) is not None}))
+
+
+def canonical_existing(snapshot, selection, existing):
+    """规范化已有人员：只保留所选资质中人数大于0的职称并排序"""
+    if not existing:
+        return ()
+    types = {type_name for name in selection for type_name in snapshot.get(name)['types']}
+    return tuple(sorted((type_name, count) for type_name, count in existing.items()
+                        if count > 0 and type_name in types))
+
+
+def merge_selection(snapshot, names, engine='greedy', time_limit=DEFAULT_TIME_LIMIT,
+                    cache=None, executor=None, plan_table=None, existing=None):
+    """按规范化的资质集合计算合并结果，依次查询方案表（仅贪心引擎）、缓存，最后实时计算
+
+    返回 (final_counts, type_attributes, proven_optimal)，贪心引擎的 proven_optimal 为None。
+    计算总是在规范化后的资质顺序上进行，因此查表、缓存命中与重新计算的结果完全相同。
+    existing 为已有人员（职称名称 -> 人数）时以其为下界计算（不使用方案表），结果为包含已有人员的总人数。
+    """
+    selection = canonical_selection(snapshot, names)
+    existing = canonical_existing(snapshot, selection, existing)
+    if plan_table is not None and engine == 'greedy' and not existing:
+        result = plan_table.lookup(snapshot, selection)
+        if result is not None:
+            return result
+
+    key = (snapshot.version, engine, selection, existing)
+    use_cache = cache is not None and len(selection) <= cache.max_selection
+
+    if use_cache:
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    qualifications = snapshot.lookup(selection)
+    existing = dict(existing)
+    if engine == 'exact':
+        result = merge_qualifications_exact(qualifications, time_limit, executor, existing)
+    else:
+        result = merge_qualifications(qualifications, executor, existing) + (None,)
+
+    # 精确求解只缓存已证明最优的结果（超时结果与时间预算有关）
+    if use_cache and result[2] is not False:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,179 @@
+# 资质名称拼音索引
+# 资质数据更新时（update_qualification_data.py）离线为每个名称生成逐字拼音，存入资质数据的 pinyin 字段；
+# 运行时只根据该字段建立拼音音节前缀树，搜索时不需要任何拼音库。
+#
+# 拼音关键词可以是全拼（jianzhu）、首字母（jzzb）或二者混合（jianzb）：
+# 关键词依次切分为若干段，每段是名称中某个字拼音的前缀，且各段对应的字在名称中从左到右排列。
+# 匹配到的字组成等价的汉字关键词（如 jzzb -> 建筑总包），再按汉字关键词的规则打分，排序层级与汉字搜索相同。
+import re
+
+# 资质数据中存放逐字拼音的字段
+PINYIN_FIELD = 'pinyin'
+
+# 每个名称最多枚举的匹配数量（防止关键词很长时组合过多）。达到上限时另外补充所有连续匹配
+# （对应精确、前缀与包含匹配，得分最高的几个层级），只有按序包含的匹配可能不完整
+_MAX_MATCHINGS = 64
+
+_PINYIN_QUERY_PATTERN = re.compile(r"[A-Za-z][A-Za-z' ]*")
+
+
+def is_pinyin_query(query):
+    """关键词是否为拼音（只包含字母、空格和隔音符号）"""
+    return bool(_PINYIN_QUERY_PATTERN.fullmatch(query))
+
+
+def normalize_pinyin_query(query):
+    """去掉空格与隔音符号并转为小写"""
+    return query.replace("'", "").replace(" ", "").lower()
+
+
+def name_to_pinyin(name):
+    """生成名称的逐字拼音（离线使用，需要安装 pypinyin），非汉字保留原字符的小写形式"""
+    from pypinyin import Style, lazy_pinyin
+
+    # 按整个名称转换以便正确处理多音字，非汉字逐字保留
+    syllables = lazy_pinyin(name, style=Style.NORMAL, errors=lambda chars: [char for char in chars])
+    if len(syllables) != len(name):
+        syllables = [lazy_pinyin(char, style=Style.NORMAL, errors=lambda chars: [c for c in chars])[0]
+                     for char in name]
+    return [syllable.lower() for syllable in syllables]
+
+
+def add_pinyin(qualifications):
+    """为资质数据添加拼音字段（离线使用）
+
+    未安装 pypinyin 时保留已有的拼音字段，返回False。
+    """
+    try:
+        import pypinyin  # noqa: F401
+    except ImportError:
+        print("未安装 pypinyin，跳过资质名称拼音的生成")
+        return False
+    for qual in qualifications:
+        qual[PINYIN_FIELD] = name_to_pinyin(qual['name'])
+    return True
+
+
+def without_pinyin(qual):
+    """去掉拼音字段的资质记录（拼音只供搜索使用，不对外返回）"""
+    if PINYIN_FIELD not in qual:
+        return qual
+    return {key: value for key, value in qual.items() if key != PINYIN_FIELD}
+
+
+class PinyinIndex:
+    """资质名称的拼音音节前缀树"""
+
+    def __init__(self, qualifications):
+        # 名称位置 -> (名称, 逐字拼音)，位置与资质目录中的顺序一致；没有拼音的名称为None
+        self.entries = []
+        # 前缀树：节点为字典，字母 -> 子节点；键 None 存放经过该节点的音节所在的名称位置集合
+        self.trie = {}
+        # 带有拼音的名称数量
+        self.size = 0
+        for position, qual in enumerate(qualifications):
+            name = qual['name']
+            syllables = qual.get(PINYIN_FIELD)
+            if not syllables or len(syllables) != len(name):
+                self.entries.append(None)
+                continue
+            self.entries.append((name, tuple(syllables)))
+            self.size += 1
+            for syllable in set(syllables):
+                node = self.trie
+                for letter in syllable:
+                    node = node.setdefault(letter, {})
+                    node.setdefault(None, set()).add(position)
+
+    def __len__(self):
+        return self.size
+
+    def candidates(self, query):
+        """可能与拼音关键词匹配的名称位置（按目录顺序）
+
+        关键词切分后的每一段都是名称中某个音节的前缀：沿前缀树逐段匹配，对各段的名称位置集合求交集。
+        reachable[i] 为关键词前 i 个字母可以切分成音节前缀的名称（不检查各段的先后顺序，由 matchings 确认）。
+        """
+        reachable = [None] * (len(query) + 1)
+        for start in range(len(query)):
+            if start and not reachable[start]:
+                continue
+            node = self.trie
+            for end in range(start, len(query)):
+                node = node.get(query[end])
+                if node is None:
+                    break
+                positions = node[None] if start == 0 else reachable[start] & node[None]
+                if positions:
+                    reachable[end + 1] = positions | reachable[end + 1] if reachable[end + 1] else positions
+        return sorted(reachable[-1]) if reachable[-1] else []
+
+    def matchings(self, query, position):
+        """拼音关键词在指定名称中的所有匹配，返回等价汉字关键词的集合"""
+        name, syllables = self.entries[position]
+        results = set()
+        chosen = []
+        # 已确认无法完成匹配的 (关键词位置, 音节位置)
+        dead = set()
+
+        def match(query_index, syllable_index):
+            if len(results) >= _MAX_MATCHINGS:
+                return True
+            if query_index == len(query):
+                results.add(''.join(name[i] for i in chosen))
+                return True
+            if (query_index, syllable_index) in dead:
+                return False
+            found = False
+            rest = len(query) - query_index
+            for i in range(syllable_index, len(syllables)):
+                syllable = syllables[i]
+                length = 1
+                while length <= rest and length <= len(syllable) and \
+                        query[query_index + length - 1] == syllable[length - 1]:
+                    chosen.append(i)
+                    if match(query_index + length, i + 1):
+                        found = True
+                    chosen.pop()
+                    length += 1
+            if not found:
+                dead.add((query_index, syllable_index))
+            return found
+
+        match(0, 0)
+        if len(results) >= _MAX_MATCHINGS:
+            results |= self._contiguous_matchings(query, name, syllables)
+        return results
+
+    @staticmethod
+    def _contiguous_matchings(query, name, syllables):
+        """关键词依次匹配名称中连续若干个字的拼音时，等价汉字关键词（名称的子串）的集合"""
+        results = set()
+        for start in range(len(syllables)):
+            # 关键词已匹配到 query_index 时，当前位于第 i 个音节
+            frontier = {0}
+            for i in range(start, len(syllables)):
+                syllable = syllables[i]
+                following = set()
+                for query_index in frontier:
+                    length = 1
+                    while query_index + length <= len(query) and length <= len(syllable) and \
+                            query[query_index + length - 1] == syllable[length - 1]:
+                        following.add(query_index + length)
+                        length += 1
+                if len(query) in following:
+                    results.add(name[start:i + 1])
+                frontier = following - {len(query)}
+                if not frontier:
+                    break
+        return results
+
+    def equivalent_queries(self, query):
+        """依次返回 (名称位置, 名称, 等价汉字关键词集合)，只包含能够匹配的名称"""
+        query = normalize_pinyin_query(query)
+        if not query:
+            return
+        for position in self.candidates(query):
+            han_queries = self.matchings(query, position)
+            if han_queries:
+                yield position, self.entries[position][0], han_queries
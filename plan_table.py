@@ -0,0 +1,290 @@
+# 资质组合方案表
+# 离线枚举不超过指定数量的连通资质组合（资质之间通过共同职称相连），多进程并行计算合并结果，
+# 存入 SQLite 表（按组合编号索引），/api/match 直接查表返回，更大的组合实时计算。
+# 没有共同职称的资质互不影响（见 split_components），不连通的组合由各连通分量的方案拼接得到，不单独存储。
+# 资质数据变化后只重新计算包含变化资质的组合，合并算法版本变化后全部重新计算。
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from qualification_catalog import DEFAULT_DATA_FILE, QualificationCatalog
+from qualification_matcher import MERGE_ALGORITHM_VERSION, merge_qualifications, split_components
+
+DEFAULT_TABLE_FILE = 'plan_table.sqlite'
+# 默认预计算的最大资质组合数量
+DEFAULT_MAX_SIZE = 4
+# 默认最多存储的组合数量，资质之间共同职称较多时连通组合数量可能很大，超出部分查询时实时计算
+DEFAULT_MAX_COMBINATIONS = 200000
+# 每个计算任务包含的组合数
+_CHUNK_SIZE = 512
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS qualifications (name TEXT PRIMARY KEY, fingerprint TEXT);
+CREATE TABLE IF NOT EXISTS plans (
+    combo_id TEXT PRIMARY KEY,
+    size INTEGER,
+    final_counts TEXT,
+    type_attributes TEXT,
+    total_staff INTEGER
+);
+CREATE TABLE IF NOT EXISTS plan_members (combo_id TEXT, name TEXT);
+CREATE INDEX IF NOT EXISTS plan_members_name ON plan_members (name);
+'''
+
+
+def combination_id(selection):
+    """资质组合编号：规范化（排序）后的名称列表的哈希"""
+    return hashlib.sha1('\n'.join(sorted(selection)).encode('utf-8')).hexdigest()[:16]
+
+
+def qualification_fingerprint(qual):
+    """资质定义的指纹，资质内容变化时指纹随之变化"""
+    return hashlib.sha1(json.dumps(qual, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class PlanTable:
+    """方案表的只读访问（每个线程使用独立的数据库连接）"""
+
+    def __init__(self, path=DEFAULT_TABLE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if not os.path.exists(self.path):
+                return None
+            connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            self._local.connection = connection
+        return connection
+
+    def lookup(self, snapshot, selection):
+        """查询规范化资质组合的合并结果
+
+        方案表与当前资质数据版本、合并算法版本一致，且包含组合的每个连通分量时，
+        按分量顺序拼接各分量的方案，返回 (final_counts, type_attributes, None)，否则返回None，由调用方实时计算。
+        """
+        connection = self._connection()
+        if connection is None or not selection:
+            return None
+        components = [tuple(qual['name'] for qual in component)
+                      for component in split_components(snapshot.lookup(selection))]
+        combo_ids = [combination_id(component) for component in components]
+        try:
+            meta = dict(connection.execute(
+                "SELECT key, value FROM meta WHERE key IN ('catalog_version', 'algorithm_version')"))
+            if meta.get('catalog_version') != snapshot.version or \
+                    meta.get('algorithm_version') != str(MERGE_ALGORITHM_VERSION):
+                self.misses += 1
+                return None
+            placeholders = ', '.join('?' * len(combo_ids))
+            rows = {row[0]: row[1:] for row in connection.execute(
+                f'SELECT combo_id, final_counts, type_attributes FROM plans WHERE combo_id IN ({placeholders})',
+                combo_ids)}
+        except sqlite3.Error:
+            return None
+        if any(rows.get(combo_id, (None,))[0] is None for combo_id in combo_ids):
+            self.misses += 1
+            return None
+
+        # 不同分量的职称互不重叠，按分量顺序拼接（与 merge_qualifications 的结果相同）
+        final_counts = {}
+        type_attributes = {}
+        for combo_id in combo_ids:
+            final_counts.update(json.loads(rows[combo_id][0]))
+            type_attributes.update(json.loads(rows[combo_id][1]))
+        self.hits += 1
+        return final_counts, type_attributes, None
+
+    def stats(self):
+        """方案表命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            'available': os.path.exists(self.path),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+_worker_qualifications = None
+
+
+def _init_worker(qualifications):
+    """计算进程初始化：保存资质数据，避免每个任务重复传输"""
+    global _worker_qualifications
+    _worker_qualifications = {qual['name']: qual for qual in qualifications}
+
+
+def _solve_chunk(selections):
+    """计算一批资质组合，返回待写入的行"""
+    rows = []
+    for selection in selections:
+        qualifications = [_worker_qualifications[name] for name in selection]
+        try:
+            final_counts, type_attributes = merge_qualifications(qualifications)
+        except (ValueError, AssertionError):
+            # 资质要求无法满足（如不含任何职称），记录为空，查询时实时计算
+            rows.append((combination_id(selection), len(selection), None, None, None))
+            continue
+        rows.append((
+            combination_id(selection),
+            len(selection),
+            json.dumps(final_counts, ensure_ascii=False),
+            json.dumps(type_attributes, ensure_ascii=False),
+            sum(final_counts.values())
+        ))
+    return rows
+
+
+def connected_combinations(snapshot, names, max_size):
+    """按组合大小从小到大逐个生成连通的资质组合（名称按 names 的顺序排列）
+
+    资质之间有共同职称时相连。每个组合以其中编号最小的资质为起点、只向编号更大的相邻资质扩展
+    （ESU 算法），每个连通组合恰好生成一次，不需要枚举全部组合。
+    """
+    index = {name: i for i, name in enumerate(names)}
+    type_members = {}
+    for name in names:
+        for type_name in set(snapshot.get(name)['types']):
+            type_members.setdefault(type_name, []).append(index[name])
+    adjacency = [set() for _ in names]
+    for members in type_members.values():
+        for member in members:
+            adjacency[member].update(members)
+    for member, neighbors in enumerate(adjacency):
+        neighbors.discard(member)
+
+    def extend(root, size, subset, extension, closed):
+        if len(subset) == size:
+            yield tuple(names[member] for member in sorted(subset))
+            return
+        extension = list(extension)
+        while extension:
+            member = extension.pop()
+            # 只加入与当前组合不相邻的新邻居，避免同一组合从不同路径重复生成
+            added = [neighbor for neighbor in adjacency[member] if neighbor > root and neighbor not in closed]
+            yield from extend(root, size, subset + [member], extension + added,
+                              closed | adjacency[member] | {member})
+
+    for size in range(1, max_size + 1):
+        for root in range(len(names)):
+            yield from extend(root, size, [root], [neighbor for neighbor in adjacency[root] if neighbor > root],
+                              adjacency[root] | {root})
+
+
+def _chunks(selections, size):
+    """将组合流按固定大小分批"""
+    chunk = []
+    for selection in selections:
+        chunk.append(selection)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_plan_table(max_size=DEFAULT_MAX_SIZE, path=DEFAULT_TABLE_FILE, data_path=DEFAULT_DATA_FILE, workers=None,
+                     max_combinations=DEFAULT_MAX_COMBINATIONS):
+    """增量构建方案表：只计算表中缺少的连通组合
+
+    资质定义变化或被删除时，先删除包含该资质的组合；合并算法版本变化时删除全部组合，再补算缺少的组合。
+    组合按大小从小到大流式生成并分批计算，最多存储 max_combinations 个组合。
+    """
+    start_time = time.perf_counter()
+    snapshot = QualificationCatalog(data_path).snapshot()
+    names = sorted(snapshot.by_name)
+    fingerprints = {name: qualification_fingerprint(snapshot.get(name)) for name in names}
+
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(_SCHEMA)
+
+        # 步骤1：合并算法版本变化时删除全部组合；找出定义变化或已删除的资质，删除包含这些资质的组合
+        row = connection.execute("SELECT value FROM meta WHERE key = 'algorithm_version'").fetchone()
+        if row is None or row[0] != str(MERGE_ALGORITHM_VERSION):
+            connection.execute('DELETE FROM plans')
+        stale = [name for name, fingerprint in connection.execute('SELECT name, fingerprint FROM qualifications')
+                 if fingerprints.get(name) != fingerprint]
+        for name in stale:
+            connection.execute(
+                'DELETE FROM plans WHERE combo_id IN (SELECT combo_id FROM plan_members WHERE name = ?)', (name,))
+        connection.execute('DELETE FROM qualifications')
+        connection.executemany('INSERT INTO qualifications (name, fingerprint) VALUES (?, ?)', fingerprints.items())
+
+        # 步骤2：删除超出最大组合数量的组合，并清理已删除组合的成员记录
+        connection.execute('DELETE FROM plans WHERE size > ?', (max_size,))
+        connection.execute('DELETE FROM plan_members WHERE combo_id NOT IN (SELECT combo_id FROM plans)')
+
+        # 步骤3：流式枚举连通组合（最多 max_combinations 个），跳过表中已有的组合
+        existing = {row[0] for row in connection.execute('SELECT combo_id FROM plans')}
+        enumerated = 0
+
+        def missing_combinations():
+            nonlocal enumerated
+            for selection in connected_combinations(snapshot, names, max_size):
+                if enumerated >= max_combinations:
+                    return
+                enumerated += 1
+                if combination_id(selection) not in existing:
+                    yield selection
+
+        # 步骤4：多进程并行计算缺少的组合，同时提交的任务数有上限，组合不会全部驻留内存
+        computed = 0
+        chunks = _chunks(missing_combinations(), _CHUNK_SIZE)
+        first = next(chunks, None)
+        if first is not None:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(list(snapshot.qualifications),)) as executor:
+                pending = deque()
+                limit = 2 * (workers or os.cpu_count() or 1)
+                chunks = itertools.chain([first], chunks)
+                while True:
+                    for selections in chunks:
+                        pending.append((selections, executor.submit(_solve_chunk, selections)))
+                        if len(pending) >= limit:
+                            break
+                    if not pending:
+                        break
+                    selections, future = pending.popleft()
+                    connection.executemany('INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?)', future.result())
+                    connection.executemany(
+                        'INSERT INTO plan_members (combo_id, name) VALUES (?, ?)',
+                        [(combination_id(selection), name) for selection in selections for name in selection])
+                    computed += len(selections)
+
+        # 步骤5：记录方案表对应的资质数据版本与合并算法版本
+        connection.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+            ('catalog_version', snapshot.version),
+            ('algorithm_version', str(MERGE_ALGORITHM_VERSION)),
+            ('max_size', str(max_size)),
+        ])
+        connection.commit()
+        total = connection.execute('SELECT COUNT(*) FROM plans').fetchone()[0]
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - start_time
+    truncated = '（已达到组合数量上限）' if enumerated >= max_combinations else ''
+    print(f"方案表构建完成：变化资质 {len(stale)} 个，新计算组合 {computed} 个，"
+          f"共 {total} 个组合{truncated}，耗时 {elapsed:.2f} 秒")
+    return computed
+
+
+if __name__ == "__main__":
+    # 可通过命令行参数指定最大组合数量
+    max_size = DEFAULT_MAX_SIZE
+    if len(sys.argv) > 1:
+        max_size = int(sys.argv[1])
+    build_plan_table(max_size)
@@ -0,0 +1,93 @@
+# 短关键词搜索结果表
+# 输入联想的前一两个字匹配的名称最多、搜索最慢。资质目录加载后，对名称中出现过的每个单字和双字
+# 预先计算完整的排序结果（含得分），这些关键词的搜索直接查表。
+# 结果表随资质目录快照一起替换，资质数据变化后重新构建。
+import sys
+import threading
+import time
+
+from fuzzy_search import fuzzy_search
+
+# 预计算的最大关键词长度
+MAX_QUERY_LENGTH = 2
+# 结果表对应的 Levenshtein 相似度阈值（与 fuzzy_search 的默认值一致）
+DEFAULT_THRESHOLD = 0.3
+
+
+class PrefixResultTable:
+    """资质目录快照中单字、双字关键词的完整搜索结果"""
+
+    def __init__(self, snapshot, threshold=DEFAULT_THRESHOLD):
+        self.snapshot = snapshot
+        self.threshold = threshold
+        # 关键词 -> ((名称, 得分), ...)，按得分降序、同分按目录顺序
+        self.entries = {}
+        self.ready = False
+        self.build_seconds = None
+        self.memory_bytes = None
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def build(self):
+        """计算所有单字、双字关键词的结果（重复调用时只构建一次）"""
+        with self._lock:
+            if self.ready:
+                return
+            start_time = time.perf_counter()
+            search_index = self.snapshot.search_index
+            queries = list(search_index.unigrams)
+            if MAX_QUERY_LENGTH >= 2:
+                queries.extend(search_index.bigrams)
+            entries = {}
+            for query in queries:
+                entries[query] = tuple(fuzzy_search(query, self.snapshot, self.threshold, with_scores=True))
+            self.entries = entries
+            self.build_seconds = time.perf_counter() - start_time
+            self.memory_bytes = self._measure_memory()
+            self.ready = True
+
+    def build_in_background(self):
+        """在后台线程中构建，构建完成前的查询照常实时搜索"""
+        thread = threading.Thread(target=self.build, name='prefix-results', daemon=True)
+        thread.start()
+        return thread
+
+    def _measure_memory(self):
+        """结果表占用的内存（字节，名称字符串与资质目录共享，不计入）"""
+        total = sys.getsizeof(self.entries)
+        for query, results in self.entries.items():
+            total += sys.getsizeof(query) + sys.getsizeof(results)
+            for result in results:
+                total += sys.getsizeof(result) + sys.getsizeof(result[1])
+        return total
+
+    def lookup(self, query, threshold=DEFAULT_THRESHOLD, limit=None, min_score=None):
+        """查表获取搜索结果 [(名称, 得分), ...]，结果表未构建或不包含该关键词时返回None"""
+        if not self.ready or threshold != self.threshold:
+            return None
+        results = self.entries.get(query)
+        if results is None:
+            return None
+        self.hits += 1
+        if min_score is not None:
+            # 结果按得分降序排列，截取不低于 min_score 的部分
+            count = 0
+            for _, score in results:
+                if score < min_score:
+                    break
+                count += 1
+            results = results[:count]
+        if limit is not None:
+            results = results[:limit]
+        return list(results)
+
+    def stats(self):
+        """构建耗时与内存占用统计"""
+        return {
+            'ready': self.ready,
+            'entries': len(self.entries),
+            'results': sum(len(results) for results in self.entries.values()),
+            'build_seconds': self.build_seconds,
+            'memory_bytes': self.memory_bytes,
+            'hits': self.hits
+        }
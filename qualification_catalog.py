@@ -0,0 +1,137 @@
+# 资质目录：进程内共享的资质数据快照
+# 数据文件只在 mtime 或大小变化时重新解析，解析结果以不可变快照的形式整体替换，
+# 供 Flask 多线程请求并发读取。
+import hashlib
+import json
+import os
+import threading
+
+from compiled_catalog import CompiledCatalog
+from pinyin_index import PinyinIndex, without_pinyin
+from prefix_results import PrefixResultTable
+from search_index import SearchIndex
+from vector_search import build_vector_scorer
+
+DEFAULT_DATA_FILE = 'qualification_data.json'
+
+
+class CatalogSnapshot:
+    """某一时刻的资质数据快照（只读，请勿修改其中的资质字典）"""
+
+    def __init__(self, qualifications, version, file_key):
+        # 资质列表，保持 JSON 文件中的原始顺序
+        self.qualifications = tuple(qualifications)
+        # 数据内容的哈希，文件内容变化后版本号随之变化
+        self.version = version
+        # (mtime_ns, size)，用于判断文件是否被修改
+        self.file_key = file_key
+
+        # 对外返回的资质记录（去掉拼音字段），与 qualifications 一一对应
+        self.public_qualifications = tuple(without_pinyin(qual) for qual in self.qualifications)
+        self._public_by_name = {}
+        for qual in self.public_qualifications:
+            self._public_by_name.setdefault(qual['name'], qual)
+
+        # 索引：资质名称 -> 资质（重名时保留第一个，与线性查找结果一致）
+        self.by_name = {}
+        # 索引：职称类型 -> 包含该职称的资质列表
+        self.by_type = {}
+        # 按是否要求职称齐全划分资质
+        self.all_types_qualifications = []
+        self.partial_types_qualifications = []
+        for qual in self.qualifications:
+            self.by_name.setdefault(qual['name'], qual)
+            for type_name in qual['types']:
+                self.by_type.setdefault(type_name, []).append(qual)
+            if qual['require_all_types']:
+                self.all_types_qualifications.append(qual)
+            else:
+                self.partial_types_qualifications.append(qual)
+
+        # 编译形式：职称整数编号、资质职称数组与位掩码
+        self.compiled = CompiledCatalog(self.qualifications)
+        # 名称搜索索引
+        self.search_index = SearchIndex(qual['name'] for qual in self.qualifications)
+        # 资质较多且已安装 NumPy 时使用向量化打分
+        self.vector_scorer = build_vector_scorer(self.search_index.names)
+        # 名称拼音索引（使用资质数据中离线生成的拼音字段）
+        self.pinyin_index = PinyinIndex(self.qualifications)
+        # 单字、双字关键词的预计算搜索结果（由资质目录在加载后构建）
+        self.prefix_results = PrefixResultTable(self)
+
+    def get(self, name):
+        """根据名称获取资质信息，不存在时返回None"""
+        return self.by_name.get(name)
+
+    def lookup(self, names):
+        """按输入顺序批量获取资质信息，忽略不存在的名称"""
+        by_name = self.by_name
+        return [by_name[name] for name in names if name in by_name]
+
+    def public_lookup(self, names):
+        """与 lookup 相同，返回对外的资质记录（不含拼音字段）"""
+        public_by_name = self._public_by_name
+        return [public_by_name[name] for name in names if name in public_by_name]
+
+    def qualifications_with_type(self, type_name):
+        """获取包含指定职称类型的所有资质"""
+        return self.by_type.get(type_name, [])
+
+    def __iter__(self):
+        return iter(self.qualifications)
+
+    def __len__(self):
+        return len(self.qualifications)
+
+    def __getitem__(self, index):
+        return self.qualifications[index]
+
+
+class QualificationCatalog:
+    """进程级资质目录，按文件 mtime/size 热加载"""
+
+    def __init__(self, path=DEFAULT_DATA_FILE):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """返回当前快照，文件发生变化时重新加载"""
+        st = os.stat(self.path)
+        file_key = (st.st_mtime_ns, st.st_size)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.file_key == file_key:
+            return snapshot
+
+        # 同一时刻只允许一个线程解析文件，其余线程等待后直接复用新快照
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.file_key != file_key:
+                snapshot = self._load()
+                self._snapshot = snapshot
+                snapshot.prefix_results.build_in_background()
+        return snapshot
+
+    def _load(self):
+        """读取并解析数据文件，生成新快照"""
+        with open(self.path, 'rb') as f:
+            # 以打开后的文件状态为准，避免 stat 与读取之间文件被替换
+            st = os.fstat(f.fileno())
+            raw = f.read()
+        qualifications = json.loads(raw.decode('utf-8'))
+        version = hashlib.sha1(raw).hexdigest()[:12]
+        return CatalogSnapshot(qualifications, version, (st.st_mtime_ns, st.st_size))
+
+
+_default_catalog = None
+_default_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """获取进程内共享的默认资质目录"""
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_catalog_lock:
+            if _default_catalog is None:
+                _default_catalog = QualificationCatalog()
+    return _default_catalog
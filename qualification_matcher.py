@@ -1,6 +1,10 @@
 # 导入模块
+import heapq
 import json
-from fuzzy_search import load_qualification_data, fuzzy_search
+from compiled_catalog import CompiledCatalog
+from exact_solver import DEFAULT_TIME_LIMIT, solve_exact
+from qualification_catalog import CatalogSnapshot, get_catalog
+from term_resolver import resolve_terms
 
 def calculate_single_qualification(qualification):
     """计算单个资质所需的职称数量"""
@@ -26,279 +30,549 @@ def calculate_single_qualification(qualification):
     
     return 职称_counts
 
-def merge_qualifications(qualifications):
-    """合并多个资质的职称要求，计算最终所需职称数量"""
-    # 步骤1：初始化职称计数字典
+# 可选的合并计算引擎
+MERGE_ENGINES = ('greedy', 'exact')
+# 贪心合并算法的版本：合并结果发生变化时递增，离线方案表（plan_table.py）据此全部重新计算
+MERGE_ALGORITHM_VERSION = 1
+
+class _Allocation:
+    """职称人数分配状态：人数数组，以及职称首次加入结果的顺序"""
+    __slots__ = ('counts', 'order', 'listed')
+
+    def __init__(self, counts, order):
+        self.counts = counts
+        self.order = order
+        self.listed = bytearray(len(counts))
+        for type_id in order:
+            self.listed[type_id] = 1
+
+    def add(self, type_id, amount=1):
+        """为职称增加人数，首次出现的职称记录到结果顺序中"""
+        if not self.listed[type_id]:
+            self.listed[type_id] = 1
+            self.order.append(type_id)
+        self.counts[type_id] += amount
+
+    def copy(self):
+        return _Allocation(self.counts[:], self.order[:])
+
+class _AllocationHeap:
+    """逐人分配用的职称堆：按 (优先级, 当前人数, 在资质中的位置) 取堆顶，每分配1人 O(log k)"""
+
+    def __init__(self, counts, qual_types, priorities):
+        self.counts = counts
+        self.priorities = priorities
+        self.heap = [(priorities[i], counts[type_id], i, type_id) for i, type_id in enumerate(qual_types)]
+        heapq.heapify(self.heap)
+
+    def pop(self):
+        """取出优先级最高的职称，分配后需调用 push 放回"""
+        while True:
+            entry = heapq.heappop(self.heap)
+            priority, count, position, type_id = entry
+            if count == self.counts[type_id]:
+                self._position = position
+                return type_id
+            # 人数已变化（同一职称在资质中重复出现），按当前人数重新入堆
+            heapq.heappush(self.heap, (priority, self.counts[type_id], position, type_id))
+
+    def push(self, type_id):
+        """按职称当前人数放回堆中"""
+        position = self._position
+        heapq.heappush(self.heap, (self.priorities[position], self.counts[type_id], position, type_id))
+
+def _top_priority_types(qual_types, priorities):
+    """取优先级最高（值最小）的一组职称，去重并保持在资质中的顺序"""
+    best = min(priorities)
+    group = []
+    for type_id, priority in zip(qual_types, priorities):
+        if priority == best and type_id not in group:
+            group.append(type_id)
+    return group
+
+def _water_fill(counts, types, amount):
+    """按水位填充将 amount 人一次性分配到 types 上
+    
+    结果与逐人分配给当前人数最少的职称（人数相同时取靠前的职称）完全相同，
+    返回 [(职称编号, 增加人数)]。
+    """
+    if amount <= 0 or not types:
+        return []
+    levels = sorted(counts[type_id] for type_id in types)
+    
+    # 找出最高水位：人数低于水位的职称都补到水位，所需人数不超过 amount
+    level = levels[0]
+    used = 0
+    below = 0  # 人数不高于当前水位的职称数
+    while True:
+        while below < len(levels) and levels[below] <= level:
+            below += 1
+        if below == len(levels) or used + (levels[below] - level) * below > amount:
+            raise_by = (amount - used) // below
+            level += raise_by
+            used += raise_by * below
+            break
+        used += (levels[below] - level) * below
+        level = levels[below]
+    
+    # 剩余不足一层的人数，按顺序分给处于水位上的职称各1人
+    remainder = amount - used
+    result = []
+    for type_id in types:
+        count = counts[type_id]
+        increase = level - count if count < level else 0
+        if count <= level and remainder > 0:
+            increase += 1
+            remainder -= 1
+        if increase:
+            result.append((type_id, increase))
+    return result
+
+def split_components(qualifications):
+    """按 资质-职称 二部图的连通分量拆分资质
+    
+    没有共同职称（直接或间接）的资质互不影响，可以分别计算。
+    返回资质列表的列表，分量按其第一个资质在输入中的位置排序，分量内保持输入顺序。
+    """
+    parent = list(range(len(qualifications)))
+    
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+    
+    # 同一职称第一次出现的资质，作为该职称所在分量的代表
+    type_owner = {}
+    for index, qual in enumerate(qualifications):
+        for type_name in qual['types']:
+            owner = type_owner.setdefault(type_name, index)
+            root_a, root_b = find(owner), find(index)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+    
+    components = {}
+    for index, qual in enumerate(qualifications):
+        components.setdefault(find(index), []).append(qual)
+    return list(components.values())
+
+def _map_components(func, components, executor, *args):
+    """对每个连通分量执行计算，提供 executor 时提交到工作池并发执行"""
+    if executor is None or len(components) == 1:
+        return [func(component, *args) for component in components]
+    futures = [executor.submit(func, component, *args) for component in components]
+    return [future.result() for future in futures]
+
+def merge_qualifications(qualifications, executor=None, existing=None):
+    """合并多个资质的职称要求，计算最终所需职称数量
+    
+    所选资质按连通分量拆分后分别计算；提供 executor（如 ProcessPoolExecutor）时各分量并发计算。
+    existing 为已有人员（职称名称 -> 人数）时作为各职称人数的下界，只计算需要新增的人员，
+    返回的是包含已有人员在内的总人数（新增人数见 hiring_delta）。
+    """
+    components = split_components(qualifications)
+    if len(components) == 1:
+        return _merge_component(qualifications, existing)
+    
+    # 合并各分量的结果（不同分量的职称互不重叠）
     final_counts = {}
+    type_attributes = {}
+    for component_counts, component_attributes in _map_components(_merge_component, components, executor, existing):
+        final_counts.update(component_counts)
+        type_attributes.update(component_attributes)
     
-    # 步骤2：初始化资质满足状态字典，标记是否已满足要求
-    satisfied = {}
-    for qual in qualifications:
-        satisfied[qual['name']] = False
-    
-    # 步骤3：统计每个职称在所有资质中出现的次数（共享次数）
-    def count_shared_types():
-        """统计每个职称在未满足的资质中出现的次数"""
-        shared_counts = {}
-        for qual in qualifications:
-            if not satisfied[qual['name']]:  # 只考虑未满足的资质
-                for type_name in qual['types']:
-                    shared_counts[type_name] = shared_counts.get(type_name, 0) + 1
-        return shared_counts
+    return final_counts, type_attributes
+
+def _merge_component(qualifications, existing=None):
+    """计算一个连通分量内资质的职称数量"""
+    # 编译所选资质：职称名称转为整数编号，计算过程只使用整数数组
+    compiled = CompiledCatalog(qualifications)
+    allocation = _merge_compiled(compiled, _encode_existing(compiled, existing))
+    
+    # 在接口边界处转回职称名称
+    final_counts = compiled.decode_counts(allocation.counts, allocation.order)
+    type_attributes = _build_type_attributes(compiled, allocation)
+    
+    return final_counts, type_attributes
+
+def merge_qualifications_exact(qualifications, time_limit=DEFAULT_TIME_LIMIT, executor=None, existing=None):
+    """使用分支定界精确求解最少总人数，以贪心结果作为初始解
+    
+    返回 (final_counts, type_attributes, proven_optimal)，超出时间预算时
+    proven_optimal 为 False，结果为搜索到的最好解（不劣于贪心结果）。
+    时间预算按连通分量分别计算。existing 与 merge_qualifications 相同，此时求解最少新增人数。
+    """
+    final_counts = {}
+    type_attributes = {}
+    proven_optimal = True
+    components = split_components(qualifications)
+    for component_counts, component_attributes, component_proven in _map_components(
+            _merge_component_exact, components, executor, time_limit, existing):
+        final_counts.update(component_counts)
+        type_attributes.update(component_attributes)
+        proven_optimal = proven_optimal and component_proven
+    
+    return final_counts, type_attributes, proven_optimal
+
+def _merge_component_exact(qualifications, time_limit, existing=None):
+    """精确求解一个连通分量内资质的职称数量"""
+    compiled = CompiledCatalog(qualifications)
+    minimum = _encode_existing(compiled, existing)
+    greedy = _merge_compiled(compiled, minimum)
+    counts, proven_optimal = solve_exact(compiled, greedy.counts, time_limit, minimum)
+    
+    # 职称顺序：沿用贪心结果中的顺序，新出现的职称按编号追加在后面
+    order = [type_id for type_id in greedy.order if counts[type_id] > 0]
+    order += [type_id for type_id in range(compiled.type_count)
+              if counts[type_id] > 0 and not greedy.listed[type_id]]
+    allocation = _Allocation(counts, order)
+    
+    final_counts = compiled.decode_counts(allocation.counts, allocation.order)
+    type_attributes = _build_type_attributes(compiled, allocation)
+    
+    return final_counts, type_attributes, proven_optimal
+
+def _encode_existing(compiled, existing):
+    """已有人员转为人数数组（只保留所选资质中的职称），没有已有人员时返回None"""
+    if not existing:
+        return None
+    minimum = compiled.encode_counts(existing)
+    return minimum if any(count > 0 for count in minimum) else None
+
+def hiring_delta(final_counts, existing):
+    """相对已有人员需要新增的人数（职称名称 -> 人数），只包含需要新增的职称"""
+    existing = existing or {}
+    delta = {}
+    for type_name, count in final_counts.items():
+        extra = count - existing.get(type_name, 0)
+        if extra > 0:
+            delta[type_name] = extra
+    return delta
+
+def _merge_compiled(compiled, minimum=None):
+    """在编译形式上执行合并计算，返回职称人数分配
+    
+    计算过程中维护每个资质的当前总人数、缺少的职称数和未满足资质中的职称共享次数，
+    职称增加人数时只通过 职称->资质 邻接表更新包含该职称的资质。
+    minimum 为已有人员的人数数组时以其作为初始状态和人数下界：已有人员满足的资质直接标记为已满足，
+    只为其余资质分配新增人员。
+    """
+    type_lists = compiled.type_lists
+    type_quals = compiled.type_quals
+    type_occurrences = compiled.type_occurrences
+    total_counts = compiled.total_counts
+    require_all = compiled.require_all
+    qual_count = len(type_lists)
+    
+    # 步骤1：初始化职称人数数组（有已有人员时从已有人数开始）
+    if minimum is None:
+        allocation = _Allocation(compiled.new_counts(), [])
+    else:
+        allocation = _Allocation(list(minimum), [type_id for type_id, count in enumerate(minimum) if count > 0])
+    counts = allocation.counts
+    
+    # 步骤2：初始化资质状态：是否已满足、当前总人数、缺少的职称类型数（仅齐全要求的资质）
+    satisfied = [False] * qual_count
+    totals = [compiled.qualification_total(index, counts) for index in range(qual_count)]
+    missing = [len({type_id for type_id in type_lists[index] if counts[type_id] == 0}) if require_all[index] else 0
+               for index in range(qual_count)]
+    remaining = qual_count
+    
+    # 步骤3：每个职称在未满足的资质中出现的次数（共享次数），资质满足后随之减少
+    shared_counts = [len(occurrences) for occurrences in type_occurrences]
+    
+    def mark_satisfied(index):
+        """标记资质已满足，并从共享次数中移除该资质"""
+        nonlocal remaining
+        satisfied[index] = True
+        remaining -= 1
+        for type_id in type_lists[index]:
+            shared_counts[type_id] -= 1
+    
+    def add_person(type_id, amount=1):
+        """为职称增加人数，只更新包含该职称的资质"""
+        if counts[type_id] == 0:
+            for index in type_quals[type_id]:
+                if require_all[index]:
+                    missing[index] -= 1
+        allocation.add(type_id, amount)
+        for index in type_occurrences[type_id]:
+            totals[index] += amount
+        # 检查并标记已满足的资质，未满足的资质按新的缺口重新入队
+        for index in type_quals[type_id]:
+            if satisfied[index]:
+                continue
+            needed = total_counts[index] - totals[index]
+            if missing[index] == 0 and needed <= 0:
+                mark_satisfied(index)
+            elif needed > 0:
+                heapq.heappush(candidates, (needed, index))
+    
+    # 待处理资质的优先队列：(缺口, 资质编号)，缺口变化后重新入队，过期条目在出队时跳过
+    candidates = []
     
     # 步骤4：对有职称齐全要求的资质，为其每个职称设置至少1人
-    for qual in qualifications:
-        if qual['require_all_types']:
-            for type_name in qual['types']:
-                if type_name not in final_counts:
-                    final_counts[type_name] = 1
-    
-    # 步骤5：检查并标记已满足的资质
-    def check_satisfied():
-        """检查资质是否已满足要求"""
-        for qual in qualifications:
-            if satisfied[qual['name']]:
-                continue  # 已满足的跳过
-                
-            # 检查是否满足要求
-            if qual['require_all_types']:
-                # 检查每个职称至少1人
-                all_types_ok = all(final_counts.get(type_name, 0) >= 1 for type_name in qual['types'])
-                # 检查总人数满足要求
-                current_total = sum(final_counts.get(type_name, 0) for type_name in qual['types'])
-                total_ok = current_total >= qual['total_count']
-                if all_types_ok and total_ok:
-                    satisfied[qual['name']] = True
-            else:
-                # 只检查总人数
-                current_total = sum(final_counts.get(type_name, 0) for type_name in qual['types'])
-                if current_total >= qual['total_count']:
-                    satisfied[qual['name']] = True
-    
-    # 初始检查满足情况
-    check_satisfied()
+    for index in range(qual_count):
+        if require_all[index]:
+            for type_id in type_lists[index]:
+                if counts[type_id] == 0:
+                    add_person(type_id)
+    
+    # 步骤5：初始检查满足情况（如不含任何职称的资质），未满足的资质加入队列
+    for index in range(qual_count):
+        if satisfied[index]:
+            continue
+        needed = total_counts[index] - totals[index]
+        if missing[index] == 0 and needed <= 0:
+            mark_satisfied(index)
+        elif needed > 0:
+            heapq.heappush(candidates, (needed, index))
+    
+    # 资质的职称列表中是否有重复职称（此时每分配1人资质总数会增加不止1人）
+    repeated = [len(set(qual_types)) != len(qual_types) for qual_types in type_lists]
     
     # 步骤6：循环处理，直到所有资质都满足要求
-    while not all(satisfied.values()):
-        # 步骤6.1：统计当前未满足资质的职称共享次数
-        shared_counts = count_shared_types()
-        
-        # 步骤6.2：选择下一个要处理的资质
-        # 选择标准：当前缺口最小的资质优先
-        candidates = []
-        for qual in qualifications:
-            if not satisfied[qual['name']]:
-                current_total = sum(final_counts.get(type_name, 0) for type_name in qual['types'])
-                needed = qual['total_count'] - current_total
-                if needed > 0:  # 只处理还需要增加人数的资质
-                    candidates.append((needed, qual))
+    while remaining > 0:
+        # 步骤6.1：选择下一个要处理的资质
+        # 选择标准：当前缺口最小的资质优先（缺口相同时取靠前的资质）
+        selected = None
+        while candidates:
+            needed, index = heapq.heappop(candidates)
+            if not satisfied[index] and needed == total_counts[index] - totals[index]:
+                selected = index
+                break
         
-        if not candidates:
+        if selected is None:
             break  # 没有需要处理的资质了
         
-        # 按缺口从小到大排序，优先处理缺口小的资质
-        candidates.sort(key=lambda x: x[0])
-        selected_qual = candidates[0][1]
+        # 步骤6.2：以本轮开始时各职称的共享次数作为本轮分配的优先级
+        qual_types = type_lists[selected]
+        priorities = [-shared_counts[type_id] for type_id in qual_types]
         
-        # 步骤6.3：计算还需要多少人
-        current_total = sum(final_counts.get(type_name, 0) for type_name in selected_qual['types'])
-        needed = selected_qual['total_count'] - current_total
-        
-        # 步骤6.4：分配所需人数，优先分配到共享次数最多的职称
-        while needed > 0:
-            # 对当前资质的职称按共享次数排序，共享次数多的优先
-            qual_types = selected_qual['types']
-            sorted_types = sorted(
-                qual_types,
-                key=lambda x: (-shared_counts.get(x, 0), final_counts.get(x, 0))
-            )
-            
-            # 分配1人到优先级最高的职称
-            top_type = sorted_types[0]
-            final_counts[top_type] = final_counts.get(top_type, 0) + 1
-            needed -= 1
-            
-            # 重新检查是否满足要求
-            check_satisfied()
-            
-            # 如果已经满足，就不需要再分配了
-            if satisfied[selected_qual['name']]:
-                break
-    
-    # 步骤7：优化结果，移除不必要的分配
-    # 统计每个职称的使用情况
-    def optimize_counts(counts, quals):
-        optimized = counts.copy()
-        # 按当前数量从多到少排序职称
-        sorted_types = sorted(optimized.keys(), key=lambda x: -optimized[x])
-        
-        for type_name in sorted_types:
-            if optimized[type_name] <= 1:
-                continue  # 至少保留1人
-            
-            # 尝试减少1人，检查是否仍满足所有资质要求
-            optimized[type_name] -= 1
-            
-            # 检查所有资质是否仍满足要求
-            all_satisfied = True
-            for qual in quals:
-                current_total = sum(optimized.get(t, 0) for t in qual['types'])
-                if qual['require_all_types']:
-                    all_types_ok = all(optimized.get(t, 0) >= 1 for t in qual['types'])
-                    if not (all_types_ok and current_total >= qual['total_count']):
-                        all_satisfied = False
-                        break
-                else:
-                    if current_total < qual['total_count']:
-                        all_satisfied = False
-                        break
-            
-            if not all_satisfied:
-                # 恢复减少的人数
-                optimized[type_name] += 1
-        
-        return optimized
+        # 步骤6.3：分配所需人数，共享次数多的优先，共享次数相同时当前人数少的优先
+        if not repeated[selected]:
+            # 本轮只有共享次数最多的一组职称会被分配，按水位填充一次分配完缺口
+            for type_id, amount in _water_fill(counts, _top_priority_types(qual_types, priorities), needed):
+                add_person(type_id, amount)
+        else:
+            # 有重复职称时逐人分配，直到该资质满足
+            heap = _AllocationHeap(counts, qual_types, priorities)
+            while needed > 0 and not satisfied[selected]:
+                type_id = heap.pop()
+                add_person(type_id)
+                heap.push(type_id)
+                needed -= 1
     
-    # 优化结果
-    final_counts = optimize_counts(final_counts, qualifications)
+    # 步骤7：优化结果，移除不必要的分配（已有人员不会被移除）
+    allocation = _optimize_counts(compiled, allocation, minimum)
     
     # 步骤8：验证并调整结果
-    final_counts = validate_and_adjust(final_counts, qualifications)
+    allocation = _validate_and_adjust(compiled, allocation)
     
-    # 再次优化，确保总人数最少
-    final_counts = optimize_counts(final_counts, qualifications)
+    return allocation
+
+def _optimize_counts(compiled, allocation, minimum=None):
+    """按资质余量削减多余人数，一次遍历即达到不动点
+    
+    资质余量 = 当前总人数 - 要求总人数。职称最多可以减少其所在各资质余量中的最小值
+    （每个职称至少保留1人，且不少于 minimum 中的已有人数），减少后同步更新这些资质的余量。
+    余量只会减少，因此已处理过的职称不会再有可减少的人数。
+    """
+    optimized = allocation.copy()
+    counts = optimized.counts
+    type_quals = compiled.type_quals
+    type_occurrences = compiled.type_occurrences
+    slack = [compiled.qualification_total(index, counts) - compiled.total_counts[index]
+             for index in range(len(compiled.type_lists))]
+    
+    # 按当前数量从多到少处理职称
+    for type_id in sorted(optimized.order, key=lambda x: -counts[x]):
+        reducible = counts[type_id] - 1  # 至少保留1人
+        if minimum is not None and minimum[type_id] > 1:
+            reducible = counts[type_id] - minimum[type_id]
+        if reducible <= 0:
+            continue
+        
+        occurrences = type_occurrences[type_id]
+        if len(occurrences) == len(type_quals[type_id]):
+            for index in occurrences:
+                if slack[index] < reducible:
+                    reducible = slack[index]
+        else:
+            # 职称在资质中重复出现时，每减少1人该资质总数减少多人
+            for index in type_quals[type_id]:
+                reducible = min(reducible, slack[index] // occurrences.count(index))
+        
+        if reducible > 0:
+            counts[type_id] -= reducible
+            for index in occurrences:
+                slack[index] -= reducible
     
-    # 步骤9：创建职称属性字典
+    return optimized
+
+def _build_type_attributes(compiled, allocation):
+    """创建职称属性字典"""
     type_attributes = {}
-    # 重新统计所有职称的共享情况
-    all_shared_counts = {}
-    for qual in qualifications:
-        for type_name in qual['types']:
-            all_shared_counts[type_name] = all_shared_counts.get(type_name, 0) + 1
-    
+    # 所有资质中的共享次数
+    type_quals = compiled.type_quals
     # 找出所有有齐全要求的职称类型
-    all_required_types = set()
-    for qual in qualifications:
-        if qual['require_all_types']:
-            for type_name in qual['types']:
-                all_required_types.add(type_name)
+    all_required_mask = 0
+    for index, mask in enumerate(compiled.masks):
+        if compiled.require_all[index]:
+            all_required_mask |= mask
     
-    for type_name in final_counts:
+    for type_id in allocation.order:
         # 检查是否来自有齐全要求的资质
-        is_from_all_types = type_name in all_required_types
+        is_from_all_types = bool(all_required_mask >> type_id & 1)
         # 检查是否是共享的（出现次数大于1）
-        is_shared = all_shared_counts.get(type_name, 0) > 1
+        is_shared = len(type_quals[type_id]) > 1
         # 确定背景颜色：淡红色（有齐全要求或共享）或淡绿色（仅无齐全要求且不共享）
         is_red = is_from_all_types or is_shared
-        type_attributes[type_name] = {
-            'count': final_counts[type_name],
+        type_attributes[compiled.type_names[type_id]] = {
+            'count': allocation.counts[type_id],
             'is_red': is_red
         }
     
-    return final_counts, type_attributes
+    return type_attributes
 
 def validate_and_adjust(counts, qualifications):
     """验证并调整职称数量，确保所有资质要求都被满足"""
-    adjusted_counts = counts.copy()
+    compiled = CompiledCatalog(qualifications)
+    order = [compiled.intern(type_name) for type_name in counts]
+    allocation = _validate_and_adjust(compiled, _Allocation(compiled.encode_counts(counts), order))
+    return compiled.decode_counts(allocation.counts, allocation.order)
+
+def _validate_and_adjust(compiled, allocation):
+    """在编译形式上验证并调整职称数量"""
+    adjusted = allocation.copy()
+    counts = adjusted.counts
+    type_lists = compiled.type_lists
+    total_counts = compiled.total_counts
     
-    # 统计职称类型出现次数（共享次数）
-    type_counts = {}
-    for qual in qualifications:
-        for type_name in qual['types']:
-            type_counts[type_name] = type_counts.get(type_name, 0) + 1
+    # 职称共享次数
+    type_counts = [len(quals) for quals in compiled.type_quals]
     
     # 分离有齐全要求和没有齐全要求的资质
     all_types_qualifications = []
     partial_types_qualifications = []
-    
-    for qual in qualifications:
-        if qual['require_all_types']:
-            all_types_qualifications.append(qual)
+    for index in range(len(type_lists)):
+        if compiled.require_all[index]:
+            all_types_qualifications.append(index)
         else:
-            partial_types_qualifications.append(qual)
+            partial_types_qualifications.append(index)
     
     # 按单个要求人数从小到大排序有齐全要求的资质
-    all_types_qualifications.sort(key=lambda x: x['total_count'])
+    all_types_qualifications.sort(key=lambda x: total_counts[x])
+    
+    def fill_total(index):
+        """验证职称总数满足要求，不足时补足人数"""
+        qual_types = type_lists[index]
+        need_more = total_counts[index] - compiled.qualification_total(index, counts)
+        if need_more <= 0:
+            return
+        # 分配优先级：1. 共享次数多的优先 2. 当前数量少的优先
+        priorities = [-type_counts[type_id] for type_id in qual_types]
+        if len(set(qual_types)) == len(qual_types):
+            # 只有共享次数最多的一组职称会被分配，按水位填充一次补足
+            for type_id, amount in _water_fill(counts, _top_priority_types(qual_types, priorities), need_more):
+                adjusted.add(type_id, amount)
+            return
+        # 有重复职称时逐人分配，直到满足人数要求
+        heap = _AllocationHeap(counts, qual_types, priorities)
+        while compiled.qualification_total(index, counts) < total_counts[index]:
+            type_id = heap.pop()
+            adjusted.add(type_id)
+            heap.push(type_id)
     
     # 处理有齐全要求的资质
-    for qual in all_types_qualifications:
+    for index in all_types_qualifications:
         # 验证1：每个职称类型至少1人
-        for type_name in qual['types']:
-            if adjusted_counts.get(type_name, 0) < 1:
-                adjusted_counts[type_name] = 1
+        for type_id in type_lists[index]:
+            if counts[type_id] < 1:
+                adjusted.add(type_id, 1 - counts[type_id])
         
         # 验证2：职称总数满足要求
-        current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-        if current_total < qual['total_count']:
-            # 需要增加人数
-            need_more = qual['total_count'] - current_total
-            
-            # 循环分配，直到满足人数要求
-            while need_more > 0:
-                # 对该资质的职称类型进行排序：
-                # 1. 共享次数多的优先
-                # 2. 当前数量少的优先
-                sorted_types = sorted(
-                    qual['types'],
-                    key=lambda x: (-type_counts.get(x, 0), adjusted_counts.get(x, 0))
-                )
-                
-                # 分配1人到优先级最高的职称类型
-                top_type = sorted_types[0]
-                adjusted_counts[top_type] = adjusted_counts.get(top_type, 0) + 1
-                need_more -= 1
-                
-                # 重新计算当前总数
-                current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-                if current_total >= qual['total_count']:
-                    break
+        fill_total(index)
     
     # 处理没有齐全要求的资质
-    for qual in partial_types_qualifications:
-        # 验证职称总数满足要求
-        current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-        if current_total < qual['total_count']:
-            # 需要增加人数
-            need_more = qual['total_count'] - current_total
-            
-            # 循环分配，直到满足人数要求
-            while need_more > 0:
-                # 对该资质的职称类型进行排序：
-                # 1. 共享次数多的优先
-                # 2. 当前数量少的优先
-                sorted_types = sorted(
-                    qual['types'],
-                    key=lambda x: (-type_counts.get(x, 0), adjusted_counts.get(x, 0))
-                )
-                
-                # 分配1人到优先级最高的职称类型
-                top_type = sorted_types[0]
-                adjusted_counts[top_type] = adjusted_counts.get(top_type, 0) + 1
-                need_more -= 1
-                
-                # 重新计算当前总数
-                current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-                if current_total >= qual['total_count']:
-                    break
+    for index in partial_types_qualifications:
+        fill_total(index)
     
     # 最终验证：确保所有资质的要求都被满足
+    type_names = compiled.type_names
+    for index, qual_types in enumerate(type_lists):
+        name = compiled.names[index]
+        if compiled.require_all[index]:
+            # 验证每个职称类型至少1人
+            for type_id in qual_types:
+                assert counts[type_id] >= 1, f"资质 {name} 的职称 {type_names[type_id]} 人数不足1人"
+        # 验证总人数满足要求
+        current_total = compiled.qualification_total(index, counts)
+        assert current_total >= total_counts[index], f"资质 {name} 的总人数不足，当前 {current_total} 人，需要 {total_counts[index]} 人"
+    
+    return adjusted
+
+def verify_title_counts(qualifications, title_counts, compiled=None):
+    """验证给定的职称人数是否满足各资质要求"""
+    if compiled is None:
+        compiled = CompiledCatalog(qualifications)
+    counts = compiled.encode_counts(title_counts)
+    type_names = compiled.type_names
+    
+    verification_results = []
     for qual in qualifications:
+        index = compiled.qual_ids[qual['name']]
+        
+        # 计算当前资质的总人数
+        current_total = 0
+        title_details = []
+        missing_types = []
+        reasons = []
+        for type_id in compiled.type_lists[index]:
+            count = counts[type_id]
+            current_total += count
+            title_details.append({
+                'title': type_names[type_id],
+                'count': count,
+                'satisfied': count >= 1
+            })
+            if count < 1:
+                missing_types.append(type_names[type_id])
+        
+        # 检查是否满足要求
+        all_types_ok = len(missing_types) == 0
+        total_ok = current_total >= qual['total_count']
+        
         if qual['require_all_types']:
-            # 验证每个职称类型至少1人
-            for type_name in qual['types']:
-                assert adjusted_counts.get(type_name, 0) >= 1, f"资质 {qual['name']} 的职称 {type_name} 人数不足1人"
-            # 验证总人数满足要求
-            current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-            assert current_total >= qual['total_count'], f"资质 {qual['name']} 的总人数不足，当前 {current_total} 人，需要 {qual['total_count']} 人"
+            # 需要所有类型齐全
+            if not all_types_ok:
+                reasons.append(f'缺少以下职称类型：{"、".join(missing_types)}')
+            if not total_ok:
+                reasons.append(f'总人数不足：当前 {current_total} 人，需要 {qual["total_count"]} 人')
+            satisfied = all_types_ok and total_ok
         else:
-            # 验证总人数满足要求
-            current_total = sum(adjusted_counts.get(type_name, 0) for type_name in qual['types'])
-            assert current_total >= qual['total_count'], f"资质 {qual['name']} 的总人数不足，当前 {current_total} 人，需要 {qual['total_count']} 人"
-    
-    return adjusted_counts
+            # 不需要所有类型齐全，只检查总人数
+            if not total_ok:
+                reasons.append(f'总人数不足：当前 {current_total} 人，需要 {qual["total_count"]} 人')
+            satisfied = total_ok
+        
+        verification_results.append({
+            'qualification_name': qual['name'],
+            'satisfied': satisfied,
+            'current_total': current_total,
+            'required_total': qual['total_count'],
+            'require_all_types': qual['require_all_types'],
+            'title_details': title_details,
+            'reasons': reasons
+        })
+    
+    return verification_results
 
 def get_qualification_by_name(name, data):
     """根据名称获取资质信息"""
+    # 资质目录快照自带名称索引，直接查表
+    if isinstance(data, CatalogSnapshot):
+        return data.get(name)
     for item in data:
         if item['name'] == name:
             return item
@@ -308,35 +582,46 @@ def calculate_total_staff(counts):
     """计算总人数"""
     return sum(counts.values())
 
-def match_qualifications(input_queries):
-    """匹配用户输入的资质，计算所需职称数量"""
+def match_qualifications(input_queries, engine='greedy', time_limit=DEFAULT_TIME_LIMIT, existing=None):
+    """匹配用户输入的资质，计算所需职称数量
+    
+    engine 为 'greedy'（贪心，默认）或 'exact'（分支定界精确求解）。
+    existing 为已有人员（职称名称 -> 人数）时只计算需要新增的人员，结果中附带各职称的新增人数。
+    """
+    if engine not in MERGE_ENGINES:
+        raise ValueError(f"未知的计算引擎: {engine}")
+    
     # 加载数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
-    # 解析用户输入，支持逗号分隔
+    # 解析用户输入，支持逗号分隔（名称中的空格保留，如拼音关键词 "jian zhu"），一次解析所有名称
     queries = [q.strip() for q in input_queries.split(',') if q.strip()]
+    resolutions = resolve_terms(data, queries, alternatives=0)
     
     # 匹配资质
     matched_qualifications = []
-    for query in queries:
-        # 模糊搜索匹配资质
-        matches = fuzzy_search(query, data)
-        if matches:
+    for resolution in resolutions:
+        if resolution['match'] is not None:
             # 使用匹配度最高的结果
-            qual_name = matches[0]
+            qual_name = resolution['match']
             qual = get_qualification_by_name(qual_name, data)
             if qual:
                 matched_qualifications.append(qual)
                 print(f"匹配到资质: {qual_name}")
         else:
-            print(f"未匹配到资质: {query}")
+            print(f"未匹配到资质: {resolution['term']}")
     
     if not matched_qualifications:
         print("未匹配到任何资质，请检查输入")
         return None
     
     # 合并计算
-    final_counts, type_attributes = merge_qualifications(matched_qualifications)
+    proven_optimal = None
+    if engine == 'exact':
+        final_counts, type_attributes, proven_optimal = merge_qualifications_exact(
+            matched_qualifications, time_limit, existing=existing)
+    else:
+        final_counts, type_attributes = merge_qualifications(matched_qualifications, existing=existing)
     
     # 计算总人数
     total_staff = calculate_total_staff(final_counts)
@@ -349,14 +634,28 @@ def match_qualifications(input_queries):
         print(f"{type_name}: {count} 人")
     print("="*50)
     print(f"总人数: {total_staff} 人")
+    if existing:
+        hires = hiring_delta(final_counts, existing)
+        for type_name, count in sorted(hires.items()):
+            print(f"需新增 {type_name}: {count} 人")
+        print(f"需新增总人数: {calculate_total_staff(hires)} 人")
+    if engine == 'exact':
+        print(f"已证明最优: {'是' if proven_optimal else '否（超出时间预算）'}")
     print("="*50)
     
     # 返回结果
-    return {
+    result = {
         "matched_qualifications": [q['name'] for q in matched_qualifications],
         "final_counts": final_counts,
         "total_staff": total_staff
     }
+    if existing:
+        result["hires"] = hires
+        result["total_hires"] = calculate_total_staff(hires)
+    if engine == 'exact':
+        result["engine"] = engine
+        result["proven_optimal"] = proven_optimal
+    return result
 '''
 def test_merge_qualifications():
     """测试合并资质功能"""
@@ -0,0 +1,135 @@
+# 搜索结果缓存
+# 以规范化的关键词、搜索参数和资质目录版本作为键的 LRU 缓存，没有匹配结果的关键词同样缓存。
+# 输入联想时关键词逐字增长（建 -> 建筑 -> 建筑总），每个关键词的候选名称位置也单独缓存，
+# 未命中时由已缓存的最长前缀的候选推出，不必重新查询倒排索引。
+# 单字、双字关键词优先查资质目录快照中预计算的结果表（见 prefix_results.py）。
+import threading
+from collections import OrderedDict
+
+from fuzzy_search import fuzzy_search
+
+# 默认最多缓存的搜索结果数
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def normalize_query(query):
+    """规范化关键词（与 fuzzy_search 的处理一致）"""
+    return query.strip()
+
+
+class SearchCache:
+    """搜索结果与候选位置的 LRU 缓存（线程安全）"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # (版本, 关键词, 搜索参数) -> ((名称, 得分), ...)
+        self._results = OrderedDict()
+        # (版本, 关键词) -> 候选名称位置元组
+        self._candidates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.seeded = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _get(entries, key):
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+        return value
+
+    def _put(self, entries, key, value):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key):
+        """获取缓存的搜索结果，不存在时返回None（没有匹配结果时返回空元组）"""
+        with self._lock:
+            value = self._get(self._results, key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not value:
+                self.negative_hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._put(self._results, key, tuple(value))
+
+    def candidates(self, snapshot, query):
+        """获取关键词的候选名称位置：优先使用缓存，其次由已缓存的最长前缀推出"""
+        search_index = snapshot.search_index
+        with self._lock:
+            value = self._get(self._candidates, (snapshot.version, query))
+            if value is not None:
+                return value
+            prefix = ''
+            prefix_candidates = None
+            for length in range(len(query) - 1, 0, -1):
+                prefix_candidates = self._get(self._candidates, (snapshot.version, query[:length]))
+                if prefix_candidates is not None:
+                    prefix = query[:length]
+                    self.seeded += 1
+                    break
+
+        if prefix:
+            value = tuple(search_index.extend_candidates(query, prefix, prefix_candidates))
+        else:
+            value = tuple(search_index.candidates(query))
+        if self.max_entries > 0:
+            with self._lock:
+                self._put(self._candidates, (snapshot.version, query), value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._candidates.clear()
+
+    def stats(self):
+        """缓存统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._results),
+                'candidate_entries': len(self._candidates),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'seeded': self.seeded,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def search_names(snapshot, query, threshold=0.3, limit=None, min_score=None, with_scores=False, cache=None):
+    """在资质目录快照中搜索资质名称，参数与 fuzzy_search 相同，结果经缓存复用"""
+    query = normalize_query(query)
+    # 单字、双字关键词直接查预计算的结果表
+    results = snapshot.prefix_results.lookup(query, threshold, limit, min_score)
+    if results is not None:
+        return results if with_scores else [name for name, _ in results]
+
+    if cache is None:
+        return fuzzy_search(query, snapshot, threshold, limit, min_score, with_scores)
+
+    key = (snapshot.version, query, threshold, limit, min_score)
+    results = cache.get(key)
+    if results is None:
+        candidates = cache.candidates(snapshot, query)
+        results = fuzzy_search(query, snapshot, threshold, limit, min_score, True, candidates)
+        cache.put(key, results)
+
+    if with_scores:
+        return list(results)
+    return [name for name, _ in results]
@@ -0,0 +1,49 @@
+# 导出给浏览器的搜索索引
+# 页面加载一次资质名称、单字/双字倒排索引和打分规则后在本地排序（static/local_search.js），
+# 只有索引过期（资质数据版本变化）或拼音关键词时才请求 /api/search。
+# 索引按资质目录版本缓存序列化结果，带版本号的地址可以被浏览器长期缓存。
+import json
+import threading
+
+# 打分规则，与 fuzzy_search.score_name 一致
+SCORE_TIERS = {
+    'exact': 1.0,               # 精确匹配
+    'prefix': 0.9,              # 前缀匹配
+    'contains': 0.8,            # 关键词包含"总包"时的包含匹配
+    'contains_marker': '总包',
+    'length_weight': 0.6,       # 按序包含：长度得分的权重
+    'continuity_weight': 0.4,   # 按序包含：连续程度得分的权重
+    'threshold': 0.3            # Levenshtein 相似度阈值
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def build_search_index_payload(snapshot):
+    """生成资质目录快照的搜索索引（可直接序列化为 JSON）
+
+    倒排索引中的名称位置为 names 列表的下标（升序）。
+    """
+    search_index = snapshot.search_index
+    return {
+        'version': snapshot.version,
+        'names': search_index.names,
+        'unigrams': search_index.unigrams,
+        'bigrams': search_index.bigrams,
+        'tiers': SCORE_TIERS
+    }
+
+
+def export_search_index(snapshot):
+    """序列化后的搜索索引（UTF-8 编码的紧凑 JSON），每个资质目录版本只生成一次"""
+    with _cache_lock:
+        payload = _cache.get(snapshot.version)
+    if payload is None:
+        payload = json.dumps(build_search_index_payload(snapshot), ensure_ascii=False,
+                             separators=(',', ':')).encode('utf-8')
+        with _cache_lock:
+            # 只保留当前版本
+            _cache.clear()
+            _cache[snapshot.version] = payload
+    return payload
@@ -0,0 +1,114 @@
+# 资质名称搜索索引
+# 资质目录加载时对所有名称建立单字/双字倒排索引，搜索时只对与关键词有共同字符的名称打分。
+# 与关键词没有任何共同字符的名称，前缀、包含、按序包含都不可能匹配，
+# Levenshtein 相似度也为0，因此剪枝不会改变搜索结果。
+
+
+class SearchIndex:
+    """资质名称的单字/双字倒排索引"""
+
+    def __init__(self, names):
+        # 名称列表，位置与资质目录中的顺序一致
+        self.names = list(names)
+        # 单字 -> 包含该字的名称位置列表（升序）
+        self.unigrams = {}
+        # 单字 -> 该字在对应名称中的出现次数（与 unigrams 的位置列表一一对应）
+        self.unigram_counts = {}
+        # 名称长度
+        self.lengths = [len(name) for name in self.names]
+        # 双字 -> 包含该双字的名称位置列表（升序）
+        self.bigrams = {}
+        # 名称 -> 出现次数（用于判断精确匹配）
+        self.name_counts = {}
+        for position, name in enumerate(self.names):
+            self.name_counts[name] = self.name_counts.get(name, 0) + 1
+            char_counts = {}
+            for char in name:
+                char_counts[char] = char_counts.get(char, 0) + 1
+            for char, count in char_counts.items():
+                self.unigrams.setdefault(char, []).append(position)
+                self.unigram_counts.setdefault(char, []).append(count)
+            for bigram in {name[i:i + 2] for i in range(len(name) - 1)}:
+                self.bigrams.setdefault(bigram, []).append(position)
+
+    def candidates(self, query):
+        """返回可能与关键词匹配的名称位置（按目录顺序）"""
+        if not query:
+            return range(len(self.names))
+
+        if "总包" in query:
+            # 关键词包含"总包"时只匹配完整包含关键词的名称，名称必须包含关键词的每个双字
+            postings = []
+            for i in range(len(query) - 1):
+                posting = self.bigrams.get(query[i:i + 2])
+                if posting is None:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            positions = set(postings[0])
+            for posting in postings[1:]:
+                positions.intersection_update(posting)
+            return sorted(positions)
+
+        # 其余情况：至少包含关键词中的一个字
+        positions = set()
+        for char in set(query):
+            positions.update(self.unigrams.get(char, ()))
+        return sorted(positions)
+
+    def char_overlap(self, query):
+        """名称位置 -> 名称与关键词共有的字符数（按出现次数计）
+
+        只包含至少有一个共同字符的名称，与 candidates 的结果相同。
+        编辑距离不小于 max(名称长度, 关键词长度) - 共有字符数，据此可在计算编辑距离前排除大部分名称。
+        """
+        query_counts = {}
+        for char in query:
+            query_counts[char] = query_counts.get(char, 0) + 1
+        overlap = {}
+        get = overlap.get
+        for char, query_count in query_counts.items():
+            positions = self.unigrams.get(char)
+            if positions is None:
+                continue
+            if query_count == 1:
+                for position in positions:
+                    overlap[position] = get(position, 0) + 1
+            else:
+                for position, count in zip(positions, self.unigram_counts[char]):
+                    overlap[position] = get(position, 0) + min(count, query_count)
+        return overlap
+
+    def extend_candidates(self, query, prefix, prefix_candidates):
+        """由前缀 prefix 的候选位置推出以 prefix 开头的关键词 query 的候选位置（按目录顺序）
+
+        两个关键词都包含"总包"时，query 的双字多于 prefix，只需按新增的双字过滤前缀的候选；
+        都不包含"总包"时，query 的候选是前缀的候选加上包含新增字符的名称。
+        """
+        if not prefix:
+            return self.candidates(query)
+
+        if "总包" in query:
+            if "总包" not in prefix:
+                return self.candidates(query)
+            positions = prefix_candidates
+            for i in range(len(prefix) - 1, len(query) - 1):
+                posting = self.bigrams.get(query[i:i + 2])
+                if posting is None:
+                    return []
+                posting = set(posting)
+                positions = [position for position in positions if position in posting]
+            return positions
+
+        new_chars = set(query[len(prefix):]).difference(prefix)
+        if not new_chars:
+            return prefix_candidates
+        positions = set(prefix_candidates)
+        for char in new_chars:
+            positions.update(self.unigrams.get(char, ()))
+        return sorted(positions)
+
+    def candidate_names(self, query):
+        """返回可能与关键词匹配的名称（按目录顺序）"""
+        names = self.names
+        return [names[position] for position in self.candidates(query)]
@@ -0,0 +1,225 @@
+// 浏览器端资质名称搜索
+// 页面加载时获取服务器导出的搜索索引（/api/search/index），输入时在本地打分排序，
+// 打分规则与 fuzzy_search.score_name 一致（精确、前缀、"总包"包含、按序包含、Levenshtein）。
+// 索引尚未加载、已过期（资质数据版本变化）或输入为拼音时，才请求 /api/search（带防抖并取消上一次请求）。
+const LocalSearch = (function() {
+    // 远程搜索的防抖时间（毫秒）
+    const DEBOUNCE_MS = 150;
+    // 两次检查索引版本的最短间隔（毫秒）
+    const VERSION_CHECK_INTERVAL_MS = 60000;
+
+    let index = null;
+    let nameChars = [];
+    let currentVersion = null;
+    let loadingVersion = null;
+    let lastVersionCheck = 0;
+    let pendingTimer = null;
+    let pendingController = null;
+
+    // 加载指定版本的索引（带版本号的地址可被浏览器长期缓存）
+    function load(version) {
+        if (!version || version === loadingVersion) {
+            return;
+        }
+        loadingVersion = version;
+        fetch(`/api/search/index?v=${encodeURIComponent(version)}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Network response was not ok');
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (data.version !== loadingVersion) {
+                    // 加载期间资质数据又发生了变化，按新版本重新加载
+                    loadingVersion = null;
+                    load(data.version);
+                    return;
+                }
+                index = data;
+                // 按码点拆分名称，与 Python 的字符串下标一致
+                nameChars = data.names.map(name => Array.from(name));
+                currentVersion = data.version;
+                lastVersionCheck = Date.now();
+            })
+            .catch(error => {
+                console.error('搜索索引加载失败:', error);
+                loadingVersion = null;
+            });
+    }
+
+    // 初始化：加载页面渲染时的索引版本
+    function init(version) {
+        currentVersion = version;
+        load(version);
+    }
+
+    // 检查索引是否过期，过期时改为远程搜索并在后台加载新索引
+    function checkVersion() {
+        if (Date.now() - lastVersionCheck < VERSION_CHECK_INTERVAL_MS) {
+            return;
+        }
+        lastVersionCheck = Date.now();
+        fetch('/api/search/version', { cache: 'no-store' })
+            .then(response => response.json())
+            .then(data => {
+                if (data.version && data.version !== currentVersion) {
+                    index = null;
+                    currentVersion = data.version;
+                    load(data.version);
+                }
+            })
+            .catch(error => console.error('搜索索引版本检查失败:', error));
+    }
+
+    function isPinyinQuery(query) {
+        return /^[A-Za-z][A-Za-z' ]*$/.test(query);
+    }
+
+    // 能否在本地排序：索引已加载且关键词不是拼音
+    function canRank(query) {
+        return index !== null && !isPinyinQuery(query.trim());
+    }
+
+    // 可能匹配的名称位置（按目录顺序）
+    function candidates(query) {
+        const tiers = index.tiers;
+        if (query.includes(tiers.contains_marker)) {
+            // 关键词包含"总包"时只匹配完整包含关键词的名称，名称必须包含关键词的每个双字
+            let positions = null;
+            const chars = Array.from(query);
+            for (let i = 0; i < chars.length - 1; i++) {
+                const posting = index.bigrams[chars[i] + chars[i + 1]];
+                if (!posting) {
+                    return [];
+                }
+                const set = new Set(posting);
+                positions = positions === null ? posting.slice() : positions.filter(p => set.has(p));
+            }
+            return positions || [];
+        }
+        const positions = new Set();
+        for (const char of new Set(Array.from(query))) {
+            for (const position of index.unigrams[char] || []) {
+                positions.add(position);
+            }
+        }
+        return Array.from(positions).sort((a, b) => a - b);
+    }
+
+    // Levenshtein 相似度
+    function levenshteinSimilarity(query, name) {
+        const m = query.length;
+        const n = name.length;
+        const maxLen = Math.max(m, n);
+        if (maxLen === 0) {
+            return 1;
+        }
+        let previous = new Array(n + 1);
+        for (let j = 0; j <= n; j++) {
+            previous[j] = j;
+        }
+        for (let i = 1; i <= m; i++) {
+            const current = new Array(n + 1);
+            current[0] = i;
+            for (let j = 1; j <= n; j++) {
+                const cost = query[i - 1] === name[j - 1] ? 0 : 1;
+                current[j] = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+            }
+            previous = current;
+        }
+        return 1 - (previous[n] / maxLen);
+    }
+
+    // 关键词与名称的匹配得分，不匹配时返回null（query、name 为码点数组）
+    function scoreName(queryText, query, nameText, name) {
+        const tiers = index.tiers;
+        if (queryText === nameText) {
+            return tiers.exact;
+        }
+        if (nameText.startsWith(queryText)) {
+            return tiers.prefix;
+        }
+        if (queryText.includes(tiers.contains_marker)) {
+            return nameText.includes(queryText) ? tiers.contains : null;
+        }
+        // 按序包含：逐字取最靠左的位置，计算长度得分与连续程度得分
+        let lastIndex = -1;
+        let intervalSum = 0;
+        let containsMatch = true;
+        for (let i = 0; i < query.length; i++) {
+            const position = name.indexOf(query[i], lastIndex + 1);
+            if (position === -1) {
+                containsMatch = false;
+                break;
+            }
+            if (i > 0) {
+                intervalSum += position - lastIndex - 1;
+            }
+            lastIndex = position;
+        }
+        if (containsMatch) {
+            const lengthScore = query.length / name.length;
+            const avgInterval = query.length > 1 ? intervalSum / (query.length - 1) : 0;
+            const continuityScore = 1 / (1 + avgInterval);
+            return lengthScore * tiers.length_weight + continuityScore * tiers.continuity_weight;
+        }
+        const similarity = levenshteinSimilarity(query, name);
+        return similarity >= tiers.threshold ? similarity : null;
+    }
+
+    // 本地搜索，返回按得分降序（同分按目录顺序）的前 limit 个名称
+    function search(queryText, limit) {
+        queryText = queryText.trim();
+        const query = Array.from(queryText);
+        const results = [];
+        for (const position of candidates(queryText)) {
+            const score = scoreName(queryText, query, index.names[position], nameChars[position]);
+            if (score !== null) {
+                results.push({ name: index.names[position], score: score });
+            }
+        }
+        results.sort((a, b) => b.score - a.score);
+        const names = results.map(result => result.name);
+        return limit === undefined ? names : names.slice(0, limit);
+    }
+
+    // 取消等待中或未完成的远程搜索（被取消的请求以 AbortError 结束）
+    function cancelRemote() {
+        if (pendingTimer !== null) {
+            clearTimeout(pendingTimer);
+            pendingTimer = null;
+        }
+        if (pendingController !== null) {
+            pendingController.abort();
+            pendingController = null;
+        }
+    }
+
+    // 远程搜索：防抖，新的请求发出前取消上一次的请求
+    function remoteSearch(query, limit) {
+        cancelRemote();
+        return new Promise((resolve, reject) => {
+            pendingTimer = setTimeout(() => {
+                pendingTimer = null;
+                const controller = new AbortController();
+                pendingController = controller;
+                fetch(`/api/search?q=${encodeURIComponent(query)}&limit=${limit}`, { signal: controller.signal })
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error('Network response was not ok');
+                        }
+                        return response.json();
+                    })
+                    .then(resolve, reject)
+                    .finally(() => {
+                        if (pendingController === controller) {
+                            pendingController = null;
+                        }
+                    });
+            }, DEBOUNCE_MS);
+        });
+    }
+
+    return { init, checkVersion, canRank, search, remoteSearch, cancelRemote, scoreName };
+})();
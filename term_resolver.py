@@ -0,0 +1,73 @@
+# 批量解析资质名称
+# 一次解析多个自由输入的资质名称（如从招标文件中粘贴的资质列表），
+# 每个名称给出最佳匹配、备选结果和置信度。
+# 重复的输入只搜索一次，每个输入只选取得分最高的几个结果（top-k 搜索，经搜索缓存）。
+import re
+
+from search_cache import search_names
+
+# 文本输入（/api/resolve 的 text）的分隔符：中英文逗号、顿号、中英文分号、换行和空白。
+# 名称列表不再拆分，名称中可以包含空格
+TERM_SEPARATORS = re.compile(r'[,，、;；\s]+')
+# 默认返回的备选结果数量（不含最佳匹配）
+DEFAULT_ALTERNATIVES = 3
+
+
+def split_terms(text):
+    """按分隔符拆分输入，去掉空项"""
+    return [term for term in TERM_SEPARATORS.split(text) if term]
+
+
+def resolve_terms(snapshot, terms, alternatives=DEFAULT_ALTERNATIVES, cache=None):
+    """批量解析资质名称
+
+    terms 为名称列表或待拆分的文本。按输入顺序返回每个名称的解析结果：
+      term          输入的名称
+      match         最佳匹配的资质名称，没有匹配时为None
+      confidence    最佳匹配的得分（精确匹配为1.0，没有匹配时为0）
+      exact         是否与资质名称完全相同
+      ambiguous     是否有与最佳匹配得分相同的备选结果
+      alternatives  其余得分最高的资质 [{'name', 'score'}]
+    """
+    if isinstance(terms, str):
+        terms = split_terms(terms)
+
+    resolved = {}
+    results = []
+    for term in terms:
+        term = term.strip()
+        if not term:
+            continue
+        result = resolved.get(term)
+        if result is None:
+            result = _resolve_term(snapshot, term, alternatives, cache)
+            resolved[term] = result
+        results.append(dict(result, alternatives=list(result['alternatives'])))
+    return results
+
+
+def _resolve_term(snapshot, term, alternatives, cache):
+    """解析单个名称"""
+    # 与资质名称完全相同时得分为1.0，总是排在第一位
+    matches = search_names(snapshot, term, limit=alternatives + 1, with_scores=True, cache=cache)
+
+    if not matches:
+        return {
+            'term': term,
+            'match': None,
+            'confidence': 0,
+            'exact': False,
+            'ambiguous': False,
+            'alternatives': []
+        }
+
+    best_name, best_score = matches[0]
+    others = matches[1:]
+    return {
+        'term': term,
+        'match': best_name,
+        'confidence': best_score,
+        'exact': best_name == term,
+        'ambiguous': bool(others) and others[0][1] == best_score,
+        'alternatives': [{'name': name, 'score': score} for name, score in others]
+    }
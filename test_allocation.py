@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# 测试职称人数分配（优先队列与水位填充）
+
+import random
+
+from qualification_matcher import merge_qualifications, verify_title_counts, _water_fill, _AllocationHeap
+
+def test_water_fill():
+    """测试水位填充与逐人分配的结果一致"""
+    rnd = random.Random(0)
+    for _ in range(2000):
+        counts = [rnd.randint(0, 5) for _ in range(8)]
+        types = rnd.sample(range(8), rnd.randint(1, 8))
+        amount = rnd.randint(0, 30)
+
+        # 逐人分配：每次分配给人数最少的职称，人数相同时取靠前的职称
+        expected = counts[:]
+        for _ in range(amount):
+            top_type = min(types, key=lambda x: expected[x])
+            expected[top_type] += 1
+
+        result = counts[:]
+        for type_id, increase in _water_fill(counts, types, amount):
+            result[type_id] += increase
+        assert result == expected, f"水位填充结果错误: {counts}, {types}, {amount}"
+    print("✓ 水位填充与逐人分配结果一致")
+
+def test_allocation_heap():
+    """测试职称堆与按 (优先级, 当前人数) 排序取首个的结果一致"""
+    rnd = random.Random(1)
+    for _ in range(500):
+        counts = [rnd.randint(0, 3) for _ in range(6)]
+        # 包含重复职称
+        qual_types = [rnd.randrange(6) for _ in range(rnd.randint(1, 6))]
+        shared = [rnd.randint(0, 2) for _ in range(6)]
+        priorities = [-shared[type_id] for type_id in qual_types]
+
+        expected = counts[:]
+        result = counts[:]
+        heap = _AllocationHeap(result, qual_types, priorities)
+        for _ in range(10):
+            top = sorted(range(len(qual_types)), key=lambda i: (priorities[i], expected[qual_types[i]]))[0]
+            expected[qual_types[top]] += 1
+            type_id = heap.pop()
+            result[type_id] += 1
+            heap.push(type_id)
+            assert result == expected
+    print("✓ 职称堆分配顺序正确")
+
+def test_large_total_count():
+    """测试总人数要求很大的资质"""
+    qualifications = [
+        {'name': '大型资质A', 'require_all_types': True, 'types': ['结构', '电气', '给排水'], 'total_count': 5000},
+        {'name': '大型资质B', 'require_all_types': False, 'types': ['结构', '机械'], 'total_count': 3000},
+        {'name': '大型资质C', 'require_all_types': False, 'types': ['机械', '暖通'], 'total_count': 4000},
+    ]
+    final_counts, _ = merge_qualifications(qualifications)
+    print(f"职称分布: {final_counts}")
+    results = verify_title_counts(qualifications, final_counts)
+    assert all(r['satisfied'] for r in results)
+    print("✓ 大人数要求的资质计算正确")
+
+def test_optimize_fixpoint():
+    """测试优化后任何职称再减少1人都会导致某个资质不满足"""
+    rnd = random.Random(2)
+    type_names = [f"职称{i}" for i in range(20)]
+    for _ in range(50):
+        qualifications = [
+            {'name': f"资质{i}", 'require_all_types': rnd.random() < 0.4,
+             'types': rnd.sample(type_names, rnd.randint(2, 6)), 'total_count': rnd.randint(3, 30)}
+            for i in range(rnd.randint(2, 12))
+        ]
+        final_counts, _ = merge_qualifications(qualifications)
+        assert all(r['satisfied'] for r in verify_title_counts(qualifications, final_counts))
+        for type_name, count in final_counts.items():
+            assert count >= 1, "每个职称至少保留1人"
+            if count == 1:
+                continue
+            reduced = dict(final_counts)
+            reduced[type_name] -= 1
+            results = verify_title_counts(qualifications, reduced)
+            assert not all(r['satisfied'] for r in results), f"职称 {type_name} 仍可减少"
+    print("✓ 优化结果已达到不动点")
+
+if __name__ == "__main__":
+    test_water_fill()
+    test_allocation_heap()
+    test_large_total_count()
+    test_optimize_fixpoint()
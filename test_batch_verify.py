@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# 测试批量验证与逐个验证的结果一致
+
+import random
+
+import batch_verify
+from qualification_catalog import get_catalog
+from qualification_matcher import verify_title_counts
+
+def _expected(snapshot, qualifications, title_counts):
+    """用逐个验证的结果生成期望值"""
+    results = verify_title_counts(qualifications, title_counts, snapshot.compiled)
+    return [{
+        'qualification_name': result['qualification_name'],
+        'satisfied': result['satisfied'],
+        'current_total': result['current_total'],
+        'required_total': result['required_total'],
+        'missing_type_count': sum(1 for detail in result['title_details'] if not detail['satisfied'])
+    } for result in results]
+
+def test_batch_verify():
+    """测试矩阵运算、纯 Python 实现与 verify_title_counts 的结果相同"""
+    snapshot = get_catalog().snapshot()
+    type_names = snapshot.compiled.type_names
+    rnd = random.Random(21)
+    profiles = [('空配置', {})]
+    for index in range(300):
+        title_counts = {type_name: rnd.randint(0, 3) for type_name in rnd.sample(type_names, rnd.randint(1, len(type_names)))}
+        title_counts['未知职称'] = 5
+        profiles.append((index, title_counts))
+
+    selections = [None, [qual['name'] for qual in rnd.sample(list(snapshot), 5)] + ['不存在的资质']]
+    for qualifications in selections:
+        matched = list(snapshot) if qualifications is None else snapshot.lookup(qualifications)
+        expected = [_expected(snapshot, matched, title_counts) for _, title_counts in profiles]
+
+        engines = [('纯 Python', None)]
+        if batch_verify.np is not None:
+            engines.insert(0, ('矩阵运算', batch_verify.np))
+        for label, np_module in engines:
+            original = batch_verify.np
+            batch_verify.np = np_module
+            try:
+                results = list(batch_verify.verify_profiles(snapshot, profiles, qualifications, chunk_size=64))
+            finally:
+                batch_verify.np = original
+            assert [result['profile'] for result in results] == [profile for profile, _ in profiles]
+            for result, expected_results in zip(results, expected):
+                assert result['results'] == expected_results
+                assert result['satisfied_count'] == sum(1 for item in expected_results if item['satisfied'])
+            print(f"✓ {label}：{len(profiles)} 个人员配置 × {len(matched)} 个资质的验证结果正确")
+
+    if batch_verify.np is not None:
+        assert batch_verify.incidence_matrix(snapshot) is batch_verify.incidence_matrix(snapshot)
+        print("✓ 关联矩阵按资质目录版本缓存")
+
+if __name__ == "__main__":
+    test_batch_verify()
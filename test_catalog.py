@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# 测试资质目录的缓存与热加载
+
+import json
+import os
+import tempfile
+
+from qualification_catalog import QualificationCatalog, get_catalog
+from qualification_matcher import get_qualification_by_name
+
+def test_catalog_reload():
+    """测试资质目录只在文件变化时重新加载"""
+    # 复制一份资质数据到临时文件，避免修改真实数据
+    data = list(get_catalog().snapshot())
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        catalog = QualificationCatalog(path)
+
+        # 文件未变化时返回同一个快照
+        snapshot1 = catalog.snapshot()
+        snapshot2 = catalog.snapshot()
+        print(f"资质数量: {len(snapshot1)}, 版本: {snapshot1.version}")
+        assert snapshot1 is snapshot2, "文件未变化时不应重新加载"
+        assert len(snapshot1) == len(data)
+        print("✓ 文件未变化时复用快照")
+
+        # 修改文件后返回新快照，旧快照保持不变
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data[:3], f, ensure_ascii=False)
+        snapshot3 = catalog.snapshot()
+        print(f"资质数量: {len(snapshot3)}, 版本: {snapshot3.version}")
+        assert snapshot3 is not snapshot1, "文件变化后应重新加载"
+        assert snapshot3.version != snapshot1.version
+        assert len(snapshot3) == 3 and len(snapshot1) == len(data)
+        print("✓ 文件变化后重新加载")
+    finally:
+        os.remove(path)
+
+def test_catalog_indexes():
+    """测试资质目录索引与线性查找结果一致"""
+    snapshot = get_catalog().snapshot()
+    data = list(snapshot)
+
+    for qual in data:
+        # 名称索引
+        assert get_qualification_by_name(qual['name'], snapshot) is get_qualification_by_name(qual['name'], data)
+        # 职称类型索引
+        for type_name in qual['types']:
+            assert qual in snapshot.qualifications_with_type(type_name)
+    assert snapshot.get("不存在的资质") is None
+    print("✓ 名称索引、职称类型索引正确")
+
+    # 批量查找保持输入顺序并忽略不存在的名称
+    names = ["市政总包二级", "不存在的资质", "建筑总包二级"]
+    matched = snapshot.lookup(names)
+    print(f"批量查找: {[q['name'] for q in matched]}")
+    assert [q['name'] for q in matched] == ["市政总包二级", "建筑总包二级"]
+
+    # 齐全要求划分
+    assert len(snapshot.all_types_qualifications) + len(snapshot.partial_types_qualifications) == len(data)
+    assert all(q['require_all_types'] for q in snapshot.all_types_qualifications)
+    assert not any(q['require_all_types'] for q in snapshot.partial_types_qualifications)
+    print("✓ 批量查找与齐全要求划分正确")
+
+def test_compiled_catalog():
+    """测试编译形式与按名称计算的结果一致"""
+    snapshot = get_catalog().snapshot()
+    compiled = snapshot.compiled
+    title_counts = {"结构": 3, "给排水": 1, "电气": 0, "机械": 2, "未知职称": 5}
+    counts = compiled.encode_counts(title_counts)
+    print(f"职称类型数量: {compiled.type_count}")
+
+    for index, qual in enumerate(snapshot):
+        # 职称编号与位掩码
+        assert [compiled.type_names[t] for t in compiled.type_lists[index]] == qual['types']
+        for type_name in qual['types']:
+            assert compiled.masks[index] >> compiled.type_ids[type_name] & 1
+        # 满足判断
+        current_total = sum(title_counts.get(t, 0) for t in qual['types'])
+        expected = current_total >= qual['total_count']
+        if qual['require_all_types']:
+            expected = expected and all(title_counts.get(t, 0) >= 1 for t in qual['types'])
+        assert compiled.qualification_total(index, counts) == current_total
+        assert compiled.is_satisfied(index, counts) == expected
+    print("✓ 编译形式的职称数组、位掩码与满足判断正确")
+
+    # 人数数组转回名称时保持给定顺序
+    order = [compiled.type_ids["机械"], compiled.type_ids["结构"]]
+    assert list(compiled.decode_counts(counts, order).items()) == [("机械", 2), ("结构", 3)]
+    print("✓ 人数数组与名称互相转换正确")
+
+if __name__ == "__main__":
+    test_catalog_reload()
+    test_catalog_indexes()
+    test_compiled_catalog()
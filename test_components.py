@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# 测试按连通分量拆分的合并计算
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from qualification_matcher import merge_qualifications, merge_qualifications_exact, split_components, calculate_total_staff
+from qualification_catalog import get_catalog
+
+def test_components():
+    """测试连通分量拆分及并发计算结果与整体计算一致"""
+    # 加载资质数据
+    data = get_catalog().snapshot()
+
+    # 建筑、电力、水利、矿山资质组合
+    names = ["建筑总包二级", "电力总包二级", "水利总包二级", "矿山总包二级", "城市及道路照明施工专业承包二级"]
+    qualifications = data.lookup(names)
+
+    components = split_components(qualifications)
+    print("连通分量:")
+    for component in components:
+        print(f"- {'、'.join(q['name'] for q in component)}")
+    # 建筑与矿山共享"结构"，其余资质各自独立
+    assert [[q['name'] for q in c] for c in components] == [
+        ["建筑总包二级", "矿山总包二级"],
+        ["电力总包二级"],
+        ["水利总包二级"],
+        ["城市及道路照明施工专业承包二级"],
+    ]
+    print("✓ 连通分量拆分正确")
+
+    # 各分量单独计算后合并，与顺序计算、并发计算的结果一致
+    final_counts, type_attributes = merge_qualifications(qualifications)
+    expected_counts = {}
+    for component in components:
+        component_counts, _ = merge_qualifications(component)
+        expected_counts.update(component_counts)
+    assert final_counts == expected_counts
+    assert set(type_attributes) == set(final_counts)
+
+    with ThreadPoolExecutor(4) as executor:
+        assert merge_qualifications(qualifications, executor) == (final_counts, type_attributes)
+    with ProcessPoolExecutor(2) as executor:
+        assert merge_qualifications(qualifications, executor) == (final_counts, type_attributes)
+        exact_counts, _, proven_optimal = merge_qualifications_exact(qualifications, executor=executor)
+    print(f"贪心总人数: {calculate_total_staff(final_counts)}, 精确总人数: {calculate_total_staff(exact_counts)}, 已证明最优: {proven_optimal}")
+    assert calculate_total_staff(exact_counts) <= calculate_total_staff(final_counts)
+    print("✓ 分量并发计算结果一致")
+
+if __name__ == "__main__":
+    test_components()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# 测试最大覆盖规划
+
+import itertools
+import random
+import time
+
+from compiled_catalog import CompiledCatalog
+from coverage_planner import plan_coverage
+from exact_solver import solve_exact
+from qualification_catalog import get_catalog
+from qualification_matcher import verify_title_counts
+
+def _feasible(qualifications, budget, availability):
+    """穷举用：资质集合在人员限制下是否可行"""
+    compiled = CompiledCatalog(qualifications)
+    maximum = compiled.encode_counts(availability) if availability is not None else None
+    upper_bound = budget + 1 if budget is not None else None
+    counts, proven = solve_exact(compiled, None, None, maximum=maximum, upper_bound=upper_bound)
+    assert proven
+    return counts is not None
+
+def _brute_force(qualifications, budget, availability, weights):
+    """穷举所有资质集合，返回可行集合的最大权重"""
+    best = 0
+    for size in range(1, len(qualifications) + 1):
+        for subset in itertools.combinations(qualifications, size):
+            weight = sum(weights.get(qual['name'], 1) for qual in subset)
+            if weight > best and _feasible(list(subset), budget, availability):
+                best = weight
+    return best
+
+def _check(result, qualifications, budget, availability, weights):
+    """结果中的人数满足选出的资质，且不超过人员限制"""
+    by_name = {qual['name']: qual for qual in qualifications}
+    selected = [by_name[name] for name in result['qualifications']]
+    assert all(item['satisfied'] for item in verify_title_counts(selected, result['final_counts']))
+    assert result['total_staff'] == sum(result['final_counts'].values())
+    if budget is not None:
+        assert result['total_staff'] <= budget
+    if availability is not None:
+        assert all(count <= availability.get(type_name, 0) for type_name, count in result['final_counts'].items())
+    assert result['weight'] == sum(weights.get(name, 1) for name in result['qualifications'])
+
+def test_coverage_planner():
+    """测试规划结果可行，已证明最优时与穷举结果相同"""
+    snapshot = get_catalog().snapshot()
+    data = list(snapshot)
+    rnd = random.Random(24)
+    types = sorted({type_name for qual in data for type_name in qual['types']})
+    for case in range(40):
+        qualifications = rnd.sample(data, 8)
+        budget = rnd.randint(3, 30) if case % 4 != 3 else None
+        availability = None
+        if case % 2 == 1:
+            availability = {type_name: rnd.randint(0, 4) for type_name in types}
+        weights = {}
+        if case % 3 == 2:
+            weights = {qual['name']: rnd.randint(1, 5) for qual in qualifications}
+        if budget is None and availability is None:
+            budget = 10
+
+        result = plan_coverage(qualifications, budget, availability, weights, time_limit=None)
+        _check(result, qualifications, budget, availability, weights)
+        assert result['proven_optimal']
+        assert result['weight'] == _brute_force(qualifications, budget, availability, weights)
+    print("✓ 40 组随机资质的规划结果与穷举的最优结果相同")
+
+    # 资质中职称重复出现：每人为资质总数贡献多个名额
+    repeated = [
+        {'name': 'Q1', 'types': ['T2', 'T2', 'T3'], 'total_count': 6, 'require_all_types': False},
+        {'name': 'Q4', 'types': ['T2', 'T2'], 'total_count': 2, 'require_all_types': False},
+    ]
+    for budget, availability in [(None, {'T2': 1, 'T3': 4}), (5, {'T2': 1, 'T3': 4}), (4, None)]:
+        result = plan_coverage(repeated, budget, availability, time_limit=None)
+        _check(result, repeated, budget, availability, {})
+        assert result['proven_optimal']
+        assert result['weight'] == _brute_force(repeated, budget, availability, {})
+    assert plan_coverage(repeated, availability={'T2': 1, 'T3': 4})['qualifications'] == ['Q1', 'Q4']
+    for case in range(60):
+        qualifications = []
+        for index in range(6):
+            qual_types = [rnd.choice(['T1', 'T2', 'T3', 'T4']) for _ in range(rnd.randint(1, 4))]
+            qualifications.append({'name': f'Q{index}', 'types': qual_types,
+                                   'total_count': rnd.randint(1, 6), 'require_all_types': rnd.random() < 0.4})
+        budget = rnd.randint(2, 10) if case % 3 != 2 else None
+        availability = {type_name: rnd.randint(0, 3) for type_name in ['T1', 'T2', 'T3', 'T4']} if case % 3 else None
+        result = plan_coverage(qualifications, budget, availability, time_limit=None)
+        _check(result, qualifications, budget, availability, {})
+        assert result['proven_optimal']
+        assert result['weight'] == _brute_force(qualifications, budget, availability, {}), qualifications
+    print("✓ 职称重复出现时的规划结果与穷举的最优结果相同")
+
+    # 预算足够时选出所有能满足的资质
+    satisfiable = [qual for qual in data if qual['types']]
+    result = plan_coverage(data, budget=1000)
+    assert result['proven_optimal']
+    assert sorted(result['qualifications']) == sorted(qual['name'] for qual in satisfiable)
+    print(f"✓ 预算充足时选出全部 {len(satisfiable)} 个可满足的资质，共需 {result['total_staff']} 人")
+
+    # 整个资质目录在限定时间内返回可行结果
+    result = plan_coverage(data, budget=30, time_limit=1.0)
+    _check(result, data, 30, None, {})
+    print(f"✓ 30 人预算最多满足 {len(result['qualifications'])} 个资质（已证明最优: {result['proven_optimal']}）")
+
+    # 资质较多、搜索无法在时间预算内完成时，包括最后求最少人数在内不超出时间预算
+    enlarged = [dict(qual, name=f"{qual['name']}{copy}", total_count=qual['total_count'] + copy)
+                for copy in range(6) for qual in data]
+    for budget in (30, 120):
+        start = time.perf_counter()
+        result = plan_coverage(enlarged, budget=budget, time_limit=1.0)
+        elapsed = time.perf_counter() - start
+        _check(result, enlarged, budget, None, {})
+        assert elapsed < 1.1, f"规划耗时 {elapsed:.2f} 秒，超出时间预算"
+    print(f"✓ {len(enlarged)} 个资质的规划在时间预算内返回")
+
+if __name__ == "__main__":
+    test_coverage_planner()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# 测试已有人员时只计算新增人员（增量招聘）
+
+import random
+
+from merge_cache import MergeCache, merge_selection
+from qualification_catalog import get_catalog
+from qualification_matcher import (merge_qualifications, merge_qualifications_exact, hiring_delta,
+                                   calculate_total_staff, verify_title_counts)
+
+def _check(qualifications, existing, final_counts):
+    """结果不少于已有人数，且满足所有资质要求"""
+    for type_name, count in existing.items():
+        if any(type_name in qual['types'] for qual in qualifications):
+            assert final_counts.get(type_name, 0) >= count, f"{type_name} 少于已有人数"
+    results = verify_title_counts(qualifications, final_counts)
+    assert all(result['satisfied'] for result in results)
+
+def test_delta_hiring():
+    """测试增量招聘的结果可行、不移除已有人员，已满足的资质不需要新增人员"""
+    snapshot = get_catalog().snapshot()
+    # 不含任何职称的资质无法满足，不参与测试
+    data = [qual for qual in snapshot if qual['types']]
+    rnd = random.Random(23)
+    for _ in range(100):
+        qualifications = rnd.sample(data, rnd.randint(1, 5))
+        types = sorted({type_name for qual in qualifications for type_name in qual['types']})
+        existing = {type_name: rnd.randint(0, 3) for type_name in rnd.sample(types, rnd.randint(0, len(types)))}
+        existing['其他职称'] = 2
+
+        final_counts, _ = merge_qualifications(qualifications, existing=existing)
+        _check(qualifications, existing, final_counts)
+        hires = hiring_delta(final_counts, existing)
+        assert all(count > 0 for count in hires.values())
+        assert calculate_total_staff(final_counts) - calculate_total_staff(hires) == \
+            sum(count for type_name, count in existing.items() if type_name in types)
+
+        exact_counts, _, proven_optimal = merge_qualifications_exact(qualifications, existing=existing)
+        _check(qualifications, existing, exact_counts)
+        if proven_optimal:
+            assert calculate_total_staff(exact_counts) <= calculate_total_staff(final_counts)
+
+        # 已有人员恰好是完整的方案时不需要新增人员
+        full_counts, _ = merge_qualifications(qualifications)
+        assert hiring_delta(merge_qualifications(qualifications, existing=full_counts)[0], full_counts) == {}
+    print("✓ 100 组随机资质与已有人员的增量结果正确")
+
+    # 没有已有人员时与原结果相同，已满足的资质不影响其余资质的新增人数
+    qual_a = snapshot.get("建筑总包二级")
+    qual_b = snapshot.get("市政总包二级")
+    assert merge_qualifications([qual_a, qual_b], existing={}) == merge_qualifications([qual_a, qual_b])
+    own_counts, _ = merge_qualifications([qual_a])
+    delta = hiring_delta(merge_qualifications([qual_a, qual_b], existing=own_counts)[0], own_counts)
+    assert calculate_total_staff(delta) <= calculate_total_staff(merge_qualifications([qual_b])[0])
+    print("✓ 已满足的资质不需要新增人员")
+
+    # 缓存键包含已有人员
+    cache = MergeCache()
+    names = [qual_a['name'], qual_b['name']]
+    plain = merge_selection(snapshot, names, cache=cache)
+    delta_result = merge_selection(snapshot, names, cache=cache, existing=own_counts)
+    assert delta_result == merge_selection(snapshot, names, existing=own_counts)
+    assert merge_selection(snapshot, names, cache=cache) == plain
+    assert cache.stats()['hits'] == 1
+    print("✓ 增量结果按已有人员分别缓存")
+
+if __name__ == "__main__":
+    test_delta_hiring()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# 测试反向查询人员配置已满足的资质
+
+import random
+
+from eligibility import eligible_qualifications
+from qualification_catalog import get_catalog
+from qualification_matcher import verify_title_counts
+
+def test_eligibility():
+    """测试已满足的资质与逐个验证的结果一致，接近满足的资质按还差人数排序"""
+    snapshot = get_catalog().snapshot()
+    type_names = snapshot.compiled.type_names
+    rnd = random.Random(22)
+    for _ in range(200):
+        title_counts = {type_name: rnd.randint(0, 4) for type_name in rnd.sample(type_names, rnd.randint(0, len(type_names)))}
+        result = eligible_qualifications(snapshot, title_counts, near_misses=None)
+        verification = verify_title_counts(list(snapshot), title_counts, snapshot.compiled)
+
+        expected = [item['qualification_name'] for item in verification if item['satisfied']]
+        assert [item['qualification_name'] for item in result['satisfied']] == expected
+
+        touched = {qual['name'] for qual in snapshot
+                   if any(title_counts.get(type_name, 0) > 0 for type_name in qual['types'])}
+        misses = result['near_misses']
+        assert {item['qualification_name'] for item in misses} == touched - set(expected)
+        assert [item['people_missing'] for item in misses] == sorted(item['people_missing'] for item in misses)
+        for item in misses:
+            qual = snapshot.get(item['qualification_name'])
+            assert item['people_missing'] > 0
+            # 按缺少的职称各补1人、其余差额补到任一职称后应当满足要求
+            completed = dict(title_counts)
+            for type_name in item['missing_types']:
+                completed[type_name] = 1
+            extra = item['people_missing'] - len(item['missing_types'])
+            completed[qual['types'][0]] = completed.get(qual['types'][0], 0) + extra
+            assert verify_title_counts([qual], completed, snapshot.compiled)[0]['satisfied']
+
+        limited = eligible_qualifications(snapshot, title_counts, near_misses=3)
+        assert limited['near_misses'] == misses[:3]
+    print("✓ 200 个随机人员配置的反向查询结果正确")
+
+if __name__ == "__main__":
+    test_eligibility()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# 测试分支定界精确求解引擎
+
+import itertools
+import random
+
+from compiled_catalog import CompiledCatalog
+from exact_solver import solve_exact
+from qualification_matcher import merge_qualifications, merge_qualifications_exact, calculate_total_staff, verify_title_counts
+from qualification_catalog import get_catalog
+
+def test_exact_solver():
+    """测试精确求解结果满足所有资质要求且不多于贪心结果"""
+    # 加载资质数据
+    data = get_catalog().snapshot()
+
+    test_cases = [
+        ["建筑总包二级"],
+        ["机电总包二级", "矿山总包二级", "石油总包二级"],
+        # 贪心结果为15人，最优为14人
+        ["市政总包二级", "机电总包二级", "钢结构工程施工专业承包二级"],
+        ["建筑总包二级", "市政总包二级", "机电总包二级", "矿山总包二级", "石油总包二级"],
+    ]
+
+    for names in test_cases:
+        qualifications = data.lookup(names)
+        greedy_counts, _ = merge_qualifications(qualifications)
+        final_counts, type_attributes, proven_optimal = merge_qualifications_exact(qualifications)
+        greedy_total = calculate_total_staff(greedy_counts)
+        exact_total = calculate_total_staff(final_counts)
+
+        print(f"资质: {'、'.join(names)}")
+        print(f"贪心总人数: {greedy_total}, 精确总人数: {exact_total}, 已证明最优: {proven_optimal}")
+        print(f"职称分布: {final_counts}")
+
+        results = verify_title_counts(qualifications, final_counts, data.compiled)
+        assert all(r['satisfied'] for r in results), f"精确结果不满足资质要求: {results}"
+        assert exact_total <= greedy_total, "精确结果不应多于贪心结果"
+        assert proven_optimal, "小规模问题应在时间预算内证明最优"
+        assert set(type_attributes) == set(final_counts)
+        print("✓ 测试通过")
+        print()
+
+    # 已知贪心结果不是最优的组合
+    qualifications = data.lookup(test_cases[2])
+    final_counts, _, _ = merge_qualifications_exact(qualifications)
+    assert calculate_total_staff(final_counts) == 14
+
+def _brute_force_total(compiled):
+    """穷举各职称人数（每个职称不超过最大的要求总人数），返回满足所有资质的最少总人数"""
+    limit = max(compiled.total_counts) + 1
+    best = None
+    for counts in itertools.product(range(limit), repeat=compiled.type_count):
+        total = sum(counts)
+        if (best is None or total < best) and \
+                all(compiled.is_satisfied(index, counts) for index in range(len(compiled.type_lists))):
+            best = total
+    return best
+
+def test_exact_solver_repeated_titles():
+    """测试资质中职称重复出现时精确求解结果与穷举结果相同"""
+    # 已知的反例：T2 为2人即可满足全部资质（最少2人）
+    qualifications = [
+        {'name': 'Q0', 'types': ['T1', 'T2', 'T2'], 'total_count': 4, 'require_all_types': False},
+        {'name': 'Q1', 'types': ['T2', 'T3', 'T1'], 'total_count': 1, 'require_all_types': False},
+        {'name': 'Q2', 'types': ['T2', 'T1', 'T1'], 'total_count': 2, 'require_all_types': False},
+    ]
+    counts, proven_optimal = solve_exact(CompiledCatalog(qualifications), None, None)
+    assert proven_optimal and sum(counts) == 2
+
+    # 只剩一个可选职称时按出现次数补足
+    compiled = CompiledCatalog([{'name': 'Q', 'types': ['T2', 'T2'], 'total_count': 2, 'require_all_types': False}])
+    counts, proven_optimal = solve_exact(compiled, None, None, maximum=[1])
+    assert proven_optimal and counts == [1]
+
+    rnd = random.Random(4)
+    types = ['T1', 'T2', 'T3', 'T4']
+    for _ in range(150):
+        qualifications = []
+        for index in range(rnd.randint(1, 4)):
+            qual_types = [rnd.choice(types) for _ in range(rnd.randint(1, 4))]
+            qualifications.append({'name': f'Q{index}', 'types': qual_types,
+                                   'total_count': rnd.randint(1, 5), 'require_all_types': rnd.random() < 0.4})
+        compiled = CompiledCatalog(qualifications)
+        counts, proven_optimal = solve_exact(compiled, None, None)
+        assert proven_optimal
+        assert all(compiled.is_satisfied(index, counts) for index in range(len(qualifications)))
+        assert sum(counts) == _brute_force_total(compiled), qualifications
+    print("✓ 职称重复出现时精确求解结果与穷举结果相同")
+
+def test_exact_solver_large_headcount():
+    """测试总人数很大时搜索深度不受递归深度限制"""
+    for total_count in (1000, 5000):
+        qualifications = [
+            {'name': 'A', 'types': ['T1', 'T2'], 'total_count': total_count, 'require_all_types': False},
+            {'name': 'B', 'types': ['T2', 'T3'], 'total_count': total_count, 'require_all_types': False},
+            {'name': 'C', 'types': ['T1', 'T3'], 'total_count': total_count, 'require_all_types': True},
+        ]
+        counts, proven_optimal = solve_exact(CompiledCatalog(qualifications), None, 10.0)
+        assert proven_optimal and sum(counts) == total_count * 3 // 2
+        final_counts, _, proven_optimal = merge_qualifications_exact(qualifications, time_limit=10.0)
+        assert proven_optimal and calculate_total_staff(final_counts) == total_count * 3 // 2
+    print("✓ 总人数很大时精确求解正常返回")
+
+if __name__ == "__main__":
+    test_exact_solver()
+    test_exact_solver_repeated_titles()
+    test_exact_solver_large_headcount()
@@ -2,12 +2,12 @@
 # 最终验证测试
 
 from qualification_matcher import merge_qualifications, calculate_total_staff, get_qualification_by_name
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_final_verification():
     """最终验证测试"""
     # 加载资质数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     print("="*60)
     print("最终验证测试")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# 测试追加资质的边际人数
+
+import random
+
+from marginal_cost import rank_additions
+from qualification_catalog import get_catalog
+from qualification_matcher import merge_qualifications, merge_qualifications_exact, hiring_delta, calculate_total_staff
+
+def test_marginal_cost():
+    """测试边际人数等于以当前人数为下界精确求解的最少新增人数"""
+    snapshot = get_catalog().snapshot()
+    data = [qual for qual in snapshot if qual['types']]
+    rnd = random.Random(25)
+    for _ in range(30):
+        selection = rnd.sample(data, rnd.randint(1, 4))
+        names = [qual['name'] for qual in selection]
+        final_counts, _ = merge_qualifications(selection)
+        additions = rank_additions(snapshot, names, final_counts)
+
+        selected_types = {type_name for qual in selection for type_name in qual['types']}
+        related = [qual['name'] for qual in snapshot
+                   if qual['name'] not in names and selected_types & set(qual['types'])]
+        assert sorted(item['qualification_name'] for item in additions) == sorted(related)
+        assert [item['extra_staff'] for item in additions] == sorted(item['extra_staff'] for item in additions)
+
+        for item in additions:
+            qual = snapshot.get(item['qualification_name'])
+            assert item['extra_staff'] == calculate_total_staff(item['additions'])
+            assert item['shared_types'] and set(item['shared_types']) <= selected_types
+            counts, _, proven_optimal = merge_qualifications_exact(selection + [qual], time_limit=None,
+                                                                   existing=final_counts)
+            assert proven_optimal
+            assert item['extra_staff'] == calculate_total_staff(hiring_delta(counts, final_counts))
+
+        everything = rank_additions(snapshot, names, final_counts, include_unrelated=True)
+        assert len(everything) == len(data) - len(selection)
+        assert rank_additions(snapshot, names, final_counts, include_unrelated=True, limit=5) == everything[:5]
+    print("✓ 30 组随机选择的边际人数与精确求解结果相同")
+
+if __name__ == "__main__":
+    test_marginal_cost()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# 测试合并计算结果缓存
+
+import json
+
+from merge_cache import MergeCache, merge_selection
+from qualification_catalog import get_catalog
+
+def test_merge_cache():
+    """测试缓存命中结果与重新计算完全相同，且与选择顺序无关"""
+    data = get_catalog().snapshot()
+    cache = MergeCache(max_entries=2)
+
+    names = ["建筑总包二级", "市政总包二级", "机电总包二级"]
+    fresh = merge_selection(data, names)
+    first = merge_selection(data, names, cache=cache)
+    # 顺序不同、有重复名称的同一组合命中缓存
+    second = merge_selection(data, ["机电总包二级", "建筑总包二级", "市政总包二级", "建筑总包二级"], cache=cache)
+    print(f"缓存统计: {cache.stats()}")
+    assert cache.hits == 1 and cache.misses == 1
+    assert json.dumps(first, ensure_ascii=False, sort_keys=True) == json.dumps(fresh, ensure_ascii=False, sort_keys=True)
+    assert json.dumps(second, ensure_ascii=False, sort_keys=True) == json.dumps(fresh, ensure_ascii=False, sort_keys=True)
+    print("✓ 缓存结果与重新计算一致")
+
+    # 修改返回结果不影响缓存
+    second[0]['结构'] = 999
+    assert merge_selection(data, names, cache=cache)[0] == fresh[0]
+
+    # 超出容量时淘汰最久未使用的条目
+    merge_selection(data, ["矿山总包二级"], cache=cache)
+    merge_selection(data, ["石油总包二级"], cache=cache)
+    print(f"缓存统计: {cache.stats()}")
+    assert cache.evictions == 1 and cache.stats()['entries'] == 2
+    print("✓ 缓存淘汰正确")
+
+    # 精确求解与贪心结果分别缓存
+    exact = merge_selection(data, names, engine='exact', cache=cache)
+    assert exact[2] is True
+    assert merge_selection(data, names, engine='exact', cache=cache) == exact
+    print("✓ 精确求解结果缓存正确")
+
+if __name__ == "__main__":
+    test_merge_cache()
@@ -2,12 +2,12 @@
 # 测试新的优化算法
 
 from qualification_matcher import merge_qualifications, calculate_total_staff, get_qualification_by_name
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_new_algorithm():
     """测试新的优化算法"""
     # 加载资质数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 测试用例1：单个资质 - 建筑总包二级（预期总人数17）
     print("测试用例1：单个资质 - 建筑总包二级")
@@ -2,12 +2,12 @@
 # 测试优化后的资质匹配算法
 
 from qualification_matcher import merge_qualifications, calculate_total_staff, get_qualification_by_name
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_optimized_algorithm():
     """测试优化后的算法是否能得到更好的结果"""
     # 加载资质数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 用户选择的资质列表
     selected_qualifications = [
@@ -6,7 +6,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from qualification_matcher import merge_qualifications, get_qualification_by_name, calculate_total_staff
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_three_qualifications():
     """测试三个资质的匹配结果：机电总包二级、矿山总包二级、石油总包二级"""
@@ -15,7 +15,7 @@ def test_three_qualifications():
     print("="*60)
     
     # 加载数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 获取三个资质
     qual1 = get_qualification_by_name("机电总包二级", data)
@@ -85,7 +85,7 @@ def test_other_combinations():
     print("="*60)
     
     # 加载数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 测试组合1：建筑总包二级 + 市政总包二级
     print(f"\n测试组合1：建筑总包二级 + 市政总包二级")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# 测试资质名称拼音搜索
+
+from fuzzy_search import fuzzy_search, score_name
+from pinyin_index import PinyinIndex
+from qualification_catalog import CatalogSnapshot, get_catalog
+
+def test_pinyin_search():
+    """测试全拼、首字母与混合拼音关键词按等价汉字关键词打分"""
+    snapshot = get_catalog().snapshot()
+    assert len(snapshot.pinyin_index) == len(snapshot)
+
+    for query in ["jzzb", "jianzhu", "JianZhu", "jian'zhu zong"]:
+        results = fuzzy_search(query, snapshot, with_scores=True)
+        print(f"查询：'{query}'  匹配结果：{results[:3]}")
+        assert results[0] == ("建筑总包二级", 0.9)
+
+    for qual in snapshot:
+        name = qual['name']
+        syllables = qual['pinyin']
+        # 完整的全拼、首字母与名称精确匹配
+        assert fuzzy_search(''.join(syllables), snapshot, with_scores=True)[0] == (name, 1.0)
+        assert (name, 1.0) in fuzzy_search(''.join(s[0] for s in syllables), snapshot, with_scores=True)
+        # 名称前缀的拼音与汉字前缀的得分相同
+        for length in range(1, len(name)):
+            han_score = dict(fuzzy_search(name[:length], snapshot, with_scores=True))[name]
+            pinyin_results = dict(fuzzy_search(''.join(syllables[:length]), snapshot, with_scores=True))
+            assert pinyin_results[name] == han_score, (name, length)
+
+    # 指定 limit 时结果与完整结果截取前 limit 个一致
+    for query in ["jzzb", "gc", "er", "sgzycb", "x"]:
+        full = fuzzy_search(query, snapshot, with_scores=True)
+        assert fuzzy_search(query, snapshot, limit=3, with_scores=True) == full[:3]
+    print("✓ 拼音搜索结果正确")
+
+    # 候选名称包含所有能够匹配的名称，多段关键词按各段求交集缩小候选范围
+    index = snapshot.pinyin_index
+    for query in ["jzzb", "jianzhu", "shizheng", "gcsg", "xyz", "j"]:
+        candidates = index.candidates(query)
+        assert candidates == sorted(candidates)
+        assert {position for position in range(len(snapshot)) if index.matchings(query, position)} <= set(candidates)
+    assert len(index.candidates("shizheng")) < len(snapshot)
+    print("✓ 拼音候选名称按音节前缀逐段求交集")
+
+    # 匹配数量达到上限时仍保留连续匹配（得分最高）
+    name = "一二三四五六七八九十百千万亿"
+    capped = PinyinIndex([{'name': name, 'pinyin': ['a'] * 12 + ['b', 'c']}])
+    han_queries = capped.matchings('aabc', 0)
+    assert name[10:] in han_queries
+    assert max(score_name(han_query, name) for han_query in han_queries) == score_name(name[10:], name)
+    print("✓ 匹配数量达到上限时保留得分最高的连续匹配")
+
+    # 对外返回的资质记录不含拼音字段，其余字段不变
+    assert all('pinyin' not in qual for qual in snapshot.public_qualifications)
+    assert [qual['name'] for qual in snapshot.public_qualifications] == [qual['name'] for qual in snapshot]
+    assert snapshot.public_lookup(["建筑总包二级"])[0]['types'] == snapshot.get("建筑总包二级")['types']
+    print("✓ 对外返回的资质记录不含拼音字段")
+
+    # 没有拼音字段的资质数据不使用拼音索引
+    plain = CatalogSnapshot([{key: value for key, value in qual.items() if key != 'pinyin'} for qual in snapshot],
+                            'plain', None)
+    assert len(plain.pinyin_index) == 0
+    assert fuzzy_search("jzzb", plain) == []
+    print("✓ 没有拼音字段时不影响汉字搜索")
+
+if __name__ == "__main__":
+    test_pinyin_search()
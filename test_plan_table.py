@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# 测试资质组合方案表
+
+import itertools
+import json
+import os
+import shutil
+import tempfile
+
+from merge_cache import merge_selection
+import plan_table
+from plan_table import PlanTable, build_plan_table, connected_combinations
+from qualification_catalog import QualificationCatalog, get_catalog
+from qualification_matcher import split_components
+
+def test_plan_table():
+    """测试方案表结果与实时计算一致，并且资质数据变化后增量重建"""
+    data = list(get_catalog().snapshot())
+    workdir = tempfile.mkdtemp()
+    data_path = os.path.join(workdir, 'qualification_data.json')
+    table_path = os.path.join(workdir, 'plan_table.sqlite')
+    try:
+        _check_plan_table(data, data_path, table_path)
+    finally:
+        shutil.rmtree(workdir)
+
+def _connected(snapshot, selection):
+    """资质组合是否通过共同职称连通"""
+    return len(split_components(snapshot.lookup(selection))) == 1
+
+def _check_plan_table(data, data_path, table_path):
+    with open(data_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    snapshot = QualificationCatalog(data_path).snapshot()
+    names = sorted(snapshot.by_name)
+
+    # 连通组合的枚举结果与穷举后筛选的结果相同，且没有重复
+    generated = list(connected_combinations(snapshot, names, 3))
+    assert len(generated) == len(set(generated))
+    assert set(generated) == {selection for size in range(1, 4)
+                              for selection in itertools.combinations(names, size) if _connected(snapshot, selection)}
+    print(f"✓ 枚举出 {len(generated)} 个连通组合，与穷举结果相同")
+
+    # 全量构建所有不超过2个资质的连通组合，不连通的组合不存储
+    computed = build_plan_table(2, table_path, data_path, workers=2)
+    pairs = [selection for selection in itertools.combinations(names, 2) if _connected(snapshot, selection)]
+    assert computed == len(data) + len(pairs)
+    table = PlanTable(table_path)
+    for selection in itertools.combinations(sorted(snapshot.by_name), 2):
+        result = table.lookup(snapshot, selection)
+        try:
+            expected = merge_selection(snapshot, selection)
+        except ValueError:
+            assert result is None, "无法满足的组合不应查表返回"
+            continue
+        assert result == expected, f"方案表结果与实时计算不一致: {selection}"
+    print(f"方案表统计: {table.stats()}")
+    print("✓ 方案表结果与实时计算一致")
+
+    # 不连通的组合由各分量的方案拼接得到，连通且超出最大组合数量时不查表
+    disjoint = next(selection for selection in itertools.combinations(names, 3)
+                    if len(split_components(snapshot.lookup(selection))) == 3
+                    and all(snapshot.get(name)['types'] for name in selection))
+    assert table.lookup(snapshot, disjoint) == merge_selection(snapshot, disjoint)
+    connected = next(selection for selection in itertools.combinations(names, 3) if _connected(snapshot, selection))
+    assert table.lookup(snapshot, connected) is None
+
+    # 再次构建时没有需要计算的组合
+    assert build_plan_table(2, table_path, data_path) == 0
+
+    # 修改一个资质后，只重新计算包含该资质的组合，旧版本的方案表不再命中
+    data[0] = dict(data[0], total_count=data[0]['total_count'] + 5)
+    with open(data_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    new_snapshot = QualificationCatalog(data_path).snapshot()
+    assert table.lookup(new_snapshot, (data[0]['name'],)) is None
+    computed = build_plan_table(2, table_path, data_path, workers=2)
+    expected = 1 + sum(data[0]['name'] in selection for selection in pairs)
+    assert computed == expected, f"应只重新计算包含变化资质的 {expected} 个组合，实际 {computed} 个"
+    assert table.lookup(new_snapshot, (data[0]['name'],)) == merge_selection(new_snapshot, [data[0]['name']])
+    print("✓ 方案表增量重建正确")
+
+    # 合并算法版本变化后旧方案不再命中，重新构建时全部重新计算
+    version = plan_table.MERGE_ALGORITHM_VERSION
+    plan_table.MERGE_ALGORITHM_VERSION = version + 1
+    try:
+        assert table.lookup(new_snapshot, (data[0]['name'],)) is None
+        assert build_plan_table(2, table_path, data_path, workers=2) == len(data) + len(pairs)
+    finally:
+        plan_table.MERGE_ALGORITHM_VERSION = version
+    print("✓ 合并算法版本变化后方案表全部重新计算")
+
+    # 组合数量上限：按组合大小从小到大保留
+    assert build_plan_table(2, table_path, data_path, workers=2, max_combinations=len(data)) == len(data)
+    assert table.lookup(new_snapshot, (data[0]['name'],)) == merge_selection(new_snapshot, [data[0]['name']])
+    assert all(table.lookup(new_snapshot, selection) is None for selection in pairs)
+    print("✓ 超出组合数量上限的组合不存储")
+
+if __name__ == "__main__":
+    test_plan_table()
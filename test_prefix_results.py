@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# 测试单字、双字关键词的预计算搜索结果表
+
+from fuzzy_search import fuzzy_search
+from qualification_catalog import CatalogSnapshot, get_catalog
+from search_cache import search_names
+
+def test_prefix_results():
+    """测试查表结果与实时搜索完全一致"""
+    catalog = get_catalog().snapshot()
+    snapshot = CatalogSnapshot(list(catalog), catalog.version, None)
+    table = snapshot.prefix_results
+    # 构建前返回None，由调用方实时搜索
+    assert table.lookup("建") is None
+
+    table.build()
+    stats = table.stats()
+    print(f"结果表统计: {stats}")
+    assert stats['ready'] and stats['entries'] == len(snapshot.search_index.unigrams) + len(snapshot.search_index.bigrams)
+
+    for query in table.entries:
+        expected = fuzzy_search(query, snapshot, with_scores=True)
+        assert table.lookup(query) == expected, f"查表结果不一致: {query}"
+        for limit in (0, 1, 5):
+            for min_score in (None, 0.5, 0.9):
+                assert search_names(snapshot, query, limit=limit, min_score=min_score, with_scores=True) == \
+                    fuzzy_search(query, snapshot, limit=limit, min_score=min_score, with_scores=True)
+    # 不在表中的关键词和不同的阈值仍实时搜索
+    assert table.lookup("建二") is None and table.lookup("xyz") is None
+    assert table.lookup("建", threshold=0.5) is None
+    assert search_names(snapshot, "建二") == fuzzy_search("建二", snapshot)
+    print(f"✓ {len(table.entries)} 个单字、双字关键词的查表结果一致")
+
+if __name__ == "__main__":
+    test_prefix_results()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# 测试搜索结果缓存
+
+from fuzzy_search import fuzzy_search
+from qualification_catalog import CatalogSnapshot, get_catalog
+from search_cache import SearchCache, search_names
+
+def test_search_cache():
+    """测试缓存命中与由前缀推出候选的搜索结果与直接搜索完全一致"""
+    # 新建快照（不构建单字、双字结果表），所有关键词都经过缓存
+    catalog = get_catalog().snapshot()
+    snapshot = CatalogSnapshot(list(catalog), catalog.version, None)
+    cache = SearchCache()
+
+    # 模拟输入联想：每个资质名称逐字输入，以及包含"总包"的关键词逐字输入
+    test_queries = []
+    for qual in snapshot:
+        name = qual['name']
+        test_queries.extend(name[:i] for i in range(1, len(name) + 1))
+    for query in ["建筑总包二级", "总包二", "建宽xyz", "xyz"]:
+        test_queries.extend(query[:i] for i in range(1, len(query) + 1))
+    test_queries = list(dict.fromkeys(test_queries))
+
+    for query in test_queries:
+        expected = fuzzy_search(query, snapshot)
+        assert list(cache.candidates(snapshot, query)) == snapshot.search_index.candidates(query), \
+            f"候选位置不一致: {query}"
+        assert search_names(snapshot, query, cache=cache) == expected, f"搜索结果不一致: {query}"
+        # 第二次命中缓存
+        assert search_names(snapshot, f" {query} ", cache=cache) == expected
+        assert search_names(snapshot, query, limit=3, with_scores=True, cache=cache) == \
+            fuzzy_search(query, snapshot, limit=3, with_scores=True)
+
+    stats = cache.stats()
+    print(f"缓存统计: {stats}")
+    assert stats['seeded'] > 0 and stats['negative_hits'] > 0
+    assert stats['hits'] == len(test_queries)
+    print("✓ 缓存搜索结果与直接搜索一致")
+
+    # 资质目录版本变化后不使用旧的缓存条目
+    changed = CatalogSnapshot(list(snapshot)[:3], 'changed', None)
+    assert search_names(changed, "建筑", cache=cache) == fuzzy_search("建筑", changed)
+    print("✓ 资质目录版本变化后缓存失效")
+
+    # 容量为0时不缓存
+    disabled = SearchCache(max_entries=0)
+    search_names(snapshot, "建筑", cache=disabled)
+    search_names(snapshot, "建筑", cache=disabled)
+    assert disabled.hits == 0 and disabled.stats()['entries'] == 0
+
+if __name__ == "__main__":
+    test_search_cache()
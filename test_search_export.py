@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# 测试导出给浏览器的搜索索引
+
+import json
+
+from fuzzy_search import score_name
+from qualification_catalog import get_catalog
+from search_export import export_search_index
+
+def test_search_export():
+    """测试导出的索引与服务器端索引、打分规则一致，且每个版本只序列化一次"""
+    snapshot = get_catalog().snapshot()
+    payload = export_search_index(snapshot)
+    assert export_search_index(snapshot) is payload
+    index = json.loads(payload.decode('utf-8'))
+    print(f"索引版本: {index['version']}，大小: {len(payload)} 字节")
+
+    assert index['version'] == snapshot.version
+    assert index['names'] == [qual['name'] for qual in snapshot]
+    for char, positions in index['unigrams'].items():
+        assert all(char in index['names'][position] for position in positions)
+    for bigram, positions in index['bigrams'].items():
+        assert all(bigram in index['names'][position] for position in positions)
+    assert sum(len(positions) for positions in index['unigrams'].values()) == \
+        sum(len(set(name)) for name in index['names'])
+
+    tiers = index['tiers']
+    assert score_name("建筑总包二级", "建筑总包二级") == tiers['exact']
+    assert score_name("建筑", "建筑总包二级") == tiers['prefix']
+    assert score_name("筑总包", "建筑总包二级") == tiers['contains']
+    assert score_name("总包", "建筑幕墙工程施工专业承包二级") is None
+    assert score_name("建二", "建筑总包二级") == 2 / 6 * tiers['length_weight'] + 1 / 4 * tiers['continuity_weight']
+    print("✓ 导出的搜索索引正确")
+
+if __name__ == "__main__":
+    test_search_export()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# 测试资质名称搜索索引
+
+import random
+
+from fuzzy_search import calculate_levenshtein_distance, fuzzy_search
+from qualification_catalog import get_catalog
+
+def test_search_index():
+    """测试使用倒排索引的搜索结果与逐个打分的结果完全一致"""
+    snapshot = get_catalog().snapshot()
+    data = list(snapshot)
+
+    test_queries = ["建筑二", "市政二", "机电", "电力", "水利", "公路", "冶金",
+                    "建筑总包", "市政总包二级", "钢结构", "消防二", "建宽", "xyz", ""]
+    # 所有资质名称及其前缀、双字片段
+    for qual in data:
+        name = qual['name']
+        test_queries.append(name)
+        test_queries.extend(name[:i] for i in range(1, len(name)))
+        test_queries.extend(name[i:i + 2] for i in range(len(name) - 1))
+    # 随机修改名称中的字（替换、删除、插入），测试 Levenshtein 匹配
+    rnd = random.Random(5)
+    chars = sorted({char for qual in data for char in qual['name']}) + list("甲乙xyz")
+    for _ in range(500):
+        name = list(rnd.choice(data)['name'])
+        for _ in range(rnd.randint(1, 6)):
+            index = rnd.randrange(len(name))
+            operation = rnd.randrange(3)
+            if operation == 0:
+                name[index] = rnd.choice(chars)
+            elif operation == 1 and len(name) > 1:
+                del name[index]
+            else:
+                name.insert(index, rnd.choice(chars))
+        test_queries.append(''.join(name))
+        test_queries.append(''.join(name[:rnd.randint(2, 6)]))
+
+    for query in test_queries:
+        # 列表没有索引，逐个打分
+        expected = fuzzy_search(query, data)
+        assert fuzzy_search(query, snapshot) == expected, f"索引搜索结果不一致: {query}"
+
+    for query in ["建筑二", "市政二", "机电"]:
+        print(f"查询：'{query}'  候选数：{len(snapshot.search_index.candidates(query))}/{len(data)}")
+        print(f"匹配结果：{fuzzy_search(query, snapshot)}")
+    print(f"✓ {len(test_queries)} 个查询的索引搜索结果一致")
+
+def test_search_limit():
+    """测试指定 limit/min_score 时的结果与完整结果截取前 limit 个完全一致"""
+    snapshot = get_catalog().snapshot()
+    test_queries = ["建筑二", "市政二", "机电", "建", "总包", "建筑总包", "二级", "工程施工专业承包", "建宽", ""]
+    test_queries.extend(qual['name'] for qual in snapshot)
+    for query in test_queries:
+        full = fuzzy_search(query, snapshot, with_scores=True)
+        for limit in (0, 1, 3, 10):
+            for min_score in (None, 0.5, 0.9):
+                expected = [result for result in full if min_score is None or result[1] >= min_score][:limit]
+                assert fuzzy_search(query, snapshot, limit=limit, min_score=min_score, with_scores=True) == expected, \
+                    f"前 {limit} 个结果不一致: {query}"
+                # 没有索引的列表结果相同
+                assert fuzzy_search(query, list(snapshot), limit=limit, min_score=min_score, with_scores=True) == expected
+    print(f"查询：'建'  前3个结果：{fuzzy_search('建', snapshot, limit=3, with_scores=True)}")
+    print(f"✓ {len(test_queries)} 个查询的前 limit 个结果一致")
+
+def _levenshtein_similarity(str1, str2):
+    """动态规划计算Levenshtein相似度（作为对照）"""
+    m, n = len(str1), len(str2)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(m + 1):
+        dp[i][0] = i
+    for j in range(n + 1):
+        dp[0][j] = j
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            cost = 0 if str1[i-1] == str2[j-1] else 1
+            dp[i][j] = min(dp[i-1][j] + 1, dp[i][j-1] + 1, dp[i-1][j-1] + cost)
+    max_len = max(m, n)
+    return 1 - (dp[m][n] / max_len) if max_len != 0 else 1
+
+def test_levenshtein():
+    """测试位并行Levenshtein相似度与动态规划结果一致"""
+    rnd = random.Random(3)
+    alphabet = "abc建筑总包二级工程"
+    for _ in range(5000):
+        str1 = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 10)))
+        str2 = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 14)))
+        expected = _levenshtein_similarity(str1, str2)
+        assert calculate_levenshtein_distance(str1, str2) == expected, (str1, str2)
+        # 提供阈值时，达到阈值的相似度完全一致，低于阈值的返回值也低于阈值
+        for threshold in (0.3, 0.6):
+            similarity = calculate_levenshtein_distance(str1, str2, threshold)
+            if expected >= threshold:
+                assert similarity == expected, (str1, str2, threshold)
+            else:
+                assert similarity < threshold, (str1, str2, threshold)
+    print("✓ 位并行Levenshtein相似度与动态规划结果一致")
+
+if __name__ == "__main__":
+    test_search_index()
+    test_search_limit()
+    test_levenshtein()
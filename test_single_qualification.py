@@ -2,12 +2,12 @@
 # 测试单个资质的匹配结果
 
 from qualification_matcher import merge_qualifications, calculate_total_staff, get_qualification_by_name
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_single_qualification():
     """测试单个资质的匹配结果"""
     # 加载资质数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 测试单个资质：建筑总包二级
     selected_qualifications = ["建筑总包二级"]
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# 测试批量解析资质名称
+
+from fuzzy_search import fuzzy_search
+from qualification_catalog import get_catalog
+from qualification_matcher import match_qualifications
+from search_cache import SearchCache
+from term_resolver import resolve_terms, split_terms
+
+def test_resolve_terms():
+    """测试批量解析结果与逐个搜索的最高分结果一致"""
+    data = get_catalog().snapshot()
+    text = "建筑总包二级，市政二、机电;电力；钢结构  xyz\n建筑总包二级,jzzb"
+    terms = split_terms(text)
+    assert terms == ["建筑总包二级", "市政二", "机电", "电力", "钢结构", "xyz", "建筑总包二级", "jzzb"]
+
+    cache = SearchCache()
+    results = resolve_terms(data, text, alternatives=2, cache=cache)
+    assert [result['term'] for result in results] == terms
+    for result in results:
+        expected = fuzzy_search(result['term'], data, with_scores=True)
+        print(f"'{result['term']}' -> {result['match']}（{result['confidence']}）")
+        if not expected:
+            assert result['match'] is None and result['confidence'] == 0
+            continue
+        assert (result['match'], result['confidence']) == expected[0]
+        assert [(alt['name'], alt['score']) for alt in result['alternatives']] == expected[1:3]
+        assert result['ambiguous'] == (len(expected) > 1 and expected[1][1] == expected[0][1])
+
+    assert results[0]['exact'] and results[0]['confidence'] == 1.0
+    # 重复的名称只搜索一次，不会命中缓存
+    assert cache.stats()['hits'] == 0
+    print("✓ 批量解析结果正确")
+
+    # 名称列表与 match_qualifications 的输入不按空白拆分，带空格的拼音关键词作为一个名称
+    results = resolve_terms(data, ["jian zhu zong bao er ji"])
+    assert len(results) == 1 and results[0]['match'] == "建筑总包二级"
+    result = match_qualifications("jian zhu zong bao er ji, 市政二")
+    assert result['matched_qualifications'] == ["建筑总包二级", "市政总包二级"]
+    print("✓ 名称列表中的空格不作为分隔符")
+
+if __name__ == "__main__":
+    test_resolve_terms()
@@ -2,12 +2,12 @@
 # 测试用户输入职称人数的匹配结果
 
 from qualification_matcher import get_qualification_by_name, calculate_total_staff
-from fuzzy_search import load_qualification_data
+from qualification_catalog import get_catalog
 
 def test_user_input():
     """测试用户输入职称人数的匹配结果"""
     # 加载资质数据
-    data = load_qualification_data()
+    data = get_catalog().snapshot()
     
     # 测试的资质列表（来自test_optimization.py）
     selected_qualifications = [
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# 测试向量化打分与纯 Python 打分的搜索结果一致
+
+import random
+
+import vector_search
+from fuzzy_search import fuzzy_search
+from qualification_catalog import CatalogSnapshot, get_catalog
+
+def test_vector_search():
+    """测试使用向量化打分的搜索结果（含得分）与纯 Python 实现完全相同"""
+    if vector_search.np is None:
+        print("未安装 NumPy，跳过向量化打分测试")
+        return
+    catalog = get_catalog().snapshot()
+    data = list(catalog)
+    snapshot = CatalogSnapshot(data, catalog.version, None)
+    snapshot.vector_scorer = vector_search.build_vector_scorer(snapshot.search_index.names, min_size=1)
+    plain = CatalogSnapshot(data, catalog.version, None)
+    plain.vector_scorer = None
+    assert snapshot.vector_scorer is not None
+
+    test_queries = ["建筑二", "市政二", "机电", "建筑总包", "总包二", "二级", "工程施工专业承包", "建宽", "xyz"]
+    rnd = random.Random(9)
+    chars = sorted({char for qual in data for char in qual['name']}) + list("甲乙")
+    for qual in data:
+        name = qual['name']
+        test_queries.append(name)
+        test_queries.extend(name[:i] for i in range(1, len(name)))
+        test_queries.extend(name[i:i + 3] for i in range(len(name) - 2))
+    for _ in range(500):
+        name = list(rnd.choice(data)['name'])
+        for _ in range(rnd.randint(1, 6)):
+            index = rnd.randrange(len(name))
+            operation = rnd.randrange(3)
+            if operation == 0:
+                name[index] = rnd.choice(chars)
+            elif operation == 1 and len(name) > 1:
+                del name[index]
+            else:
+                name.insert(index, rnd.choice(chars))
+        test_queries.append(''.join(name[rnd.randrange(3):]))
+
+    for query in test_queries:
+        expected = fuzzy_search(query, plain, with_scores=True)
+        assert fuzzy_search(query, snapshot, with_scores=True) == expected, f"向量化打分结果不一致: {query}"
+        assert fuzzy_search(query, snapshot, limit=3, with_scores=True) == expected[:3]
+    print(f"✓ {len(test_queries)} 个查询的向量化打分结果一致")
+
+if __name__ == "__main__":
+    test_vector_search()
@@ -1,5 +1,8 @@
 import pandas as pd
 import json
+import sys
+from pinyin_index import PINYIN_FIELD, add_pinyin
+from plan_table import build_plan_table
 
 # 读取Excel文件中的资质数据
 def read_excel_data():
@@ -84,7 +87,9 @@ def update_qualification_data():
             if (json_qual['require_all_types'] != excel_qual['require_all_types'] or
                 json_qual['types'] != excel_qual['types'] or
                 json_qual['total_count'] != excel_qual['total_count']):
-                # 数据不一致，更新JSON数据
+                # 数据不一致，更新JSON数据（名称不变，保留已生成的拼音）
+                if PINYIN_FIELD in json_qual:
+                    excel_qual[PINYIN_FIELD] = json_qual[PINYIN_FIELD]
                 json_dict[name] = excel_qual
                 print(f"更新资质: {name}")
         else:
@@ -102,6 +107,9 @@ def update_qualification_data():
     # 将更新后的字典转换为列表
     updated_data = list(json_dict.values())
     
+    # 3. 离线生成资质名称的逐字拼音，供拼音搜索使用
+    add_pinyin(updated_data)
+    
     # 保存更新后的JSON数据
     save_json_data(updated_data)
     
@@ -111,4 +119,7 @@ def update_qualification_data():
 # 运行主函数
 if __name__ == "__main__":
     update_qualification_data()
+    # 指定 --plan-table 参数时，资质数据更新后增量重建资质组合方案表（组合数量较多时耗时较长）
+    if '--plan-table' in sys.argv[1:]:
+        build_plan_table()
     
@@ -0,0 +1,196 @@
+# 向量化的资质名称打分（可选，需要 NumPy）
+# 资质目录较大时，预先为每个字符建立位置表（包含该字符的名称及该字符在名称中出现位置的位掩码），
+# 前缀、按序包含（长度得分与平均间隔）等逐名称的循环改为对所有候选名称的数组位运算；
+# Levenshtein 相似度先按共有字符数排除不可能达到阈值的名称，其余名称同时做位并行计算。
+# 打分规则与 fuzzy_search.score_name 完全相同，浮点运算顺序也相同，排序结果与纯 Python 实现一致。
+import os
+
+from fuzzy_search import _max_distance, calculate_levenshtein_distance
+
+try:
+    import numpy as np
+except ImportError:  # 未安装 NumPy 时只使用纯 Python 实现
+    np = None
+
+# 资质数量达到该值时使用向量化打分（环境变量 VECTOR_SEARCH_MIN_SIZE）
+try:
+    MIN_CATALOG_SIZE = int(os.environ.get('VECTOR_SEARCH_MIN_SIZE', '2000'))
+except ValueError:
+    MIN_CATALOG_SIZE = 2000
+
+# 字符位置与位并行编辑距离的位向量为 uint64，名称最长63个字，更长的关键词逐个名称计算编辑距离
+_MAX_NAME_LENGTH = 63
+
+
+def build_vector_scorer(names, min_size=None):
+    """资质数量达到 min_size 且已安装 NumPy 时创建向量化打分器，否则返回None"""
+    names = list(names)
+    if min_size is None:
+        min_size = MIN_CATALOG_SIZE
+    if np is None or not hasattr(np, 'bitwise_count') or not names or len(names) < min_size:
+        return None
+    if max(len(name) for name in names) > _MAX_NAME_LENGTH:
+        return None
+    return VectorScorer(names)
+
+
+class VectorScorer:
+    """名称长度数组与逐字符的位置位掩码表"""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int64)
+        # 字符码点 -> (包含该字符的名称位置数组, 该字符在名称中出现位置的位掩码数组)
+        rows = {}
+        masks = {}
+        for row, name in enumerate(self.names):
+            name_masks = {}
+            for index, char in enumerate(name):
+                name_masks[char] = name_masks.get(char, 0) | (1 << index)
+            for char, mask in name_masks.items():
+                rows.setdefault(ord(char), []).append(row)
+                masks.setdefault(ord(char), []).append(mask)
+        self.char_masks = {code: (np.array(rows[code], dtype=np.int64), np.array(masks[code], dtype=np.uint64))
+                           for code in rows}
+
+    def _masks(self, code, positions):
+        """给定名称中某个字符出现位置的位掩码（不含该字符时为0）"""
+        dense = np.zeros(len(self.names), dtype=np.uint64)
+        entry = self.char_masks.get(code)
+        if entry is not None:
+            dense[entry[0]] = entry[1]
+        return dense[positions]
+
+    def score(self, query, positions, threshold=0.3):
+        """计算关键词与给定名称（位置数组，按目录顺序）的得分
+
+        返回 (位置列表, 得分列表)，只包含匹配的名称，保持给定的顺序。
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        n = len(query)
+        if n == 0 or len(positions) == 0:
+            return [], []
+        lengths = self.lengths[positions]
+        codes = [ord(char) for char in query]
+        char_masks = {code: self._masks(code, positions) for code in set(codes)}
+        query_masks = [char_masks[code] for code in codes]
+        scores = np.full(len(positions), np.nan)
+        zero = np.uint64(0)
+
+        # 1. 精确匹配与前缀匹配：关键词第 k 个字出现在名称的第 k 位
+        prefix = lengths >= n
+        if n <= _MAX_NAME_LENGTH:
+            for index, masks in enumerate(query_masks):
+                prefix &= (masks & np.uint64(1 << index)) != zero
+        else:
+            prefix[:] = False
+        exact = prefix & (lengths == n)
+        scores[prefix] = 0.9
+        scores[exact] = 1.0
+        matched = prefix
+
+        if "总包" in query:
+            # 2. 关键词包含"总包"时只匹配完整包含关键词的名称：存在起点使第 k 个字出现在起点之后第 k 位
+            starts = np.full(len(positions), np.uint64((1 << _MAX_NAME_LENGTH) - 1), dtype=np.uint64)
+            for index, masks in enumerate(query_masks):
+                if index >= _MAX_NAME_LENGTH:
+                    starts[:] = zero
+                    break
+                starts &= masks >> np.uint64(index)
+            contains = starts != zero
+            scores[contains & ~matched] = 0.8
+            keep = ~np.isnan(scores)
+            return positions[keep].tolist(), scores[keep].tolist()
+
+        # 3. 按序包含：逐字取上一个位置之后最靠左的出现位置（与 str.find 相同），累计相邻位置的间隔
+        found_all = np.ones(len(positions), dtype=bool)
+        current = np.full(len(positions), -1, dtype=np.int64)
+        gap_sum = np.zeros(len(positions), dtype=np.int64)
+        for index, masks in enumerate(query_masks):
+            # 去掉不晚于上一个位置的位，取最低位
+            available = masks & ~((np.uint64(1) << (current + 1).astype(np.uint64)) - np.uint64(1))
+            found = available != zero
+            lowest = available & (~available + np.uint64(1))
+            next_position = np.log2(np.where(found, lowest, np.uint64(1)).astype(np.float64)).astype(np.int64)
+            found_all &= found
+            if index > 0:
+                gap_sum += next_position - current - 1
+            current = np.where(found, next_position, current)
+        subsequence = found_all & ~matched
+        if subsequence.any():
+            length_score = n / lengths[subsequence]
+            if n > 1:
+                avg_interval = gap_sum[subsequence] / (n - 1)
+            else:
+                avg_interval = np.zeros(int(subsequence.sum()))
+            continuity_score = 1 / (1 + avg_interval)
+            scores[subsequence] = length_score * 0.6 + continuity_score * 0.4
+        matched = matched | found_all
+
+        # 4. Levenshtein：共有字符数不足的名称编辑距离一定超过阈值，其余名称同时计算
+        rest = np.flatnonzero(~matched)
+        if len(rest):
+            common = np.zeros(len(rest), dtype=np.int64)
+            for code in char_masks:
+                occurrences = np.bitwise_count(char_masks[code][rest]).astype(np.int64)
+                common += np.minimum(occurrences, codes.count(code))
+            max_len = np.maximum(lengths[rest], n)
+            allowed = np.array([_allowed_distance(length, threshold) for length in range(int(max_len.max()) + 1)])
+            possible = max_len - common <= allowed[max_len]
+            rest = rest[possible]
+            if n <= _MAX_NAME_LENGTH:
+                distances = self._bit_parallel_distances(query, rest, lengths, char_masks)
+                similarity = 1 - (distances / max_len[possible])
+                accepted = similarity >= threshold
+                scores[rest[accepted]] = similarity[accepted]
+            else:
+                for row in rest.tolist():
+                    similarity = calculate_levenshtein_distance(query, self.names[positions[row]], threshold)
+                    if similarity >= threshold:
+                        scores[row] = similarity
+
+        keep = ~np.isnan(scores)
+        return positions[keep].tolist(), scores[keep].tolist()
+
+    @staticmethod
+    def _bit_parallel_distances(query, rows, lengths, char_masks):
+        """Myers 位并行算法，同时计算关键词与多个名称的编辑距离（每个名称的位向量为一个 uint64）
+
+        名称第 j 个字与关键词各字是否相同，由该字在名称中的位置位掩码的第 j 位得出。
+        """
+        n = len(query)
+        full = np.uint64((1 << n) - 1)
+        last = np.uint64(1 << (n - 1))
+        one = np.uint64(1)
+        # 字符 -> 该字符在关键词中出现位置的位掩码
+        pattern_masks = {}
+        for bit, char in enumerate(query):
+            pattern_masks[ord(char)] = pattern_masks.get(ord(char), 0) | (1 << bit)
+        name_masks = [(char_masks[code][rows], np.uint64(mask)) for code, mask in pattern_masks.items()]
+
+        lengths = lengths[rows]
+        vp = np.full(len(rows), full, dtype=np.uint64)
+        vn = np.zeros(len(rows), dtype=np.uint64)
+        distances = np.full(len(rows), n, dtype=np.int64)
+        for column in range(int(lengths.max()) if len(rows) else 0):
+            active = column < lengths
+            shift = np.uint64(column)
+            eq = np.zeros(len(rows), dtype=np.uint64)
+            for masks, pattern_mask in name_masks:
+                eq |= ((masks >> shift) & one) * pattern_mask
+            xv = eq | vn
+            xh = (((eq & vp) + vp) ^ vp) | eq
+            hp = vn | (~(xh | vp) & full)
+            hn = vp & xh
+            step = (hp & last != 0).astype(np.int64) - (hn & last != 0).astype(np.int64)
+            distances += np.where(active, step, 0)
+            hp = ((hp << one) | one) & full
+            hn = (hn << one) & full
+            vp = np.where(active, hn | (~(xv | hp) & full), vp)
+            vn = np.where(active, hp & xv, vn)
+        return distances
+
+
+def _allowed_distance(length, threshold):
+    """相似度不低于 threshold 时允许的最大编辑距离"""
+    return _max_distance(length, threshold) if length > 0 else 0
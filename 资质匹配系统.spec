@@ -5,7 +5,7 @@ a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
-    datas=[('templates', 'templates'), ('qualification_data.json', '.'), ('zivi_data.xlsx', '.')],
+    datas=[('templates', 'templates'), ('static', 'static'), ('qualification_data.json', '.'), ('zivi_data.xlsx', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},